@@ -0,0 +1,22 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+from apps.common.search import postgres_search_indexes
+
+
+class Migration(migrations.Migration):
+    """Trigram em username: busca do admin de comentários (user__username)."""
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0003_alter_customuser_email'),
+    ]
+
+    operations = [
+        postgres_search_indexes('accounts', 'customuser', [
+            django.contrib.postgres.indexes.GinIndex(
+                fields=['username'], opclasses=['gin_trgm_ops'], name='accounts_user_username_trgm',
+            ),
+        ]),
+    ]
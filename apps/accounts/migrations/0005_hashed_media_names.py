@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:30
+
+import apps.common.files
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_username_trgm'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='avatar',
+            field=models.ImageField(blank=True, storage=apps.common.files.ContentAddressedStorage(), upload_to='avatars/', verbose_name='Foto de perfil'),
+        ),
+    ]
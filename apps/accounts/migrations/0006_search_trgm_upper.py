@@ -0,0 +1,24 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+from apps.common.search import postgres_search_indexes, trigram_index
+
+
+class Migration(migrations.Migration):
+    """Trigram sobre UPPER(...) (expressão do icontains) nos campos de busca de usuários."""
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0005_hashed_media_names'),
+    ]
+
+    operations = [
+        postgres_search_indexes('accounts', 'customuser', [
+            trigram_index('username', 'email', 'first_name', 'last_name', name='accounts_user_search_trgm'),
+        ], replaces=[
+            django.contrib.postgres.indexes.GinIndex(
+                fields=['username'], opclasses=['gin_trgm_ops'], name='accounts_user_username_trgm',
+            ),
+        ]),
+    ]
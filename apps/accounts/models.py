@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from apps.common.files import hashed_storage
+
 
 class CustomUser(AbstractUser):
     class Role(models.TextChoices):
@@ -18,7 +20,7 @@ class CustomUser(AbstractUser):
         choices=Role.choices, default=Role.NEWS_EDITOR,
         help_text='Define as permissões e acesso do usuário no sistema.',
     )
-    avatar = models.ImageField('Foto de perfil', upload_to='avatars/', blank=True)
+    avatar = models.ImageField('Foto de perfil', upload_to='avatars/', storage=hashed_storage, blank=True)
     bio = models.TextField('Biografia', blank=True, help_text='Breve descrição sobre o usuário.')
 
     class Meta:
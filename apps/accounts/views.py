@@ -2,13 +2,15 @@ from django.contrib import messages
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView, PasswordResetView
-from django.contrib.sites.shortcuts import get_current_site
 from django.core.cache import cache
 from django.http import HttpResponseRedirect
 from django.shortcuts import render, redirect
 from django.urls import reverse_lazy
 from django.views.decorators.http import require_POST
 
+from apps.common.sites import get_current_site
+from apps.common.upserts import upsert
+
 from .forms import CustomUserCreationForm
 
 
@@ -64,11 +66,13 @@ def register_view(request):
             # Opt-in de newsletter durante o cadastro (LGPD: ação explícita do usuário)
             if form.cleaned_data.get('subscribe_newsletter') and user.email:
                 from apps.news.models import NewsletterSubscription
-                site = get_current_site(request)
-                NewsletterSubscription.objects.get_or_create(
+                upsert(
+                    NewsletterSubscription,
+                    unique_fields=['email', 'site'],
+                    update_fields=['is_active'],
                     email=user.email,
-                    site=site,
-                    defaults={'is_active': True},
+                    site=get_current_site(request),
+                    is_active=True,
                 )
 
             login(request, user)
@@ -117,14 +121,14 @@ def toggle_newsletter(request):
     action = request.POST.get('action', 'unsubscribe')
 
     if action == 'subscribe':
-        obj, created = NewsletterSubscription.objects.get_or_create(
+        upsert(
+            NewsletterSubscription,
+            unique_fields=['email', 'site'],
+            update_fields=['is_active'],
             email=email,
             site=site,
-            defaults={'is_active': True},
+            is_active=True,
         )
-        if not created and not obj.is_active:
-            obj.is_active = True
-            obj.save(update_fields=['is_active'])
         messages.success(request, 'Inscrição na newsletter ativada! Você receberá nossas novidades por e-mail.')
     else:
         NewsletterSubscription.objects.filter(
@@ -6,7 +6,7 @@ from .models import SiteExtension
 
 @admin.register(SiteExtension)
 class SiteExtensionAdmin(ModelAdmin):
-    list_display = ['site', 'primary_email', 'newsletter_from_email']
+    list_display = ['site', 'primary_email', 'newsletter_from_email', 'newsletter_mode']
     search_fields = ['site__name', 'primary_email']
     fieldsets = [
         ('Site', {
@@ -19,8 +19,11 @@ class SiteExtensionAdmin(ModelAdmin):
             'fields': ('primary_email', 'phone_number', 'address'),
         }),
         ('Newsletter', {
-            'fields': ('newsletter_from_email', 'newsletter_from_name'),
-            'description': 'Configure o remetente das newsletters. Esse email aparecerá como "De:" quando os assinantes receberem a notificação de novos artigos.',
+            'fields': (
+                'newsletter_from_email', 'newsletter_from_name',
+                'newsletter_mode', 'newsletter_digest_interval_hours',
+            ),
+            'description': 'Configure o remetente das newsletters. Esse email aparecerá como "De:" quando os assinantes receberem a notificação de novos artigos. No modo resumo, os artigos publicados são agrupados e enviados pelo comando send_newsletter_digest.',
         }),
         ('Analytics e Redes Sociais', {
             'fields': ('google_analytics_id', 'facebook_url', 'instagram_url', 'youtube_url'),
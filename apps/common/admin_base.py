@@ -0,0 +1,185 @@
+"""
+Base de ModelAdmin para changelists de tabelas grandes.
+
+- EstimatedCountPaginator: no PostgreSQL, acima de ESTIMATE_THRESHOLD linhas
+  usa a estimativa do planner (pg_class.reltuples sem filtro, EXPLAIN com
+  filtro) em vez de COUNT(*), que varre a tabela inteira a cada página.
+  Estimativa acima do real deixa as últimas páginas vazias: ao pedir uma
+  delas, o paginator recorre ao COUNT(*) exato e devolve a última página
+  real (sem cair no ?e=1 do admin).
+- show_full_result_count = False: elimina o segundo COUNT(*) (total sem filtro).
+- list_select_related derivado de list_display: FKs exibidas na listagem
+  (inclusive nullable, que o Django não cobre sozinho) entram no JOIN em vez
+  de uma query por linha.
+- search_backend: 'trigram' (ILIKE acelerado por índices gin_trgm_ops; cada
+  campo vira uma subconsulta e as pks são unidas com UNION, porque um OR
+  entre colunas de tabelas diferentes impede o uso dos índices) ou
+  'fulltext' (SearchVector sobre search_fulltext_fields ou, se vazio,
+  search_fields, com índice GIN da mesma expressão; com
+  search_fulltext_fields, os search_fields seguem no trigram numa busca à
+  parte e as pks das duas são unidas). Fora do PostgreSQL, o
+  full-text cai no LIKE.
+
+Usado por:
+- apps/news/admin.py (Article, Comment, ArticleLike, ArticleBookmark, NewsletterSubscription)
+- apps/hiring/admin.py (Application)
+"""
+import json
+from functools import reduce
+from operator import or_
+
+from django.contrib.admin.utils import lookup_spawns_duplicates
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.text import smart_split, unescape_string_literal
+from unfold.admin import ModelAdmin
+
+from .search import search_query, search_vector
+
+ESTIMATE_THRESHOLD = 100_000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator com contagem estimada no PostgreSQL para tabelas grandes."""
+
+    estimate_threshold = ESTIMATE_THRESHOLD
+    estimated = False
+
+    @cached_property
+    def count(self):
+        estimate = self._estimate()
+        if estimate is not None and estimate >= self.estimate_threshold:
+            self.estimated = True
+            return estimate
+        return super().count
+
+    def page(self, number):
+        """Página pedida; se ficou vazia por causa da estimativa, usa a contagem exata e limita à última página."""
+        try:
+            page = super().page(number)
+        except EmptyPage:
+            if not self.estimated:
+                raise
+        else:
+            if not self.estimated or page.object_list:
+                return page
+        self.estimated = False
+        self.__dict__.pop('num_pages', None)
+        self.__dict__['count'] = Paginator.count.func(self)
+        return super().page(min(int(number), self.num_pages))
+
+    def _estimate(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            if not queryset.query.where and not queryset.query.distinct:
+                # reltuples é -1 em tabelas nunca analisadas (PostgreSQL 14+)
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [connection.ops.quote_name(queryset.model._meta.db_table)],
+                )
+                row = cursor.fetchone()
+                return row[0] if row and row[0] >= 0 else None
+
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+
+
+class BaseAdmin(ModelAdmin):
+    """ModelAdmin do Unfold com contagem estimada e select_related automático."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    search_backend = 'trigram'
+    search_fulltext_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        search_fields = list(self.get_search_fields(request))
+        if not search_term or not search_fields:
+            return queryset, False
+        if self.search_backend != 'fulltext':
+            for bit in self._search_bits(search_term):
+                queryset = queryset.filter(pk__in=self._ilike_pks(bit, search_fields))
+            return queryset, False
+
+        fulltext_fields = list(self.search_fulltext_fields) or search_fields
+        if connections[queryset.db].vendor != 'postgresql':
+            fields = list(dict.fromkeys(search_fields + fulltext_fields))
+            return queryset.filter(self._ilike_condition(search_term, fields)), self._spawns_duplicates(fields)
+
+        if not self.search_fulltext_fields:
+            queryset = queryset.alias(search_document=search_vector(*fulltext_fields))
+            return queryset.filter(search_document=search_query(search_term)), False
+
+        # Texto longo no full-text, campos curtos (nome, e-mail) no trigram: duas buscas
+        # indexadas com as pks unidas. Um OR entre elas faria o PostgreSQL calcular o
+        # tsvector de todas as linhas.
+        base = self.model._base_manager.order_by()
+        fulltext = base.alias(search_document=search_vector(*fulltext_fields)).filter(
+            search_document=search_query(search_term),
+        )
+        trigram = base
+        for bit in self._search_bits(search_term):
+            trigram = trigram.filter(pk__in=self._ilike_pks(bit, search_fields))
+        return queryset.filter(pk__in=fulltext.values('pk').union(trigram.values('pk'))), False
+
+    @staticmethod
+    def _search_bits(search_term):
+        """Termos como o admin os separa (aspas mantêm frases juntas)."""
+        for bit in smart_split(search_term):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            yield bit
+
+    def _ilike_condition(self, search_term, fields):
+        """Mesma semântica do admin: cada termo precisa casar com algum campo."""
+        condition = Q()
+        for bit in self._search_bits(search_term):
+            condition &= reduce(or_, (Q(**{f'{field}__icontains': bit}) for field in fields))
+        return condition
+
+    def _ilike_pks(self, bit, fields):
+        """pks com bit em algum dos campos: um SELECT por campo (cada um no seu índice), unidos."""
+        base = self.model._base_manager.order_by()
+        selects = [base.filter(**{f'{field}__icontains': bit}).values('pk') for field in fields]
+        return selects[0].union(*selects[1:]) if len(selects) > 1 else selects[0]
+
+    def _spawns_duplicates(self, fields):
+        return any(lookup_spawns_duplicates(self.opts, field) for field in fields)
+
+    def get_list_select_related(self, request):
+        if self.list_select_related:
+            return self.list_select_related
+        related = []
+        for name in self.get_list_display(request):
+            if not isinstance(name, str):
+                continue
+            path = self._related_path(name)
+            if path and path not in related:
+                related.append(path)
+        return related or False
+
+    def _related_path(self, name):
+        """'category' -> 'category'; 'job__department__name' -> 'job__department'."""
+        model, path = self.model, []
+        for part in name.split('__'):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                break
+            if not (field.many_to_one or field.one_to_one):
+                break
+            path.append(part)
+            model = field.related_model
+        return '__'.join(path)
@@ -5,3 +5,6 @@ class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.common'
     verbose_name = 'Common'
+
+    def ready(self):
+        import apps.common.signals  # noqa: F401 — invalida o cache de Site/SiteExtension
@@ -1,16 +1,13 @@
-from django.contrib.sites.shortcuts import get_current_site
+from .sites import get_current_site, get_site_settings
 
 
 def site_context(request):
+    """Site atual e SiteExtension, vindos do cache em memória (ver sites.py)."""
     current_site = get_current_site(request)
-    context = {
+    return {
         'current_site': current_site,
+        'site_settings': get_site_settings(current_site),
     }
-    try:
-        context['site_settings'] = current_site.extension
-    except Exception:
-        context['site_settings'] = None
-    return context
 
 
 def news_nav_context(request):
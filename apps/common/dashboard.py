@@ -8,6 +8,7 @@ def dashboard_callback(request, context):
     from apps.contact.models import ContactInquiry
     from apps.hiring.models import Application, JobPosting
     from apps.news.models import Article, Comment, NewsletterSubscription
+    from apps.news.readers import reader_range_context
 
     now = timezone.now()
     start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -36,6 +37,8 @@ def dashboard_callback(request, context):
         'newsletter_subscribers': NewsletterSubscription.objects.filter(
             is_active=True).count(),
         'pending_comments': Comment.objects.filter(is_active=False).count(),
+        # Merge dos sketches no intervalo (padrão 30 dias), cacheado por intervalo
+        **reader_range_context(),
 
         # ── Tendências ──
         'articles_this_month': Article.objects.filter(
@@ -0,0 +1,161 @@
+"""
+Exportação CSV e ZIP em streaming para actions do admin.
+
+O CSV é gerado linha a linha a partir de values_list().iterator(): a memória
+do worker fica constante e não há query extra por linha (FKs entram como
+JOIN via lookups 'site__name', 'job__title' etc.).
+
+O ZIP é montado sob demanda sobre um destino não pesquisável: cada pedaço
+escrito pelo zipfile vai direto para a resposta (tamanhos e CRC em data
+descriptors), sem arquivo temporário nem o arquivo inteiro na memória.
+
+Usado por:
+- apps/news/admin.py (inscritos da newsletter, comentários)
+- apps/hiring/admin.py (candidaturas, ZIP de currículos)
+- apps/contact/admin.py (mensagens de contato)
+"""
+import csv
+import zipfile
+from datetime import datetime
+
+from django.contrib import admin, messages
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_CHUNK_SIZE = 2000
+FILE_CHUNK_SIZE = 64 * 1024
+
+# Células iniciadas por estes caracteres viram fórmula no Excel/LibreOffice
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _Echo:
+    """Pseudo-buffer: csv.writer escreve e o valor volta direto para o gerador."""
+
+    def write(self, value):
+        return value
+
+
+def _format_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'Sim' if value else 'Não'
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime('%d/%m/%Y %H:%M')
+    value = str(value)
+    if value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(filename, header, rows):
+    """StreamingHttpResponse com header + rows (iterável de tuplas) em CSV."""
+    writer = csv.writer(_Echo())
+
+    def generate():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow([_format_cell(value) for value in row])
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def queryset_rows(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Linhas de values_list para columns ((cabeçalho, lookup)), choices pelo rótulo."""
+    lookups = [lookup for _, lookup in columns]
+    choices = [_choices_for(queryset.model, lookup) for lookup in lookups]
+    return (
+        [labels.get(value, value) if labels else value for value, labels in zip(row, choices)]
+        for row in queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+    )
+
+
+def stream_queryset_csv(queryset, filename, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Exporta queryset em CSV; columns é uma sequência de (cabeçalho, lookup).
+
+    Campos com choices são exportados pelo rótulo (get_FOO_display).
+    """
+    header = [label for label, _ in columns]
+    return stream_csv(filename, header, queryset_rows(queryset, columns, chunk_size))
+
+
+def csv_chunks(header, rows):
+    """CSV em bytes UTF-8, uma linha por chunk (para entradas de stream_zip)."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header).encode()
+    for row in rows:
+        yield writer.writerow([_format_cell(value) for value in row]).encode()
+
+
+def file_chunks(storage, name, chunk_size=FILE_CHUNK_SIZE):
+    """Conteúdo de um arquivo do storage em pedaços; só abre quando consumido."""
+    with storage.open(name, 'rb') as file:
+        yield from iter(lambda: file.read(chunk_size), b'')
+
+
+class _ZipStream:
+    """Destino do ZipFile sem tell()/seek(): acumula os bytes até o gerador repassá-los."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+
+def stream_zip(filename, entries):
+    """StreamingHttpResponse com um ZIP montado durante o download.
+
+    entries é um iterável (consumido sob demanda) de (nome, chunks, compress_type):
+    use ZIP_STORED para conteúdo já comprimido (PDF, DOCX) e ZIP_DEFLATED para texto.
+    """
+
+    def generate():
+        stream = _ZipStream()
+        with zipfile.ZipFile(stream, 'w') as archive:
+            for name, chunks, compress_type in entries:
+                info = zipfile.ZipInfo(name, date_time=timezone.localtime().timetuple()[:6])
+                info.compress_type = compress_type
+                info.external_attr = 0o644 << 16
+                with archive.open(info, 'w') as target:
+                    for chunk in chunks:
+                        target.write(chunk)
+                        yield from stream.drain()
+                yield from stream.drain()
+        yield from stream.drain()  # diretório central, escrito no close()
+
+    response = StreamingHttpResponse(generate(), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _choices_for(model, lookup):
+    *relations, name = lookup.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    field = model._meta.get_field(name)
+    return dict(field.flatchoices) if field.choices else None
+
+
+def csv_export_action(filename, columns, description='Exportar selecionados como CSV', superuser_only=False):
+    """Cria uma admin action que exporta os itens selecionados via stream_queryset_csv."""
+
+    @admin.action(description=description)
+    def export_csv(modeladmin, request, queryset):
+        if superuser_only and not request.user.is_superuser:
+            modeladmin.message_user(request, 'Apenas superusuários podem exportar estes dados.', messages.ERROR)
+            return None
+        return stream_queryset_csv(queryset, filename, columns)
+
+    return export_csv
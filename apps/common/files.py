@@ -0,0 +1,213 @@
+"""
+Uploads em streaming com hash e detecção de tipo, e armazenamento por conteúdo.
+
+HashingUploadHandler grava o arquivo em disco em chunks (nunca na RAM do
+worker), calculando o SHA-256 e lendo os magic bytes na mesma passada. O
+tipo real vem do conteúdo, não do content_type enviado pelo cliente.
+
+save_content_addressed() grava o arquivo em '<prefixo>/<aa>/<sha256><ext>':
+o mesmo conteúdo enviado várias vezes ocupa o disco uma única vez.
+ContentAddressedStorage faz o mesmo como storage de um FileField: o nome
+gerado pelo upload_to só contribui com o diretório e a extensão. Como o nome
+muda junto com o conteúdo, o nginx serve esses arquivos com Cache-Control
+immutable (hashed_storage: logos, capas, fotos, avatares, miniaturas).
+
+ProtectedMediaStorage grava no MEDIA_ROOT como o default_storage, mas o
+.url dos arquivos aponta para a view protected_media (apps/common/views.py),
+que confere a permissão antes de entregar o arquivo.
+
+concatenate_files() junta partes de um upload no kernel (copy_file_range),
+sem passar os bytes pelo Python.
+
+Usado por:
+- apps/hiring/views.py e apps/hiring/forms.py (currículos)
+- apps/hiring/models.py (Application.resume, via ProtectedMediaStorage)
+- apps/media_library/models.py (MediaFile.file, via ContentAddressedStorage)
+- apps/common, news, school e accounts models.py (imagens, via hashed_storage)
+- apps/media_library/previews.py (miniaturas, via hashed_storage)
+- apps/media_library/uploads.py (montagem dos uploads em partes)
+"""
+import hashlib
+import os
+import re
+import shutil
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+from django.utils.functional import cached_property
+
+SNIFF_BYTES = 16
+CONTENT_ADDRESSED_RE = re.compile(r'(^|/)[0-9a-f]{2}/[0-9a-f]{64}(\.[A-Za-z0-9]+)?$')
+
+# (assinatura, deslocamento, MIME)
+MAGIC_SIGNATURES = [
+    (b'%PDF-', 0, 'application/pdf'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 0, 'application/msword'),  # OLE2 (.doc)
+    (b'PK\x03\x04', 0, 'application/zip'),  # .docx/.xlsx/.zip
+    (b'\x89PNG\r\n\x1a\n', 0, 'image/png'),
+    (b'\xff\xd8\xff', 0, 'image/jpeg'),
+    (b'GIF87a', 0, 'image/gif'),
+    (b'GIF89a', 0, 'image/gif'),
+    (b'WEBP', 8, 'image/webp'),  # RIFF....WEBP
+    (b'WAVE', 8, 'audio/wav'),  # RIFF....WAVE
+    (b'ID3', 0, 'audio/mpeg'),
+    (b'OggS', 0, 'audio/ogg'),
+    (b'ftyp', 4, 'video/mp4'),  # ISO base media (.mp4/.mov/.m4a)
+    (b'\x1a\x45\xdf\xa3', 0, 'video/webm'),  # EBML (.webm/.mkv)
+]
+
+
+def sniff_type(head):
+    """MIME a partir dos primeiros bytes do arquivo, ou None se desconhecido."""
+    for signature, offset, mime in MAGIC_SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return mime
+    return None
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    Grava os campos field_names em arquivo temporário, com sha256 e sniffed_type.
+
+    Acima de max_size para de gravar (mas continua contando): o arquivo chega
+    ao form com .size real e truncated=True, para a validação recusar.
+    Deve ser instalado antes de request.POST/FILES serem lidos (ver a view).
+    """
+
+    def __init__(self, request=None, field_names=(), max_size=None):
+        super().__init__(request)
+        self.field_names = set(field_names)
+        self.max_size = max_size
+        self.active = False
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.active = field_name in self.field_names
+        if not self.active:
+            return
+        self.file = TemporaryUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+        self.hash = hashlib.sha256()
+        self.head = b''
+        self.size = 0
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        if len(self.head) < SNIFF_BYTES:
+            self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+        self.size += len(raw_data)
+        if self.max_size is None or self.size <= self.max_size:
+            self.hash.update(raw_data)
+            self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        self.file.seek(0)
+        self.file.size = self.size
+        self.file.sha256 = self.hash.hexdigest()
+        self.file.sniffed_type = sniff_type(self.head)
+        self.file.truncated = self.max_size is not None and self.size > self.max_size
+        return self.file
+
+
+def describe_upload(file):
+    """Garante sha256/sniffed_type em arquivos que não passaram pelo HashingUploadHandler."""
+    if not hasattr(file, 'sha256'):
+        digest = hashlib.sha256()
+        file.seek(0)
+        head = file.read(SNIFF_BYTES)
+        for chunk in file.chunks():  # chunks() volta ao início do arquivo
+            digest.update(chunk)
+        file.seek(0)
+        file.sha256 = digest.hexdigest()
+        file.sniffed_type = sniff_type(head)
+        file.truncated = False
+    return file
+
+
+def content_addressed_name(prefix, digest, extension):
+    return f'{prefix}/{digest[:2]}/{digest}{extension}'
+
+
+def is_content_addressed(name):
+    """True para nomes no formato de content_addressed_name (mesmo padrão da location immutable do nginx)."""
+    return bool(CONTENT_ADDRESSED_RE.search(name))
+
+
+def save_content_addressed(file, prefix, extension=None, storage=None):
+    """Salva pelo SHA-256 do conteúdo; se já existe, reaproveita. Retorna o nome."""
+    storage = storage or default_storage
+    describe_upload(file)
+    if extension is None:
+        extension = os.path.splitext(file.name)[1].lower()
+    name = content_addressed_name(prefix, file.sha256, extension)
+    if not storage.exists(name):
+        file.seek(0)
+        saved = storage.save(name, file)
+        if saved != name:
+            # Corrida: outro processo gravou o mesmo conteúdo entre exists() e save()
+            storage.delete(saved)
+    return name
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage que grava cada conteúdo uma vez, em '<dir>/<aa>/<sha256><ext>'.
+
+    save() devolve o nome já existente quando o conteúdo se repete. Como um
+    arquivo pode ser compartilhado, quem apaga precisa controlar as referências
+    (ver apps/media_library/models.py).
+    """
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        describe_upload(content)
+        directory, filename = os.path.split(name)
+        target = content_addressed_name(directory, content.sha256, os.path.splitext(filename)[1].lower())
+        if not self.exists(target):
+            content.seek(0)
+            saved = super().save(target, content, max_length=max_length)
+            if saved != target:
+                # Corrida: outro processo gravou o mesmo conteúdo entre exists() e save()
+                self.delete(saved)
+        return target
+
+
+# Imagens públicas enviadas pelo admin; arquivos podem ser compartilhados, nunca apagar pelo nome
+hashed_storage = ContentAddressedStorage()
+
+
+class ProtectedMediaStorage(FileSystemStorage):
+    """Mesmo diretório do MEDIA_ROOT; .url em PROTECTED_MEDIA_URL em vez de MEDIA_URL."""
+
+    @cached_property
+    def base_url(self):
+        return settings.PROTECTED_MEDIA_URL
+
+
+protected_storage = ProtectedMediaStorage()
+
+
+def concatenate_files(paths, destination):
+    """Acrescenta o conteúdo de paths ao arquivo aberto destination, na ordem."""
+    destination.flush()
+    target = destination.fileno()
+    for path in paths:
+        with open(path, 'rb') as source:
+            remaining = os.fstat(source.fileno()).st_size
+            try:
+                while remaining:
+                    copied = os.copy_file_range(source.fileno(), target, remaining)
+                    if not copied:
+                        break
+                    remaining -= copied
+            except (AttributeError, OSError):
+                # Sem copy_file_range (fora do Linux, FS sem suporte): cópia comum do restante
+                with open(target, 'wb', closefd=False) as output:
+                    shutil.copyfileobj(source, output)
@@ -0,0 +1,40 @@
+"""
+Gera os CSS do Tailwind dos sites públicos a partir dos templates.
+
+Entradas em assets/tailwind/, saídas minificadas em static/css/ (versionadas
+no git e servidas pelo WhiteNoise com hash no nome). Rodar depois de mudar
+classes nos templates:
+
+    python manage.py build_css
+
+Usa o CLI standalone do Tailwind v4 (pacote tailwindcss-bin, em
+requirements/development.txt) — sem Node.
+"""
+import shutil
+import subprocess
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+STYLESHEETS = [
+    ('assets/tailwind/news.css', 'static/css/news.css'),
+    ('assets/tailwind/school.css', 'static/css/school.css'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Gera static/css/*.css com o Tailwind a partir das classes usadas nos templates.'
+
+    def handle(self, *args, **options):
+        binary = shutil.which('tailwindcss')
+        if binary is None:
+            raise CommandError('CLI do Tailwind não encontrado: pip install -r requirements/development.txt')
+        for source, output in STYLESHEETS:
+            result = subprocess.run(
+                [binary, '--input', source, '--output', output, '--minify'],
+                cwd=settings.BASE_DIR, capture_output=True, text=True,
+            )
+            if result.returncode:
+                raise CommandError(f'Falha ao gerar {output}:\n{result.stderr}')
+            self.stdout.write(f'{output}: {(settings.BASE_DIR / output).stat().st_size // 1024} KB')
+        self.stdout.write(self.style.SUCCESS('CSS gerado.'))
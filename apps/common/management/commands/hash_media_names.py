@@ -0,0 +1,43 @@
+"""
+Regrava com nome endereçado por conteúdo as imagens enviadas antes do hashed_storage.
+
+Percorre os campos de arquivo que usam hashed_storage (logos, capas, fotos,
+avatares) e, para cada nome antigo, grava o conteúdo em '<dir>/<aa>/<sha256><ext>'
+e atualiza o registro. Os arquivos antigos ficam no disco: podem estar
+referenciados no HTML de artigos e páginas.
+
+    python manage.py hash_media_names
+"""
+from django.apps import apps
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from apps.common.files import hashed_storage, is_content_addressed
+from apps.common.sites import invalidate_site_cache
+
+
+class Command(BaseCommand):
+    help = 'Renomeia imagens antigas para nomes com hash do conteúdo (cache immutable no nginx).'
+
+    def handle(self, *args, **options):
+        renamed = missing = 0
+        for model in apps.get_models():
+            for field in model._meta.get_fields():
+                if not isinstance(field, models.FileField) or field.storage is not hashed_storage:
+                    continue
+                rows = model._base_manager.exclude(**{field.name: ''}).values_list('pk', field.name)
+                for pk, name in rows.iterator():
+                    if is_content_addressed(name):
+                        continue
+                    if not hashed_storage.exists(name):
+                        self.stderr.write(f'Arquivo ausente: {name} ({model._meta.label} pk={pk})')
+                        missing += 1
+                        continue
+                    with hashed_storage.open(name, 'rb') as source:
+                        new_name = hashed_storage.save(name, File(source, name=name))
+                    model._base_manager.filter(pk=pk).update(**{field.name: new_name})
+                    renamed += 1
+        if renamed:
+            invalidate_site_cache()  # logo/favicon do SiteExtension em memória nos workers
+        self.stdout.write(self.style.SUCCESS(f'{renamed} arquivo(s) renomeado(s), {missing} ausente(s).'))
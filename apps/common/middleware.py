@@ -0,0 +1,31 @@
+"""
+Resolve o Site de cada requisição pelo header Host.
+
+Substitui o CurrentSiteMiddleware do Django, que com SITE_ID definido sempre
+devolve o mesmo site. O mapa de hosts fica em memória (apps/common/sites.py),
+então a resolução não faz query; a versão do cache compartilhado é lida uma
+vez e fixada para o resto da requisição (pin_site_state).
+
+Usado por:
+- config/settings/base.py (MIDDLEWARE)
+"""
+from .sites import activate_site, deactivate_site, pin_site_state, resolve_site, unpin_site_state
+
+
+class SiteMiddleware:
+    """Define request.site e o site atual do contexto (CurrentSiteManager) durante a requisição."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state_token = pin_site_state()
+        try:
+            request.site = resolve_site(request.get_host())
+            token = activate_site(request.site)
+            try:
+                return self.get_response(request)
+            finally:
+                deactivate_site(token)
+        finally:
+            unpin_site_state(state_token)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0004_siteextension_newsletter_from_email_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='siteextension',
+            name='newsletter_digest_interval_hours',
+            field=models.PositiveIntegerField(default=24, help_text='Tempo mínimo entre dois resumos. Ex: 24 = um resumo por dia.', verbose_name='Intervalo do resumo (horas)'),
+        ),
+        migrations.AddField(
+            model_name='siteextension',
+            name='newsletter_mode',
+            field=models.CharField(choices=[('per_article', 'Um e-mail por artigo publicado'), ('digest', 'Resumo periódico (digest)')], default='per_article', help_text='Resumo periódico: os artigos publicados são agrupados em um único e-mail, enviado pelo comando send_newsletter_digest (agendado via cron).', max_length=20, verbose_name='Modo de envio da Newsletter'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:30
+
+import apps.common.files
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0005_newsletter_digest_mode'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='siteextension',
+            name='favicon',
+            field=models.ImageField(blank=True, storage=apps.common.files.ContentAddressedStorage(), upload_to='site_favicons/'),
+        ),
+        migrations.AlterField(
+            model_name='siteextension',
+            name='logo',
+            field=models.ImageField(blank=True, storage=apps.common.files.ContentAddressedStorage(), upload_to='site_logos/'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.sites.models import Site
 
+from .files import hashed_storage
+
 
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -20,10 +22,14 @@ class SEOModel(models.Model):
 
 
 class SiteExtension(models.Model):
+    class NewsletterMode(models.TextChoices):
+        PER_ARTICLE = 'per_article', 'Um e-mail por artigo publicado'
+        DIGEST = 'digest', 'Resumo periódico (digest)'
+
     site = models.OneToOneField(Site, on_delete=models.CASCADE, related_name='extension')
     tagline = models.CharField(max_length=255, blank=True)
-    logo = models.ImageField(upload_to='site_logos/', blank=True)
-    favicon = models.ImageField(upload_to='site_favicons/', blank=True)
+    logo = models.ImageField(upload_to='site_logos/', storage=hashed_storage, blank=True)
+    favicon = models.ImageField(upload_to='site_favicons/', storage=hashed_storage, blank=True)
     primary_email = models.EmailField(blank=True)
     phone_number = models.CharField(max_length=30, blank=True)
     address = models.TextField(blank=True)
@@ -35,6 +41,16 @@ class SiteExtension(models.Model):
         'Nome remetente da Newsletter', max_length=100, blank=True,
         help_text='Nome exibido como remetente. Ex: Equipe Kelly News',
     )
+    newsletter_mode = models.CharField(
+        'Modo de envio da Newsletter', max_length=20,
+        choices=NewsletterMode.choices, default=NewsletterMode.PER_ARTICLE,
+        help_text='Resumo periódico: os artigos publicados são agrupados em um único e-mail, '
+                  'enviado pelo comando send_newsletter_digest (agendado via cron).',
+    )
+    newsletter_digest_interval_hours = models.PositiveIntegerField(
+        'Intervalo do resumo (horas)', default=24,
+        help_text='Tempo mínimo entre dois resumos. Ex: 24 = um resumo por dia.',
+    )
     google_analytics_id = models.CharField(max_length=30, blank=True)
     facebook_url = models.URLField(blank=True)
     instagram_url = models.URLField(blank=True)
@@ -0,0 +1,58 @@
+"""
+Paginação por cursor (keyset) sobre (campo de data, pk).
+
+Diferente do Paginator (OFFSET + COUNT), o custo de cada página é constante:
+a consulta continua a partir do último item visto usando o índice, sem contar
+nem pular linhas. Indicado para listas que só crescem (comentários, favoritos).
+
+Usado por:
+- apps/news/views.py (comentários do artigo, abas do dashboard)
+"""
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Q
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_cursor(value, pk):
+    """Cursor opaco '<microssegundos desde epoch>.<pk>' — exato, sem perda de float."""
+    return f'{(value - _EPOCH) // _MICROSECOND}.{pk}'
+
+
+def decode_cursor(cursor):
+    """Retorna (datetime, pk) ou None para cursor ausente/malformado."""
+    if not cursor:
+        return None
+    try:
+        micros, pk = cursor.split('.', 1)
+        return _EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except (ValueError, OverflowError):
+        return None
+
+
+def paginate_by_cursor(queryset, cursor, per_page, field='created_at', descending=True):
+    """Retorna (itens da página, cursor da próxima página ou None).
+
+    Busca per_page + 1 linhas para saber se há próxima página sem COUNT(*).
+    """
+    if descending:
+        queryset = queryset.order_by(f'-{field}', '-pk')
+        op = 'lt'
+    else:
+        queryset = queryset.order_by(field, 'pk')
+        op = 'gt'
+
+    position = decode_cursor(cursor)
+    if position is not None:
+        value, pk = position
+        queryset = queryset.filter(Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'pk__{op}': pk}))
+
+    items = list(queryset[:per_page + 1])
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+    return items, next_cursor
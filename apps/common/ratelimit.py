@@ -0,0 +1,99 @@
+"""
+Limite de requisições por endpoint (janela deslizante) no cache.
+
+@rate_limit('comment', key='user') aplica a política RATE_LIMITS['comment']
+('10/10m' = 10 requisições a cada 10 minutos) por usuário; key='ip' conta
+por IP, resolvido por get_client_ip (mesma regra do AXES_PROXY_COUNT, então
+X-Forwarded-For forjado não cria identidades novas). Decorators empilhados
+combinam políticas (ex.: por usuário e por IP).
+
+Contagem em janela deslizante aproximada: um contador por janela fixa e a
+estimativa soma o contador atual com a fração ainda "dentro" da janela do
+anterior. Custa uma leitura (get_many) e um incr por requisição liberada —
+sem lock nem read-modify-write. Requisições recusadas não contam.
+
+Os contadores ficam no cache padrão (CACHES; Redis em produção), que é
+compartilhado pelos workers do Gunicorn: o limite vale para o servidor todo.
+
+Usado por:
+- apps/contact/views.py (contact_page)
+- apps/news/views.py (newsletter_subscribe, add_comment, toggle_like, toggle_bookmark)
+- apps/hiring/views.py (job_detail — antes de ler o upload do currículo)
+"""
+import math
+import re
+import time
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .utils import get_client_ip
+
+_RATE_RE = re.compile(r'^(\d+)/(\d*)([smhd])$')
+_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+@lru_cache
+def parse_rate(rate):
+    """'5/10m' -> (5, 600)."""
+    match = _RATE_RE.match(rate.replace(' ', ''))
+    if match is None:
+        raise ValueError(f'Taxa inválida: {rate!r} (use "N/período", ex.: "5/10m").')
+    limit, amount, unit = match.groups()
+    return int(limit), int(amount or 1) * _UNITS[unit]
+
+
+def check_rate(scope, identity, limit, window, now=None):
+    """Conta a requisição se estiver dentro do limite; senão devolve os segundos até liberar (Retry-After)."""
+    now = time.time() if now is None else now
+    current = int(now // window)
+    elapsed = now - current * window
+    key, previous_key = f'rl:{scope}:{identity}:{current}', f'rl:{scope}:{identity}:{current - 1}'
+
+    counts = cache.get_many([key, previous_key])
+    count, previous = counts.get(key, 0), counts.get(previous_key, 0)
+    weight = (window - elapsed) / window
+    if count + previous * weight >= limit:
+        if count >= limit or not previous:
+            return math.ceil(window - elapsed)
+        # Espera até a parte restante da janela anterior cair abaixo do limite
+        return max(1, math.ceil(window - elapsed - (limit - count) * window / previous))
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, window * 2):
+            cache.incr(key)
+    return 0
+
+
+def _identity(request, key):
+    if key == 'user' and request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'ip:{get_client_ip(request)}'
+
+
+def rate_limit(scope, key='ip', methods=('POST',)):
+    """Limita a view pela política RATE_LIMITS[scope]; escopo sem política não é limitado."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            rate = settings.RATE_LIMITS.get(scope)
+            if rate and request.method in methods:
+                limit, window = parse_rate(rate)
+                retry_after = check_rate(scope, _identity(request, key), limit, window)
+                if retry_after:
+                    response = HttpResponse(
+                        'Muitas tentativas em pouco tempo. Aguarde um pouco e tente novamente.',
+                        status=429, content_type='text/plain; charset=utf-8',
+                    )
+                    response['Retry-After'] = str(retry_after)
+                    return response
+            return view(request, *args, **kwargs)
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,68 @@
+"""
+Busca indexada no PostgreSQL (full-text e trigram) com fallback para SQLite.
+
+- Full-text: SearchVector com o dicionário SEARCH_CONFIG; o índice GIN é
+  criado sobre a mesma expressão (search_vector), então o planner o usa.
+- Trigram: icontains vira UPPER(coluna::text) LIKE UPPER('%termo%') no
+  PostgreSQL, então o índice GIN gin_trgm_ops é criado sobre UPPER(coluna)
+  (trigram_index) — um índice na coluna pura nunca casa com essa expressão.
+  O planner só usa o índice se cada condição do OR tiver o seu; por isso o
+  BaseAdmin busca campo a campo e une as pks em vez de um OR entre tabelas.
+
+Os índices são criados por postgres_search_indexes() nas migrations e só
+existem no PostgreSQL; no SQLite (testes/dev) a operação é ignorada.
+
+Usado por:
+- apps/common/admin_base.py (BaseAdmin.search_backend)
+- migrations de news, accounts e hiring (índices de busca)
+"""
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import migrations
+from django.db.models.functions import Upper
+
+SEARCH_CONFIG = 'portuguese'
+
+
+def search_vector(*fields):
+    return SearchVector(*fields, config=SEARCH_CONFIG)
+
+
+def search_query(term):
+    """Sintaxe de buscador web: aspas para frase, '-' para excluir, 'or'."""
+    return SearchQuery(term, search_type='websearch', config=SEARCH_CONFIG)
+
+
+def trigram_index(*fields, name):
+    """GIN gin_trgm_ops sobre UPPER(campo), a expressão que icontains gera no PostgreSQL."""
+    return GinIndex(*(OpClass(Upper(field), name='gin_trgm_ops') for field in fields), name=name)
+
+
+def postgres_search_indexes(app_label, model_name, indexes, extensions=('pg_trgm',), replaces=()):
+    """RunPython que cria os índices com CONCURRENTLY apenas no PostgreSQL.
+
+    replaces: índices antigos removidos antes (e recriados ao reverter).
+    A migration que usa esta operação deve declarar atomic = False.
+    """
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for extension in extensions:
+            schema_editor.execute(f'CREATE EXTENSION IF NOT EXISTS {extension}')
+        model = apps.get_model(app_label, model_name)
+        for index in replaces:
+            schema_editor.remove_index(model, index, concurrently=True)
+        for index in indexes:
+            schema_editor.add_index(model, index, concurrently=True)
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        model = apps.get_model(app_label, model_name)
+        for index in indexes:
+            schema_editor.remove_index(model, index, concurrently=True)
+        for index in replaces:
+            schema_editor.add_index(model, index, concurrently=True)
+
+    return migrations.RunPython(forwards, backwards)
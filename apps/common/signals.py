@@ -0,0 +1,13 @@
+from django.contrib.sites.models import Site
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import SiteExtension
+from .sites import invalidate_site_cache
+
+
+@receiver([post_save, post_delete], sender=Site)
+@receiver([post_save, post_delete], sender=SiteExtension)
+def invalidate_sites_on_change(sender, **kwargs):
+    """Site ou SiteExtension alterado: todos os workers descartam o cache em memória."""
+    invalidate_site_cache()
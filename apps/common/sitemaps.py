@@ -0,0 +1,18 @@
+"""
+Base dos sitemaps: URLs com o domínio do site da requisição.
+
+A view de sitemap do Django passa o Site do SITE_ID; aqui o domínio vem do
+site resolvido pelo Host (apps/common/sites.py).
+
+Usado por:
+- apps/news/sitemaps.py
+- apps/school/sitemaps.py
+"""
+from django.contrib.sitemaps import Sitemap
+
+from .sites import current_site
+
+
+class CurrentSiteSitemap(Sitemap):
+    def get_domain(self, site=None):
+        return current_site().domain
@@ -0,0 +1,164 @@
+"""
+Site da requisição pelo Host e cache em memória de Site/SiteExtension.
+
+Um mesmo pool de workers atende vários domínios (escola, portal de notícias,
+outras escolas): SiteMiddleware resolve o Site pelo header Host num mapa
+domínio -> Site mantido em memória no worker, guarda em request.site e num
+ContextVar, e CurrentSiteManager (Article.on_site, Page.on_site) filtra pelo
+site da requisição. Host desconhecido, comandos de gerenciamento e tarefas
+fora de requisição usam o SITE_ID (site padrão).
+
+O mapa de hosts (carregado ao subir o worker, ver config/wsgi.py) e os
+SiteExtension por site_id (inclusive a ausência, None) ficam em memória. Os
+signals do Django só limpam o SITE_CACHE do processo que salvou; para valer
+em todos os workers, salvar/excluir Site ou SiteExtension incrementa uma
+versão no cache compartilhado (CACHES, Redis em produção; ver signals.py) e
+cada leitura compara essa versão com a que o processo conhece, recarregando
+se mudou — nenhuma query. O SiteMiddleware fixa esse estado no início da
+requisição (pin_site_state), então cada requisição faz uma única leitura do
+cache, por mais que resolva o site ou leia o SiteExtension. Como rede de
+segurança (cache não compartilhado, chave de versão despejada), a cópia
+local também expira após SITES_LOCAL_TIMEOUT segundos. Alterações via queryset.update() não
+disparam signals: chame invalidate_site_cache() depois.
+
+Usado por:
+- apps/common/middleware.py (SiteMiddleware)
+- apps/common/context_processors.py (site_context)
+- apps/common/signals.py (invalida ao salvar/excluir)
+- apps/news/models.py, apps/school/models.py (on_site)
+- apps/news/feeds.py, apps/*/sitemaps.py (domínio dos links absolutos)
+- views que gravam ou comparam o site atual (contato, vagas, newsletter, contas)
+"""
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.sites import managers
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.http.request import split_domain_port
+
+SITES_VERSION_KEY = 'common:sites:version'
+SITES_LOCAL_TIMEOUT = 60
+
+_request_site = ContextVar('request_site', default=None)
+_request_state = ContextVar('request_sites_state', default=None)
+
+# Estado por processo; trocado por inteiro (não mutado) ao mudar a versão
+_state = {'version': None, 'expires': 0, 'settings': {}, 'sites': None}
+
+
+def invalidate_site_cache():
+    if not cache.add(SITES_VERSION_KEY, 2, None):
+        try:
+            cache.incr(SITES_VERSION_KEY)
+        except ValueError:  # chave expirou entre add() e incr()
+            cache.set(SITES_VERSION_KEY, 2, None)
+    if _request_state.get() is not None:
+        # A própria requisição alterou o site: o resto dela relê a versão nova
+        _request_state.set(None)
+
+
+def pin_site_state():
+    """Fixa o estado atual na requisição (uma leitura do cache); devolve o token para unpin_site_state()."""
+    return _request_state.set(_current_state())
+
+
+def unpin_site_state(token):
+    _request_state.reset(token)
+
+
+def _current_state():
+    global _state
+
+    pinned = _request_state.get()
+    if pinned is not None:
+        return pinned
+    version = cache.get(SITES_VERSION_KEY, 1)
+    state, now = _state, time.monotonic()
+    if version != state['version'] or now >= state['expires']:
+        Site.objects.clear_cache()
+        state = _state = {'version': version, 'expires': now + SITES_LOCAL_TIMEOUT, 'settings': {}, 'sites': None}
+    return state
+
+
+def _sites(state):
+    """(domínio -> Site, id -> Site), carregados numa query por versão."""
+    if state['sites'] is None:
+        sites = list(Site.objects.all())
+        state['sites'] = (
+            {site.domain.lower(): site for site in sites},
+            {site.pk: site for site in sites},
+        )
+    return state['sites']
+
+
+def preload_sites():
+    """Carrega o mapa de hosts ao subir o worker; sem banco, fica para a primeira requisição."""
+    try:
+        _sites(_current_state())
+    except DatabaseError:
+        pass
+    finally:
+        # Roda no import do WSGI, fora de requisição: nada fecharia essa conexão
+        connections.close_all()
+
+
+def default_site():
+    """Site do SITE_ID, usado para hosts desconhecidos e fora de requisições."""
+    by_id = _sites(_current_state())[1]
+    return by_id.get(settings.SITE_ID) or Site.objects.get_current()
+
+
+def resolve_site(host):
+    """Site cujo domínio é o host (com ou sem a porta); senão o site padrão."""
+    by_domain = _sites(_current_state())[0]
+    host = host.lower()
+    site = by_domain.get(host) or by_domain.get(split_domain_port(host)[0])
+    return site if site is not None else default_site()
+
+
+def get_current_site(request):
+    """Site da requisição (request.site, preenchido pelo SiteMiddleware) ou resolvido pelo Host."""
+    site = getattr(request, 'site', None)
+    return site if site is not None else resolve_site(request.get_host())
+
+
+def current_site():
+    """Site da requisição em andamento; fora de requisições, o site padrão."""
+    site = _request_site.get()
+    return site if site is not None else default_site()
+
+
+def activate_site(site):
+    """Define o site atual do contexto; devolve o token para _request_site.reset()."""
+    return _request_site.set(site)
+
+
+def deactivate_site(token):
+    _request_site.reset(token)
+
+
+def get_site_settings(site):
+    """SiteExtension do site (None se ainda não foi criado), sem query depois da primeira leitura."""
+    from .models import SiteExtension
+
+    settings_cache = _current_state()['settings']
+    try:
+        return settings_cache[site.pk]
+    except KeyError:
+        extension = SiteExtension.objects.filter(site_id=site.pk).first()
+        settings_cache[site.pk] = extension
+        return extension
+
+
+class CurrentSiteManager(managers.CurrentSiteManager):
+    """on_site que segue o site da requisição, não o SITE_ID fixo."""
+
+    def get_queryset(self):
+        site = _request_site.get()
+        site_id = site.pk if site is not None else settings.SITE_ID
+        return super(managers.CurrentSiteManager, self).get_queryset().filter(
+            **{f'{self._get_field_name()}__id': site_id},
+        )
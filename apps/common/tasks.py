@@ -0,0 +1,41 @@
+"""
+Execução em segundo plano sem broker externo.
+
+Um pool de threads por processo (worker do gunicorn) roda tarefas longas fora
+do ciclo request/response. O estado da tarefa deve ficar no banco (ex:
+NewsletterJob) para que qualquer worker consiga exibir o progresso.
+
+Limitação: a tarefa morre junto com o processo (restart/deploy). Por isso as
+tarefas devem ser idempotentes ou registrar o que já foi feito.
+
+Usado por:
+- apps/news/admin.py (envio assíncrono da newsletter)
+- apps/hiring/views.py e apps/hiring/admin.py (extração de texto dos currículos)
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='background')
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Tarefa em segundo plano falhou: %s', func.__qualname__)
+    finally:
+        # Threads do pool não passam pelo request_finished: fecha a conexão aqui
+        connections.close_all()
+
+
+def enqueue(func, *args, **kwargs):
+    """Agenda func(*args, **kwargs) no pool após o commit da transação atual.
+
+    Esperar o commit garante que a thread enxergue as linhas criadas na
+    request (ex: o job recém-criado).
+    """
+    transaction.on_commit(lambda: _executor.submit(_run, func, args, kwargs))
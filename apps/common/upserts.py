@@ -0,0 +1,96 @@
+"""
+Upserts e toggles atômicos em um único statement SQL.
+
+Substituem o padrão get_or_create() + delete()/save(), que custa 3-4 round-trips
+e tem janela de corrida em cliques duplos. Dependem de uma constraint única
+cobrindo os campos de lookup (ON CONFLICT).
+
+Usado por:
+- apps/news/views.py (toggle_like, toggle_bookmark, newsletter_subscribe)
+- apps/accounts/views.py (register_view, toggle_newsletter)
+"""
+from django.db import connection, transaction
+
+
+def upsert(model, unique_fields, update_fields, **values):
+    """INSERT ... ON CONFLICT (unique_fields) DO UPDATE SET update_fields.
+
+    Campos auto_now (updated_at) são atualizados junto com update_fields.
+    """
+    auto_now = [
+        field.name for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) and field.name not in update_fields
+    ]
+    model.objects.bulk_create(
+        [model(**values)],
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=[*update_fields, *auto_now],
+    )
+
+
+def toggle_row(model, count_by, defaults=None, **lookup):
+    """Remove a linha que casa com lookup se existir; senão a cria.
+
+    Retorna (ativo, total): se a linha existe após o toggle e quantas linhas
+    compartilham o valor de count_by (ex: curtidas do artigo).
+
+    No PostgreSQL é um único statement (DELETE ... RETURNING + INSERT ...
+    ON CONFLICT DO NOTHING em CTEs); nos demais bancos, DELETE + INSERT OR
+    IGNORE + COUNT dentro de uma transação.
+    """
+    if connection.vendor == 'postgresql':
+        return _toggle_row_postgresql(model, count_by, defaults or {}, lookup)
+
+    with transaction.atomic():
+        deleted, _ = model.objects.filter(**lookup).delete()
+        if not deleted:
+            model.objects.bulk_create([model(**lookup, **(defaults or {}))], ignore_conflicts=True)
+        total = model.objects.filter(**{count_by: lookup[count_by]}).count()
+    return not deleted, total
+
+
+def _toggle_row_postgresql(model, count_by, defaults, lookup):
+    opts = model._meta
+    qn = connection.ops.quote_name
+    instance = model(**lookup, **defaults)
+
+    where_columns, where_params = [], []
+    for name, value in lookup.items():
+        field = opts.get_field(name)
+        where_columns.append(f'{qn(field.column)} = %s')
+        where_params.append(field.get_db_prep_value(getattr(instance, field.attname), connection))
+
+    insert_columns, insert_values, insert_params = [], [], []
+    for field in opts.concrete_fields:
+        if field.primary_key:
+            continue
+        insert_columns.append(qn(field.column))
+        # CAST explícito: em INSERT ... SELECT o Postgres não infere o tipo dos parâmetros
+        insert_values.append(f'CAST(%s AS {field.db_type(connection)})')
+        insert_params.append(field.get_db_prep_save(field.pre_save(instance, add=True), connection))
+
+    count_field = opts.get_field(count_by)
+    table = qn(opts.db_table)
+    where = ' AND '.join(where_columns)
+    sql = f"""
+        WITH deleted AS (
+            DELETE FROM {table} WHERE {where} RETURNING 1
+        ), inserted AS (
+            INSERT INTO {table} ({', '.join(insert_columns)})
+            SELECT {', '.join(insert_values)}
+            WHERE NOT EXISTS (SELECT 1 FROM deleted)
+            ON CONFLICT DO NOTHING
+            RETURNING 1
+        )
+        SELECT
+            EXISTS (SELECT 1 FROM inserted),
+            (SELECT COUNT(*) FROM {table} WHERE {qn(count_field.column)} = %s)
+                - (SELECT COUNT(*) FROM deleted)
+                + (SELECT COUNT(*) FROM inserted)
+    """
+    count_value = count_field.get_db_prep_value(getattr(instance, count_field.attname), connection)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*where_params, *insert_params, count_value])
+        active, total = cursor.fetchone()
+    return active, total
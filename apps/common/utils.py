@@ -0,0 +1,17 @@
+from django.conf import settings
+
+
+def get_client_ip(request):
+    """IP real do cliente atrás de N proxies confiáveis (mesma regra do AXES_PROXY_COUNT).
+
+    Com AXES_PROXY_COUNT = 1 (nginx usando $proxy_add_x_forwarded_for), o último
+    item do X-Forwarded-For é o endereço visto pelo nginx — os anteriores podem
+    ter sido forjados pelo cliente e são ignorados.
+    """
+    proxy_count = getattr(settings, 'AXES_PROXY_COUNT', 0)
+    forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    if proxy_count and forwarded_for:
+        addresses = [address.strip() for address in forwarded_for.split(',') if address.strip()]
+        if len(addresses) >= proxy_count:
+            return addresses[-proxy_count]
+    return request.META.get('REMOTE_ADDR', '')
@@ -0,0 +1,65 @@
+"""
+Download de arquivos privados do MEDIA_ROOT (currículos etc.).
+
+O worker só resolve a permissão: com PROTECTED_MEDIA_ACCEL_PREFIX definido
+(produção), a resposta leva apenas o header X-Accel-Redirect e o nginx
+entrega o arquivo de uma location interna com sendfile, liberando o worker
+na hora. Sem o prefixo (desenvolvimento, testes), o Django serve o arquivo.
+
+Usado por:
+- config/urls.py (/protected/<path>)
+- apps/common/files.py (ProtectedMediaStorage gera as URLs)
+"""
+import mimetypes
+import os
+import posixpath
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.http import content_disposition_header
+
+from .files import protected_storage
+
+# Abertos no navegador; o resto (DOC/DOCX, qualquer coisa inesperada) vai como anexo
+INLINE_TYPES = {'application/pdf'}
+
+
+def protected_permission(path):
+    """Permissão exigida para path, ou None se o caminho não é de um prefixo protegido."""
+    if posixpath.normpath(path) != path or path.startswith('/'):
+        return None  # '..', '//', './': nada fora do prefixo
+    for prefix, permission in settings.PROTECTED_MEDIA_PERMISSIONS.items():
+        if path.startswith(prefix):
+            return permission
+    return None
+
+
+def protected_file_response(path):
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    accel_prefix = settings.PROTECTED_MEDIA_ACCEL_PREFIX
+    if accel_prefix:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = accel_prefix + quote(path)
+    else:
+        response = FileResponse(protected_storage.open(path, 'rb'), content_type=content_type)
+    response['Content-Disposition'] = content_disposition_header(
+        content_type not in INLINE_TYPES, os.path.basename(path),
+    )
+    response['Cache-Control'] = 'private, no-store'
+    return response
+
+
+def protected_media(request, path):
+    permission = protected_permission(path)
+    if permission is None:
+        raise Http404
+    if not request.user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    if not request.user.has_perm(permission):
+        raise PermissionDenied
+    if not protected_storage.exists(path):
+        raise Http404
+    return protected_file_response(path)
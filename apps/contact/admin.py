@@ -1,6 +1,8 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin
 
+from apps.common.exports import csv_export_action
+
 from .models import ContactInquiry
 
 
@@ -18,7 +20,7 @@ class ContactInquiryAdmin(ModelAdmin):
             'fields': ('status',),
         }),
     ]
-    actions = ['mark_resolved']
+    actions = ['mark_resolved', 'export_csv']
 
     @admin.action(description='Arquivar mensagens selecionadas')
     def mark_resolved(self, request, queryset):
@@ -26,3 +28,14 @@ class ContactInquiryAdmin(ModelAdmin):
         # new, read, replied, archived
         updated = queryset.update(status='archived')
         self.message_user(request, f'{updated} mensagem(ns) arquivada(s).')
+
+    export_csv = csv_export_action('mensagens_contato.csv', [
+        ('Nome', 'name'),
+        ('E-mail', 'email'),
+        ('Telefone', 'phone'),
+        ('Assunto', 'subject'),
+        ('Mensagem', 'message'),
+        ('Status', 'status'),
+        ('Site', 'site__name'),
+        ('Data', 'created_at'),
+    ])
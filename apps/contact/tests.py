@@ -2,6 +2,7 @@ import pytest
 from django.urls import reverse
 from .models import ContactInquiry
 
+
 @pytest.mark.django_db
 def test_contact_page_get(client):
     url = reverse('contact:page')
@@ -9,6 +10,7 @@ def test_contact_page_get(client):
     assert response.status_code == 200
     assert 'text/html' in response['Content-Type']
 
+
 @pytest.mark.django_db
 def test_contact_page_post(client):
     url = reverse('contact:page')
@@ -23,3 +25,38 @@ def test_contact_page_post(client):
     assert response.status_code == 302 # redirect on success
     assert ContactInquiry.objects.count() == 1
     assert ContactInquiry.objects.first().name == 'Test User'
+
+
+@pytest.mark.django_db
+def test_admin_export_streams_csv(admin_client):
+    from django.contrib.sites.models import Site
+
+    inquiry = ContactInquiry.objects.create(
+        site=Site.objects.get_current(), name='=HYPERLINK("x")', email='a@example.com',
+        subject=ContactInquiry.Subject.ADMISSIONS, message='Olá',
+    )
+    response = admin_client.post(reverse('admin:contact_contactinquiry_changelist'), {
+        'action': 'export_csv', '_selected_action': [inquiry.pk],
+    })
+    assert response.streaming
+    lines = b''.join(response.streaming_content).decode().splitlines()
+    assert lines[0].startswith('Nome,E-mail')
+    assert lines[1].startswith('"\'=HYPERLINK(""x"")",a@example.com')
+    assert 'Admissões' in lines[1]
+
+
+@pytest.mark.django_db
+def test_contact_post_is_rate_limited_per_ip(client, settings):
+    from django.core.cache import cache
+
+    cache.clear()
+    settings.RATE_LIMITS = {'contact': '2/m'}
+    url = reverse('contact:page')
+    data = {'name': 'Bot', 'email': 'bot@example.com', 'subject': 'general', 'message': 'Spam'}
+    assert [client.post(url, data).status_code for _ in range(3)] == [302, 302, 429]
+    blocked = client.post(url, data)
+    assert 0 < int(blocked['Retry-After']) <= 60
+    assert ContactInquiry.objects.count() == 2
+    # Outro IP e GETs seguem liberados
+    assert client.post(url, data, REMOTE_ADDR='10.0.0.2').status_code == 302
+    assert client.get(url).status_code == 200
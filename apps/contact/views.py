@@ -1,8 +1,12 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from .forms import ContactInquiryForm
-from django.contrib.sites.shortcuts import get_current_site
 
+from apps.common.ratelimit import rate_limit
+from apps.common.sites import get_current_site
+
+
+@rate_limit('contact')
 def contact_page(request):
     if request.method == 'POST':
         form = ContactInquiryForm(request.POST)
@@ -1,8 +1,48 @@
+import os
+import zipfile
+
 from django.contrib import admin
+from django.utils.text import slugify
 from unfold.admin import ModelAdmin
 
+from apps.common.admin_base import BaseAdmin
+from apps.common.exports import csv_chunks, csv_export_action, file_chunks, queryset_rows, stream_zip
+from apps.common.tasks import enqueue
+
+from .extraction import extract_resume_text
 from .models import Application, Department, JobPosting
 
+APPLICATION_EXPORT_COLUMNS = [
+    ('Nome', 'first_name'),
+    ('Sobrenome', 'last_name'),
+    ('E-mail', 'email'),
+    ('Telefone', 'phone'),
+    ('Vaga', 'job__title'),
+    ('Departamento', 'job__department__name'),
+    ('Status', 'status'),
+    ('Data', 'created_at'),
+]
+
+
+def _resume_zip_entries(queryset):
+    """Manifesto CSV seguido dos currículos; arquivo compartilhado entre candidaturas entra uma vez."""
+    storage = Application._meta.get_field('resume').storage
+    files = {}  # nome no storage -> nome no ZIP, preenchido enquanto o manifesto é escrito
+
+    def manifest_rows():
+        columns = [*APPLICATION_EXPORT_COLUMNS, ('', 'id'), ('', 'resume')]
+        for *row, pk, resume in queryset_rows(queryset.order_by('job__title', 'last_name', 'pk'), columns):
+            if resume and resume not in files and storage.exists(resume):
+                extension = os.path.splitext(resume)[1]
+                files[resume] = f'curriculos/{pk}-{slugify(f"{row[0]} {row[1]}")}{extension}'
+            yield [*row, files.get(resume, '')]
+
+    header = [label for label, _ in APPLICATION_EXPORT_COLUMNS] + ['Arquivo']
+    yield 'candidaturas.csv', csv_chunks(header, manifest_rows()), zipfile.ZIP_DEFLATED
+    for resume, name in files.items():
+        # PDF e DOCX já são comprimidos: ZIP_STORED evita gastar CPU sem ganho
+        yield name, file_chunks(storage, resume), zipfile.ZIP_STORED
+
 
 @admin.register(Department)
 class DepartmentAdmin(ModelAdmin):
@@ -53,11 +93,16 @@ class JobPostingAdmin(ModelAdmin):
 
 
 @admin.register(Application)
-class ApplicationAdmin(ModelAdmin):
+class ApplicationAdmin(BaseAdmin):
     list_display = ['first_name', 'last_name', 'job', 'status', 'created_at']
     list_filter = ['status', 'job', 'created_at']
     search_fields = ['first_name', 'last_name', 'email']
-    readonly_fields = ['first_name', 'last_name', 'email', 'phone', 'cover_letter', 'resume', 'created_at', 'updated_at']
+    search_backend = 'fulltext'
+    search_fulltext_fields = ['cover_letter', 'resume_text']
+    readonly_fields = [
+        'first_name', 'last_name', 'email', 'phone', 'cover_letter', 'resume',
+        'resume_text', 'resume_text_extracted_at', 'created_at', 'updated_at',
+    ]
     fieldsets = [
         ('Candidato', {
             'fields': ('first_name', 'last_name', 'email', 'phone'),
@@ -68,12 +113,18 @@ class ApplicationAdmin(ModelAdmin):
         ('Avaliação', {
             'fields': ('status', 'notes'),
         }),
+        ('Texto do currículo', {
+            'fields': ('resume_text_extracted_at', 'resume_text'),
+            'classes': ('collapse',),
+        }),
         ('Datas', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',),
         }),
     ]
-    actions = ['mark_reviewing', 'mark_accepted', 'mark_rejected']
+    actions = [
+        'mark_reviewing', 'mark_accepted', 'mark_rejected', 'reextract_resumes', 'download_resumes', 'export_csv',
+    ]
 
     @admin.action(description='Marcar como Em Análise')
     def mark_reviewing(self, request, queryset):
@@ -89,3 +140,16 @@ class ApplicationAdmin(ModelAdmin):
     def mark_rejected(self, request, queryset):
         updated = queryset.update(status='rejected')
         self.message_user(request, f'{updated} candidatura(s) rejeitada(s).')
+
+    @admin.action(description='Reextrair texto dos currículos')
+    def reextract_resumes(self, request, queryset):
+        ids = list(queryset.exclude(resume='').values_list('pk', flat=True))
+        for pk in ids:
+            enqueue(extract_resume_text, pk, force=True)
+        self.message_user(request, f'Extração agendada para {len(ids)} currículo(s).')
+
+    export_csv = csv_export_action('candidaturas.csv', APPLICATION_EXPORT_COLUMNS)
+
+    @admin.action(description='Baixar currículos selecionados (ZIP)')
+    def download_resumes(self, request, queryset):
+        return stream_zip('curriculos.zip', _resume_zip_entries(queryset))
@@ -5,3 +5,6 @@ class HiringConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.hiring'
     verbose_name = 'Hiring'
+
+    def ready(self):
+        import apps.hiring.signals  # noqa: F401 — invalida as facetas do quadro de vagas
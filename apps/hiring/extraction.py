@@ -0,0 +1,182 @@
+"""
+Extração do texto dos currículos (PDF/DOCX) para a busca do admin.
+
+O parsing é CPU-bound, então roda num pool de processos (fora do GIL e do
+worker web); a thread de apps.common.tasks só espera o resultado e grava.
+Currículos são endereçados por conteúdo: se o mesmo arquivo já foi extraído
+para outra candidatura, o texto é copiado sem novo parsing.
+
+extract_text() não toca no banco nem em settings: é o que roda no processo
+filho (contexto spawn).
+
+result(timeout=...) só para de esperar: o filho continuaria parseando e
+ocupando um dos EXTRACTION_WORKERS. Ao estourar EXTRACTION_TIMEOUT (ou o pool
+quebrar), o pool é descartado e seus processos terminados; o próximo
+get_pool() cria outro.
+
+Usado por:
+- apps/hiring/views.py (após cada candidatura)
+- apps/hiring/admin.py (action de reextração)
+- apps/hiring/management/commands/extract_resumes.py (backfill)
+"""
+import logging
+import multiprocessing
+import re
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from xml.etree import ElementTree
+
+from apps.common.files import SNIFF_BYTES, sniff_type
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_WORKERS = 2
+EXTRACTION_TIMEOUT = 60  # segundos por arquivo
+MAX_PDF_PAGES = 30
+MAX_TEXT_LENGTH = 100_000
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_pool = None
+_pool_lock = threading.Lock()  # get_pool() é chamado pelas threads de apps.common.tasks
+
+
+def normalize_text(text):
+    """Remove NUL (inválido no PostgreSQL), colapsa espaços e limita o tamanho."""
+    text = text.replace('\x00', ' ')
+    text = re.sub(r'[ \t\r\f\v]+', ' ', text)
+    text = re.sub(r'\s*\n\s*', '\n', text)
+    return text.strip()[:MAX_TEXT_LENGTH]
+
+
+def _pdf_text(path):
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return '\n'.join(page.extract_text() or '' for page in reader.pages[:MAX_PDF_PAGES])
+
+
+def _docx_text(path):
+    paragraphs, current = [], []
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+        for _, element in ElementTree.iterparse(document):
+            if element.tag == f'{_WORD_NS}t' and element.text:
+                current.append(element.text)
+            elif element.tag == f'{_WORD_NS}p':
+                paragraphs.append(''.join(current))
+                current = []
+                element.clear()
+    return '\n'.join(paragraphs)
+
+
+def extract_text(path):
+    """Texto normalizado de um PDF ou DOCX; '' para formatos sem extrator (.doc)."""
+    with open(path, 'rb') as file:
+        kind = sniff_type(file.read(SNIFF_BYTES))
+    if kind == 'application/pdf':
+        return normalize_text(_pdf_text(path))
+    if kind == 'application/zip':
+        return normalize_text(_docx_text(path))
+    return ''
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=EXTRACTION_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _pool
+
+
+def discard_pool(pool):
+    """Tira o pool de uso e termina seus processos (parsing travado não libera o slot sozinho)."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    for process in list((getattr(pool, '_processes', None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_extraction(path):
+    """extract_text(path) no pool, com EXTRACTION_TIMEOUT; estourando, descarta o pool e relança."""
+    pool = get_pool()
+    try:
+        return pool.submit(extract_text, path).result(timeout=EXTRACTION_TIMEOUT)
+    except (TimeoutError, BrokenProcessPool):
+        discard_pool(pool)
+        raise
+
+
+def _lost(future):
+    """Future que não vai terminar com resultado próprio depois que o pool foi descartado."""
+    if future.cancelled() or not future.done():
+        return True
+    return isinstance(future.exception(), BrokenProcessPool)
+
+
+def extract_resume_text(application_id, force=False):
+    """Extrai e grava o texto do currículo de uma candidatura (force: ignora o já extraído)."""
+    from django.utils import timezone
+
+    from .models import Application
+
+    application = Application.objects.only('id', 'resume').get(pk=application_id)
+    if not application.resume:
+        return
+    text = None if force else (
+        Application.objects.filter(resume=application.resume.name, resume_text_extracted_at__isnull=False)
+        .exclude(pk=application.pk)
+        .values_list('resume_text', flat=True)
+        .first()
+    )
+    if text is None:
+        try:
+            text = run_extraction(application.resume.path)
+        except Exception:
+            logger.exception('Falha ao extrair texto do currículo (candidatura pk=%s)', application_id)
+            return
+    Application.objects.filter(resume=application.resume.name).update(
+        resume_text=text, resume_text_extracted_at=timezone.now(),
+    )
+
+
+def extract_pending_resumes(reextract=False, batch_size=50):
+    """Extrai em lote (um parsing por arquivo distinto). Retorna (arquivos, falhas)."""
+    from django.utils import timezone
+
+    from .models import Application
+
+    storage = Application._meta.get_field('resume').storage
+    pending = Application.objects.exclude(resume='')
+    if not reextract:
+        pending = pending.filter(resume_text_extracted_at__isnull=True)
+    names = list(pending.order_by().values_list('resume', flat=True).distinct())
+
+    done = failed = 0
+    for start in range(0, len(names), batch_size):
+        batch = names[start:start + batch_size]
+        pool = get_pool()
+        futures = {name: pool.submit(extract_text, storage.path(name)) for name in batch}
+        for index, name in enumerate(batch):
+            try:
+                text = futures[name].result(timeout=EXTRACTION_TIMEOUT)
+            except Exception as e:
+                logger.exception('Falha ao extrair texto do currículo %s', name)
+                failed += 1
+                if isinstance(e, (TimeoutError, BrokenProcessPool)):
+                    # Descarta o pool travado e reenvia ao novo os arquivos que ele levou junto
+                    discard_pool(pool)
+                    pool = get_pool()
+                    for other in batch[index + 1:]:
+                        if _lost(futures[other]):
+                            futures[other] = pool.submit(extract_text, storage.path(other))
+                continue
+            Application.objects.filter(resume=name).update(resume_text=text, resume_text_extracted_at=timezone.now())
+            done += 1
+    return done, failed
+
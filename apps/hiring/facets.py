@@ -0,0 +1,116 @@
+"""
+Filtros facetados do quadro de vagas (departamento, tipo de contratação, local).
+
+Todas as contagens vêm de uma única consulta agrupada pelas três dimensões
+(uma linha por combinação existente entre as vagas abertas). Essas linhas são
+cacheadas numa chave única (vagas não têm site, servem todos os portais) e
+as contagens de cada faceta são somadas em Python, respeitando os filtros
+das outras facetas — escolher um departamento não zera as opções de
+departamento, só restringe tipo e local.
+
+O cache é versionado: qualquer alteração em vaga ou departamento incrementa
+a versão (ver signals.py) no cache compartilhado pelos workers. Alterações
+via queryset.update() não disparam signals; FACETS_TIMEOUT curto limita o
+tempo em que contagens antigas aparecem.
+
+Usado por:
+- apps/hiring/views.py (job_list)
+- apps/hiring/signals.py (invalidate_job_facets)
+"""
+from django.core.cache import cache
+from django.db.models import Count
+from django.urls import reverse
+from django.utils.http import urlencode
+
+FACETS_TIMEOUT = 60 * 15
+FACETS_VERSION_KEY = 'hiring:facets:version'
+
+# (parâmetro GET, chave da linha agrupada)
+FACET_PARAMS = [
+    ('department', 'department__slug'),
+    ('type', 'employment_type'),
+    ('location', 'location'),
+]
+FACET_TITLES = {'department': 'Departamento', 'type': 'Contratação', 'location': 'Local'}
+
+
+def invalidate_job_facets():
+    if not cache.add(FACETS_VERSION_KEY, 2, None):
+        try:
+            cache.incr(FACETS_VERSION_KEY)
+        except ValueError:  # chave expirou entre add() e incr()
+            cache.set(FACETS_VERSION_KEY, 2, None)
+
+
+def _facet_rows():
+    from .models import JobPosting
+
+    version = cache.get(FACETS_VERSION_KEY, 1)
+    key = f'hiring:facets:{version}'
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(
+            JobPosting.objects.filter(status=JobPosting.Status.OPEN)
+            .order_by()
+            .values('department__slug', 'department__name', 'employment_type', 'location')
+            .annotate(count=Count('pk'))
+        )
+        cache.set(key, rows, FACETS_TIMEOUT)
+    return rows
+
+
+def get_job_facets(params):
+    """
+    Filtros válidos (param -> valor) e facetas com contagens para o template.
+
+    Valores desconhecidos em params são ignorados, não viram filtro vazio. Os
+    links das opções usam sempre a mesma querystring canônica, então cada
+    combinação de filtros tem uma única URL.
+    """
+    from .models import JobPosting
+
+    rows = _facet_rows()
+    valid = {param: {row[field] for row in rows} for param, field in FACET_PARAMS}
+    selected = {
+        param: params[param]
+        for param, _ in FACET_PARAMS
+        if params.get(param) and params[param] in valid[param]
+    }
+
+    labels = {
+        'department': {row['department__slug']: row['department__name'] for row in rows},
+        'type': dict(JobPosting.EmploymentType.choices),
+        'location': {row['location']: row['location'] for row in rows},
+    }
+    facets = []
+    for param, field in FACET_PARAMS:
+        others = [(p, f) for p, f in FACET_PARAMS if p != param and p in selected]
+        counts = {}
+        for row in rows:
+            if row[field] and all(row[f] == selected[p] for p, f in others):
+                counts[row[field]] = counts.get(row[field], 0) + row['count']
+        options = [
+            {
+                'value': value,
+                'label': labels[param][value],
+                'count': count,
+                'selected': selected.get(param) == value,
+                'url': facet_url(selected, param, None if selected.get(param) == value else value),
+            }
+            for value, count in counts.items()
+        ]
+        options.sort(key=lambda option: option['label'])
+        facets.append({'param': param, 'title': FACET_TITLES[param], 'options': options})
+    return selected, facets
+
+
+def facet_url(selected, param, value):
+    """URL da lista com querystring canônica (ordem fixa, sem page) com param trocado por value (None remove)."""
+    query = {**selected, param: value}
+    querystring = urlencode([(p, query[p]) for p, _ in FACET_PARAMS if query.get(p)])
+    return reverse('hiring:list') + (f'?{querystring}' if querystring else '')
+
+
+def filter_jobs(queryset, selected):
+    lookups = dict(FACET_PARAMS)
+    return queryset.filter(**{lookups[param]: value for param, value in selected.items()})
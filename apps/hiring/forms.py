@@ -1,5 +1,11 @@
+import os
+import zipfile
+
 from django import forms
 from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+
+from apps.common.files import describe_upload, save_content_addressed
 
 from .models import Application
 
@@ -9,6 +15,27 @@ ALLOWED_RESUME_TYPES = [
     'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
 ]
 MAX_RESUME_SIZE = 5 * 1024 * 1024  # 5 MB
+RESUME_PREFIX = 'hiring/resumes'
+RESUME_EXTENSIONS = {
+    'application/pdf': '.pdf',
+    'application/msword': '.doc',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+}
+
+
+def resume_type(resume):
+    """Tipo real do currículo pelos magic bytes; ZIP só vale se for um .docx."""
+    describe_upload(resume)
+    if resume.sniffed_type != 'application/zip':
+        return resume.sniffed_type
+    try:
+        with zipfile.ZipFile(resume) as archive:
+            is_docx = 'word/document.xml' in archive.namelist()
+    except zipfile.BadZipFile:
+        is_docx = False
+    finally:
+        resume.seek(0)
+    return 'application/vnd.openxmlformats-officedocument.wordprocessingml.document' if is_docx else None
 
 
 class ApplicationForm(forms.ModelForm):
@@ -19,18 +46,32 @@ class ApplicationForm(forms.ModelForm):
     def clean_resume(self):
         resume = self.cleaned_data.get('resume')
         if resume:
-            if resume.content_type not in ALLOWED_RESUME_TYPES:
-                raise ValidationError(
-                    'Somente arquivos PDF e Word (.doc, .docx) são aceitos pelo tipo.'
-                )
             if resume.size > MAX_RESUME_SIZE:
                 raise ValidationError(
                     'O arquivo não pode exceder 5 MB.'
                 )
-            import os
             ext = os.path.splitext(resume.name)[1].lower()
             if ext not in ['.pdf', '.doc', '.docx']:
                 raise ValidationError(
                     'Apenas extensões .pdf, .doc e .docx são permitidas.'
                 )
+            # O content_type vem do navegador; o tipo real vem do conteúdo
+            resume.detected_type = resume_type(resume)
+            if resume.detected_type not in ALLOWED_RESUME_TYPES:
+                raise ValidationError(
+                    'Somente arquivos PDF e Word (.doc, .docx) são aceitos pelo tipo.'
+                )
         return resume
+
+    def save(self, commit=True):
+        """Grava o currículo endereçado pelo conteúdo: reenvios do mesmo arquivo não duplicam no disco."""
+        application = super().save(commit=False)
+        resume = self.cleaned_data.get('resume')
+        if isinstance(resume, UploadedFile):
+            application.resume = save_content_addressed(
+                resume, RESUME_PREFIX, extension=RESUME_EXTENSIONS[resume.detected_type],
+                storage=application._meta.get_field('resume').storage,
+            )
+        if commit:
+            application.save()
+        return application
@@ -0,0 +1,20 @@
+"""
+Extrai o texto dos currículos ainda não processados (backfill/reprocessamento).
+
+    python manage.py extract_resumes [--all]
+"""
+from django.core.management.base import BaseCommand
+
+from apps.hiring.extraction import extract_pending_resumes
+
+
+class Command(BaseCommand):
+    help = 'Extrai o texto dos currículos (PDF/DOCX) para a busca do admin.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Reextrai também os já processados.')
+        parser.add_argument('--batch-size', type=int, default=50)
+
+    def handle(self, *args, **options):
+        done, failed = extract_pending_resumes(reextract=options['all'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{done} currículo(s) extraído(s), {failed} falha(s).'))
@@ -0,0 +1,24 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+from apps.common.search import postgres_search_indexes
+
+
+class Migration(migrations.Migration):
+    """Trigram nos campos de busca do admin de candidaturas (somente PostgreSQL)."""
+
+    atomic = False
+
+    dependencies = [
+        ('hiring', '0004_alter_jobposting_meta_description_and_more'),
+    ]
+
+    operations = [
+        postgres_search_indexes('hiring', 'application', [
+            django.contrib.postgres.indexes.GinIndex(
+                fields=['first_name', 'last_name', 'email'],
+                opclasses=['gin_trgm_ops', 'gin_trgm_ops', 'gin_trgm_ops'],
+                name='hiring_application_search_trgm',
+            ),
+        ]),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hiring', '0005_application_search_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='resume_text',
+            field=models.TextField(blank=True, editable=False, help_text='Extraído automaticamente do PDF/DOCX para a busca do admin.', verbose_name='Texto do currículo'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='resume_text_extracted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Texto extraído em'),
+        ),
+    ]
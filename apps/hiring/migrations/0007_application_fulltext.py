@@ -0,0 +1,22 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+from apps.common.search import postgres_search_indexes, search_vector
+
+
+class Migration(migrations.Migration):
+    """Full-text sobre carta de apresentação + texto do currículo (somente PostgreSQL)."""
+
+    atomic = False
+
+    dependencies = [
+        ('hiring', '0006_application_resume_text'),
+    ]
+
+    operations = [
+        postgres_search_indexes('hiring', 'application', [
+            django.contrib.postgres.indexes.GinIndex(
+                search_vector('cover_letter', 'resume_text'), name='hiring_application_fts',
+            ),
+        ], extensions=()),
+    ]
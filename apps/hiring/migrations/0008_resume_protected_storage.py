@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:29
+
+import apps.common.files
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hiring', '0007_application_fulltext'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='resume',
+            field=models.FileField(storage=apps.common.files.ProtectedMediaStorage(), upload_to='hiring/resumes/'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+from apps.common.search import postgres_search_indexes, trigram_index
+
+
+class Migration(migrations.Migration):
+    """Trigram sobre UPPER(...) (expressão do icontains) nos campos de busca de candidaturas."""
+
+    atomic = False
+
+    dependencies = [
+        ('hiring', '0008_resume_protected_storage'),
+    ]
+
+    operations = [
+        postgres_search_indexes('hiring', 'application', [
+            trigram_index('first_name', 'last_name', 'email', name='hiring_app_search_upper_trgm'),
+        ], replaces=[
+            django.contrib.postgres.indexes.GinIndex(
+                fields=['first_name', 'last_name', 'email'],
+                opclasses=['gin_trgm_ops', 'gin_trgm_ops', 'gin_trgm_ops'],
+                name='hiring_application_search_trgm',
+            ),
+        ]),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from apps.common.files import protected_storage
 from apps.common.models import TimeStampedModel, SEOModel
 
 
@@ -63,9 +64,14 @@ class Application(TimeStampedModel):
     email = models.EmailField()
     phone = models.CharField(max_length=30)
     cover_letter = models.TextField(blank=True)
-    resume = models.FileField(upload_to='hiring/resumes/')
+    resume = models.FileField(upload_to='hiring/resumes/', storage=protected_storage)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.RECEIVED, help_text='Acompanhe o progresso desta candidatura.')
     notes = models.TextField(blank=True, help_text='Notas internas sobre o candidato. Não visíveis ao candidato.')
+    resume_text = models.TextField(
+        'Texto do currículo', blank=True, editable=False,
+        help_text='Extraído automaticamente do PDF/DOCX para a busca do admin.',
+    )
+    resume_text_extracted_at = models.DateTimeField('Texto extraído em', null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ['-created_at']
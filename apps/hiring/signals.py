@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .facets import invalidate_job_facets
+from .models import Department, JobPosting
+
+
+@receiver([post_save, post_delete], sender=JobPosting)
+@receiver([post_save, post_delete], sender=Department)
+def invalidate_facets_on_change(sender, **kwargs):
+    """Vaga ou departamento alterado: descarta as facetas cacheadas do quadro de vagas."""
+    invalidate_job_facets()
@@ -1,4 +1,5 @@
 import pytest
+from django.db import connection
 from django.urls import reverse
 
 @pytest.mark.django_db
@@ -7,3 +8,200 @@ def test_hiring_job_list(client):
     response = client.get(url)
     assert response.status_code == 200
     assert 'text/html' in response['Content-Type']
+
+
+def _open_job(slug):
+    from .models import Department, JobPosting
+
+    department, _ = Department.objects.get_or_create(name='Pedagógico', slug='pedagogico')
+    return JobPosting.objects.create(
+        department=department, title=slug, slug=slug, description='-', requirements='-',
+        status=JobPosting.Status.OPEN,
+    )
+
+
+@pytest.mark.django_db
+def test_resume_upload_is_sniffed_and_stored_once(client, settings, tmp_path):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    from .models import Application
+
+    settings.MEDIA_ROOT = tmp_path
+    pdf = b'%PDF-1.4\n' + b'0' * 1024
+    for slug in ('professor', 'coordenador'):
+        job = _open_job(slug)
+        response = client.post(reverse('hiring:job_detail', kwargs={'slug': slug}), {
+            'first_name': 'Ana', 'last_name': 'Silva', 'email': 'ana@example.com', 'phone': '11999999999',
+            'resume': SimpleUploadedFile('cv.pdf', pdf, content_type='application/pdf'),
+        })
+        assert response.status_code == 302
+
+    names = set(Application.objects.values_list('resume', flat=True))
+    assert len(names) == 1
+    assert names.pop().startswith('hiring/resumes/')
+    assert len(list((tmp_path / 'hiring' / 'resumes').rglob('*.pdf'))) == 1
+
+    job = _open_job('secretaria')
+    response = client.post(reverse('hiring:job_detail', kwargs={'slug': job.slug}), {
+        'first_name': 'Bia', 'last_name': 'Souza', 'email': 'bia@example.com', 'phone': '11999999999',
+        'resume': SimpleUploadedFile('cv.pdf', b'MZ\x90\x00 executavel', content_type='application/pdf'),
+    })
+    assert response.status_code == 200
+    assert 'resume' in response.context['form'].errors
+
+
+@pytest.mark.django_db
+def test_resume_text_is_extracted_and_searchable(rf, tmp_path):
+    import zipfile
+
+    from django.contrib import admin
+
+    from .extraction import extract_text
+    from .models import Application
+
+    docx = tmp_path / 'cv.docx'
+    with zipfile.ZipFile(docx, 'w') as archive:
+        archive.writestr('word/document.xml', (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+            '<w:p><w:r><w:t>Licenciatura em </w:t></w:r><w:r><w:t>Matemática</w:t></w:r></w:p>'
+            '<w:p><w:r><w:t>Docente do ensino médio</w:t></w:r></w:p>'
+            '</w:body></w:document>'
+        ))
+    text = extract_text(docx)
+    assert text == 'Licenciatura em Matemática\nDocente do ensino médio'
+
+    job = _open_job('professor')
+    Application.objects.create(
+        job=job, first_name='Ana', last_name='Silva', email='ana@example.com', phone='-', resume_text=text,
+    )
+    Application.objects.create(job=job, first_name='Bia', last_name='Souza', email='bia@example.com', phone='-')
+
+    model_admin = admin.site._registry[Application]
+    queryset, _ = model_admin.get_search_results(rf.get('/'), Application.objects.all(), 'matemática docente')
+    assert [application.first_name for application in queryset] == ['Ana']
+    queryset, _ = model_admin.get_search_results(rf.get('/'), Application.objects.all(), 'souza')
+    assert [application.first_name for application in queryset] == ['Bia']
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='índices de busca só existem no PostgreSQL')
+def test_application_search_uses_fulltext_and_trigram_indexes_on_postgres(rf):
+    from django.contrib import admin
+
+    from .models import Application
+
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')  # tabela vazia: força o planner a mostrar os índices
+    model_admin = admin.site._registry[Application]
+    queryset, _ = model_admin.get_search_results(rf.get('/'), Application.objects.all(), 'matemática')
+    plan = queryset.explain()
+    assert 'hiring_application_fts' in plan and 'hiring_app_search_upper_trgm' in plan
+
+
+@pytest.mark.django_db
+def test_job_list_facets_are_cached_until_a_posting_changes(client, django_assert_max_num_queries):
+    from django.core.cache import cache
+
+    from .models import Department, JobPosting
+
+    cache.clear()
+    admin_dept = Department.objects.create(name='Administrativo', slug='administrativo')
+    for slug, employment_type in [('professor', 'full_time'), ('monitor', 'part_time'), ('tutor', 'part_time')]:
+        job = _open_job(slug)
+        JobPosting.objects.filter(pk=job.pk).update(employment_type=employment_type, location='Centro')
+    JobPosting.objects.create(
+        department=admin_dept, title='Secretaria', slug='secretaria', description='-', requirements='-',
+        employment_type='full_time', status=JobPosting.Status.OPEN,
+    )
+
+    url = reverse('hiring:list')
+    response = client.get(url, {'department': 'pedagogico', 'type': 'bogus'})
+    assert response.context['selected'] == {'department': 'pedagogico'}
+    assert len(response.context['page_obj']) == 3
+    facets = {
+        facet['param']: {o['value']: o['count'] for o in facet['options']}
+        for facet in response.context['facets']
+    }
+    # Departamento conta ignorando o próprio filtro; tipo e local respeitam o departamento
+    assert facets == {
+        'department': {'pedagogico': 3, 'administrativo': 1},
+        'type': {'full_time': 1, 'part_time': 2},
+        'location': {'Centro': 3},
+    }
+    options = response.context['facets'][1]['options']
+    assert [o['url'] for o in options] == [
+        f'{url}?department=pedagogico&type=part_time', f'{url}?department=pedagogico&type=full_time',
+    ]
+
+    with django_assert_max_num_queries(2):  # count e página; facetas vêm do cache
+        client.get(url, {'type': 'part_time'})
+
+    JobPosting.objects.filter(slug='secretaria').get().delete()
+    response = client.get(url)
+    assert {o['value'] for o in response.context['facets'][0]['options']} == {'pedagogico'}
+
+
+@pytest.mark.django_db
+def test_download_resumes_streams_zip_with_manifest(admin_client, settings, tmp_path):
+    import io
+    import zipfile
+
+    from .models import Application
+
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / 'hiring' / 'resumes').mkdir(parents=True)
+    (tmp_path / 'hiring' / 'resumes' / 'cv.pdf').write_bytes(b'%PDF-1.4 ana')
+    job = _open_job('professor')
+    ids = [
+        Application.objects.create(
+            job=job, first_name=first_name, last_name='Silva', email=f'{first_name}@example.com', phone='-',
+            resume='hiring/resumes/cv.pdf',
+        ).pk
+        for first_name in ('Ana', 'Bia')
+    ]
+
+    response = admin_client.post(reverse('admin:hiring_application_changelist'), {
+        'action': 'download_resumes', '_selected_action': ids,
+    })
+    assert response.streaming
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+    assert archive.testzip() is None
+    resumes = [info for info in archive.infolist() if info.filename.startswith('curriculos/')]
+    assert len(resumes) == 1  # mesmo arquivo nas duas candidaturas
+    assert resumes[0].compress_type == zipfile.ZIP_STORED
+    assert archive.read(resumes[0]) == b'%PDF-1.4 ana'
+    manifest = archive.read('candidaturas.csv').decode().splitlines()
+    assert len(manifest) == 3
+    assert all(line.endswith(resumes[0].filename) for line in manifest[1:])
+
+
+@pytest.mark.django_db
+def test_protected_resume_download_checks_permission_and_offloads_to_nginx(client, admin_client, settings, tmp_path):
+    from django.contrib.auth import get_user_model
+
+    from .models import Application
+
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / 'hiring' / 'resumes').mkdir(parents=True)
+    (tmp_path / 'hiring' / 'resumes' / 'cv.pdf').write_bytes(b'%PDF-1.4 ana')
+    application = Application.objects.create(
+        job=_open_job('professor'), first_name='Ana', last_name='Silva', email='ana@example.com', phone='-',
+        resume='hiring/resumes/cv.pdf',
+    )
+    url = application.resume.url
+    assert url == '/protected/hiring/resumes/cv.pdf'
+
+    assert client.get(url).status_code == 302  # login
+    client.force_login(get_user_model().objects.create_user('staff', 'staff@example.com', 'x', is_staff=True))
+    assert client.get(url).status_code == 403
+    assert admin_client.get('/protected/hiring/resumes/../../../etc/passwd').status_code == 404
+    assert admin_client.get('/protected/news/articles/foto.jpg').status_code == 404
+
+    response = admin_client.get(url)
+    assert b''.join(response.streaming_content) == b'%PDF-1.4 ana'
+    assert response['Content-Disposition'] == 'inline; filename="cv.pdf"'
+
+    settings.PROTECTED_MEDIA_ACCEL_PREFIX = '/_protected/'
+    response = admin_client.get(url)
+    assert response['X-Accel-Redirect'] == '/_protected/hiring/resumes/cv.pdf'
+    assert response.content == b''
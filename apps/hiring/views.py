@@ -1,13 +1,48 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
+from django.core.paginator import Paginator
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from apps.common.files import HashingUploadHandler
+from apps.common.ratelimit import rate_limit
+from apps.common.tasks import enqueue
+
+from .extraction import extract_resume_text
+from .facets import filter_jobs, get_job_facets
 from .models import JobPosting, Application
-from .forms import ApplicationForm
+from .forms import MAX_RESUME_SIZE, ApplicationForm
+
+JOBS_PER_PAGE = 12
+
 
 def job_list(request):
-    jobs = JobPosting.objects.filter(status=JobPosting.Status.OPEN)
-    return render(request, 'hiring/job_list.html', {'jobs': jobs})
+    """Vagas abertas com filtros facetados (?department=, ?type=, ?location=) e paginação."""
+    selected, facets = get_job_facets(request.GET)
+    jobs = filter_jobs(
+        JobPosting.objects.filter(status=JobPosting.Status.OPEN).select_related('department'),
+        selected,
+    ).order_by('-published_at', '-pk')
+    page_obj = Paginator(jobs, JOBS_PER_PAGE).get_page(request.GET.get('page'))
+    return render(request, 'hiring/job_list.html', {
+        'page_obj': page_obj,
+        'facets': facets,
+        'selected': selected,
+    })
 
+
+@csrf_exempt
+@rate_limit('job_application')
 def job_detail(request, slug):
+    # O handler precisa entrar antes de request.POST ser lido — inclusive pelo
+    # CsrfViewMiddleware — por isso a verificação CSRF fica em _job_detail.
+    request.upload_handlers.insert(
+        0, HashingUploadHandler(request, field_names={'resume'}, max_size=MAX_RESUME_SIZE),
+    )
+    return _job_detail(request, slug)
+
+
+@csrf_protect
+def _job_detail(request, slug):
     job = get_object_or_404(JobPosting, slug=slug, status=JobPosting.Status.OPEN)
     
     if request.method == 'POST':
@@ -18,6 +53,7 @@ def job_detail(request, slug):
                 application = form.save(commit=False)
                 application.job = job
                 application.save()
+                enqueue(extract_resume_text, application.pk)
             messages.success(request, 'Sua candidatura foi enviada com sucesso!')
             return redirect('hiring:job_detail', slug=job.slug)
     else:
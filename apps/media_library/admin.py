@@ -1,17 +1,183 @@
+import json
+
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.template.defaultfilters import filesizeformat
+from django.urls import path, reverse
+from django.utils.html import format_html
 from unfold.admin import ModelAdmin
+from unfold.decorators import action
 
-from .models import MediaFile, MediaFolder
+from .folders import browse_level
+from .models import MediaFile, MediaFolder, MediaUpload
+from .uploads import UploadError, complete_upload, discard_upload, receive_chunk, start_upload
 
 
 @admin.register(MediaFolder)
 class MediaFolderAdmin(ModelAdmin):
-    list_display = ['name', 'parent']
+    list_display = ['name', 'parent', 'size_display', 'file_count']
     search_fields = ['name']
+    readonly_fields = ['path', 'size_display', 'file_count']
+    list_select_related = ['parent']
+    actions_list = ['browse']
+
+    @admin.display(description='Tamanho total', ordering='total_size')
+    def size_display(self, obj):
+        return filesizeformat(obj.total_size)
+
+    @action(description='Navegar pelas pastas', url_path='browse', icon='folder_open', permissions=['view'])
+    def browse(self, request):
+        try:
+            folder_id = int(request.GET['folder'])
+        except (KeyError, ValueError):
+            folder_id = None
+        current, ancestors, children = browse_level(folder_id)
+        if folder_id is not None and current is None:
+            raise Http404
+        return render(request, 'admin/media_library/browse.html', {
+            **self.admin_site.each_context(request),
+            'title': current.name if current else 'Pastas',
+            'opts': self.model._meta,
+            'current': current,
+            'ancestors': ancestors,
+            'children': children,
+        })
 
 
 @admin.register(MediaFile)
 class MediaFileAdmin(ModelAdmin):
-    list_display = ['title', 'folder', 'file_type', 'uploaded_by', 'created_at']
+    list_display = ['title', 'folder', 'file_type', 'size_display', 'uploaded_by', 'created_at']
     list_filter = ['file_type', 'folder']
     search_fields = ['title', 'alt_text']
+    readonly_fields = ['preview', 'file_type', 'file_size']
+    list_select_related = ['blob', 'folder', 'uploaded_by']
+    list_per_page = 48
+    actions_list = ['chunked_upload']
+    # Grade de miniaturas: admin/media_library/mediafile/change_list.html
+
+    @admin.display(description='Tamanho', ordering='file_size')
+    def size_display(self, obj):
+        return filesizeformat(obj.file_size)
+
+    @admin.display(description='Pré-visualização')
+    def preview(self, obj):
+        blob = obj.blob
+        if blob is None or blob.processed_at is None:
+            return 'Em processamento…' if blob else '—'
+        details = []
+        if blob.width:
+            details.append(f'{blob.width} × {blob.height} px')
+        if blob.page_count:
+            details.append(f'{blob.page_count} página(s)')
+        thumbnail = format_html(
+            '<img src="{}" alt="" style="max-width:320px;border-radius:.5rem;display:block;margin-bottom:.5rem">',
+            blob.thumbnail.url,
+        ) if blob.thumbnail else ''
+        return format_html('{}{}', thumbnail, ' · '.join(details) or blob.mime_type)
+
+    @action(description='Enviar arquivo grande', url_path='upload', icon='cloud_upload', permissions=['add'])
+    def chunked_upload(self, request):
+        return render(request, 'admin/media_library/chunked_upload.html', {
+            **self.admin_site.each_context(request),
+            'title': 'Enviar arquivo grande',
+            'opts': self.model._meta,
+            'folders': MediaFolder.objects.all(),
+        })
+
+    def get_urls(self):
+        return [
+            path(
+                'uploads/',
+                self.admin_site.admin_view(self.upload_start_view),
+                name='media_library_mediafile_upload_start',
+            ),
+            path(
+                'uploads/<uuid:upload_id>/',
+                self.admin_site.admin_view(self.upload_chunk_view),
+                name='media_library_mediafile_upload',
+            ),
+            path(
+                'uploads/<uuid:upload_id>/complete/',
+                self.admin_site.admin_view(self.upload_complete_view),
+                name='media_library_mediafile_upload_complete',
+            ),
+            *super().get_urls(),
+        ]
+
+    # ── Upload em partes (protocolo em uploads.py) ──────────────────────────
+
+    def _get_upload(self, request, upload_id):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        return get_object_or_404(MediaUpload, pk=upload_id, created_by=request.user)
+
+    def _upload_state(self, upload):
+        return {
+            'id': str(upload.pk),
+            'chunk_size': upload.chunk_size,
+            'offset': upload.offset,
+            'size': upload.size,
+            'url': reverse('admin:media_library_mediafile_upload', args=[upload.pk]),
+        }
+
+    @staticmethod
+    def _error(error, upload=None):
+        data = {'error': str(error)}
+        if upload is not None and upload.pk:
+            data['offset'] = upload.offset
+        return JsonResponse(data, status=error.status)
+
+    def upload_start_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        if request.method != 'POST':
+            return HttpResponseNotAllowed(['POST'])
+        try:
+            data = json.loads(request.body or b'{}')
+            folder = get_object_or_404(MediaFolder, pk=data['folder']) if data.get('folder') else None
+            upload = start_upload(
+                request.user, data.get('filename'), data.get('size'),
+                title=data.get('title', ''), folder=folder, sha256=data.get('sha256', ''),
+            )
+        except (ValueError, AttributeError):
+            return JsonResponse({'error': 'JSON inválido.'}, status=400)
+        except UploadError as error:
+            return self._error(error)
+        return JsonResponse(self._upload_state(upload), status=201)
+
+    def upload_chunk_view(self, request, upload_id):
+        upload = self._get_upload(request, upload_id)
+        if request.method == 'GET':
+            return JsonResponse(self._upload_state(upload))
+        if request.method == 'DELETE':
+            discard_upload(upload)
+            return HttpResponse(status=204)
+        if request.method != 'PUT':
+            return HttpResponseNotAllowed(['GET', 'PUT', 'DELETE'])
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return JsonResponse({'error': 'Header Upload-Offset inválido.', 'offset': upload.offset}, status=400)
+        try:
+            # request (e não request.body): a parte vai do socket para o disco em blocos
+            receive_chunk(upload, offset, request, length, checksum=request.headers.get('X-Chunk-SHA256', ''))
+        except UploadError as error:
+            upload.refresh_from_db(fields=['offset'])
+            return self._error(error, upload)
+        return JsonResponse(self._upload_state(upload))
+
+    def upload_complete_view(self, request, upload_id):
+        upload = self._get_upload(request, upload_id)
+        if request.method != 'POST':
+            return HttpResponseNotAllowed(['POST'])
+        try:
+            media = complete_upload(upload)
+        except UploadError as error:
+            return self._error(error, upload)
+        return JsonResponse({
+            'id': media.pk,
+            'url': reverse('admin:media_library_mediafile_change', args=[media.pk]),
+        }, status=201)
@@ -5,3 +5,6 @@ class MediaLibraryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.media_library'
     verbose_name = 'Media Library'
+
+    def ready(self):
+        import apps.media_library.signals  # noqa: F401 — libera o blob ao apagar um MediaFile
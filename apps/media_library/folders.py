@@ -0,0 +1,140 @@
+"""
+Árvore de pastas da biblioteca de mídia com caminho materializado e totais.
+
+Cada MediaFolder guarda path ('<id avô>/<id pai>/<id>/') e depth, então a
+subárvore de uma pasta é path__startswith=pasta.path e os ancestrais saem
+do próprio path, sem recursão. total_size/file_count somam a subárvore
+inteira e são mantidos por deltas: cada arquivo criado, movido, trocado ou
+apagado gera um único UPDATE nos ancestrais da pasta afetada.
+
+Atualizações em massa (queryset.update(folder=...)) não passam pelos
+deltas; rebuild_tree() (comando rebuild_media_folders) recalcula tudo.
+
+Usado por:
+- apps/media_library/models.py (MediaFolder.save, MediaFile.save)
+- apps/media_library/signals.py (exclusões)
+- apps/media_library/admin.py (navegador de pastas)
+"""
+from collections import defaultdict
+
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum, Value
+from django.db.models.functions import Concat, Substr
+
+
+def ancestor_ids(path):
+    """'3/8/21/' -> [3, 8, 21] (inclui a própria pasta)."""
+    return [int(pk) for pk in path.split('/') if pk]
+
+
+def _add_to_folders(folder_ids, size_delta, count_delta):
+    from .models import MediaFolder
+
+    if folder_ids and (size_delta or count_delta):
+        MediaFolder.objects.filter(pk__in=folder_ids).update(
+            total_size=F('total_size') + size_delta, file_count=F('file_count') + count_delta,
+        )
+
+
+def _add_to_chain(folder_id, size_delta, count_delta):
+    from .models import MediaFolder
+
+    if folder_id is None or not (size_delta or count_delta):
+        return
+    path = MediaFolder.objects.filter(pk=folder_id).values_list('path', flat=True).first()
+    if path:
+        _add_to_folders(ancestor_ids(path), size_delta, count_delta)
+
+
+def update_file_rollups(old, new):
+    """Aplica a mudança de um arquivo; old/new são (folder_id, file_size), folder_id None = raiz."""
+    (old_folder, old_size), (new_folder, new_size) = old, new
+    if old_folder == new_folder:
+        _add_to_chain(new_folder, new_size - old_size, 0)
+    else:
+        _add_to_chain(old_folder, -old_size, -1)
+        _add_to_chain(new_folder, new_size, 1)
+
+
+def move_subtree(folder, old_path, new_path):
+    """Troca o prefixo do path de toda a subárvore e transfere os totais entre os ancestrais."""
+    from .models import MediaFolder
+
+    total_size, file_count = MediaFolder.objects.filter(pk=folder.pk).values_list(
+        'total_size', 'file_count',
+    ).get()
+    _add_to_folders(ancestor_ids(old_path)[:-1], -total_size, -file_count)
+    _add_to_folders(ancestor_ids(new_path)[:-1], total_size, file_count)
+    MediaFolder.objects.filter(path__startswith=old_path).update(
+        path=Concat(Value(new_path), Substr('path', len(old_path) + 1)),
+        depth=F('depth') + new_path.count('/') - old_path.count('/'),
+    )
+
+
+def recompute_rollups(folder_ids):
+    """Recalcula os totais das pastas indicadas a partir dos arquivos (usado após exclusões)."""
+    from .models import MediaFile, MediaFolder
+
+    for folder in MediaFolder.objects.filter(pk__in=folder_ids).only('pk', 'path'):
+        totals = MediaFile.objects.filter(folder__path__startswith=folder.path).aggregate(
+            total_size=Sum('file_size', default=0), file_count=Count('pk'),
+        )
+        MediaFolder.objects.filter(pk=folder.pk).update(**totals)
+
+
+def browse_level(folder_id=None):
+    """
+    (pasta atual, ancestrais, subpastas) numa única query.
+
+    A pasta atual e seus ancestrais são as pastas cujo path é prefixo do path
+    da atual; as subpastas vêm por parent_id.
+    """
+    from .models import MediaFolder
+
+    if folder_id is None:
+        return None, [], list(MediaFolder.objects.filter(parent__isnull=True))
+
+    on_path = MediaFolder.objects.filter(pk=folder_id, path__startswith=OuterRef('path'))
+    rows = list(MediaFolder.objects.filter(Q(parent_id=folder_id) | Q(Exists(on_path))).order_by('depth', 'name'))
+    current = next((row for row in rows if row.pk == folder_id), None)
+    if current is None:
+        return None, [], []
+    ancestors = [row for row in rows if row.depth < current.depth]
+    children = [row for row in rows if row.parent_id == folder_id]
+    return current, ancestors, children
+
+
+def rebuild_tree(folder_model=None, file_model=None):
+    """Recalcula path, depth e totais de todas as pastas (também usado pela migration)."""
+    if folder_model is None:
+        from . import models
+
+        folder_model, file_model = models.MediaFolder, models.MediaFile
+
+    children = defaultdict(list)
+    for pk, parent_id in folder_model.objects.order_by().values_list('pk', 'parent_id'):
+        children[parent_id].append(pk)
+
+    paths = {}
+    pending = [(pk, '') for pk in children[None]]
+    while pending:
+        pk, parent_path = pending.pop()
+        paths[pk] = f'{parent_path}{pk}/'
+        pending.extend((child, paths[pk]) for child in children[pk])
+
+    totals = defaultdict(lambda: [0, 0])
+    direct = (
+        file_model.objects.filter(folder__isnull=False).order_by().values('folder')
+        .annotate(size=Sum('file_size'), count=Count('pk'))
+    )
+    for row in direct:
+        for ancestor in ancestor_ids(paths.get(row['folder'], '')):
+            totals[ancestor][0] += row['size'] or 0
+            totals[ancestor][1] += row['count']
+
+    folders = list(folder_model.objects.all())
+    for folder in folders:
+        # Pastas presas num ciclo de parent ficam fora da árvore (path vazio)
+        folder.path = paths.get(folder.pk, '')
+        folder.depth = max(folder.path.count('/') - 1, 0)
+        folder.total_size, folder.file_count = totals[folder.pk]
+    folder_model.objects.bulk_update(folders, ['path', 'depth', 'total_size', 'file_count'], batch_size=500)
@@ -0,0 +1,30 @@
+"""
+Descarta uploads em partes abandonados (e as partes gravadas em disco).
+
+Agendar via cron, ex: uma vez por dia:
+
+    0 4 * * * python manage.py clean_media_uploads
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.media_library.models import MediaUpload
+from apps.media_library.uploads import discard_upload
+
+
+class Command(BaseCommand):
+    help = 'Remove uploads em partes sem atividade há mais de --hours horas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = MediaUpload.objects.filter(updated_at__lt=cutoff)
+        count = 0
+        for upload in stale.iterator():
+            discard_upload(upload)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'{count} upload(s) descartado(s).'))
@@ -0,0 +1,19 @@
+"""
+Apaga MediaBlob sem referências (e seus arquivos) que ficaram para trás.
+
+O release() já coleta cada blob logo após o commit; este comando cobre os
+que sobraram (processo encerrado antes do on_commit). Agendar via cron, ex:
+
+    30 4 * * * python manage.py collect_media_blobs
+"""
+from django.core.management.base import BaseCommand
+
+from apps.media_library.models import MediaBlob
+
+
+class Command(BaseCommand):
+    help = 'Remove blobs da biblioteca de mídia sem referências e os arquivos correspondentes.'
+
+    def handle(self, *args, **options):
+        count = MediaBlob.objects.collect()
+        self.stdout.write(self.style.SUCCESS(f'{count} blob(s) removido(s).'))
@@ -0,0 +1,36 @@
+"""
+Migra arquivos da biblioteca de mídia enviados antes do armazenamento por conteúdo.
+
+Cada MediaFile sem blob é lido, associado ao blob do seu conteúdo (gravado uma
+vez em media_library/files/<aa>/<sha256><ext>) e o arquivo antigo é apagado:
+
+    python manage.py dedupe_media_files
+"""
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.media_library.models import MediaBlob, MediaFile, file_type_for, media_storage
+
+
+class Command(BaseCommand):
+    help = 'Deduplica arquivos antigos da biblioteca de mídia e preenche tamanho/tipo.'
+
+    def handle(self, *args, **options):
+        upload_to = MediaFile._meta.get_field('file').upload_to
+        migrated = missing = 0
+        for media in MediaFile.objects.filter(blob__isnull=True).exclude(file='').iterator():
+            old_name = media.file.name
+            if not media_storage.exists(old_name):
+                self.stderr.write(f'Arquivo ausente: {old_name} (MediaFile pk={media.pk})')
+                missing += 1
+                continue
+            with media_storage.open(old_name, 'rb') as source, transaction.atomic():
+                blob = MediaBlob.objects.acquire(File(source, name=old_name), upload_to)
+                MediaFile.objects.filter(pk=media.pk).update(
+                    blob=blob, file=blob.name, file_size=blob.size, file_type=file_type_for(blob.mime_type),
+                )
+                if old_name != blob.name:
+                    transaction.on_commit(lambda name=old_name: media_storage.delete(name))
+            migrated += 1
+        self.stdout.write(self.style.SUCCESS(f'{migrated} arquivo(s) migrado(s), {missing} ausente(s).'))
@@ -0,0 +1,26 @@
+"""
+Gera miniaturas e metadados dos arquivos da biblioteca de mídia ainda não processados.
+
+    python manage.py generate_media_previews [--all]
+"""
+from django.core.management.base import BaseCommand
+
+from apps.media_library.models import MediaBlob
+from apps.media_library.previews import generate_preview
+
+
+class Command(BaseCommand):
+    help = 'Gera miniaturas, dimensões e número de páginas dos arquivos da biblioteca de mídia.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Reprocessa também os já processados.')
+
+    def handle(self, *args, **options):
+        blobs = MediaBlob.objects.all()
+        if not options['all']:
+            blobs = blobs.filter(processed_at__isnull=True)
+        count = 0
+        for blob_id in blobs.values_list('pk', flat=True).iterator():
+            generate_preview(blob_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'{count} arquivo(s) processado(s).'))
@@ -0,0 +1,22 @@
+"""
+Recalcula caminhos e totais (bytes e arquivos) de todas as pastas da biblioteca de mídia.
+
+Necessário só depois de alterações que não passam pelo save() dos modelos
+(queryset.update, SQL direto).
+
+    python manage.py rebuild_media_folders
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.media_library.folders import rebuild_tree
+from apps.media_library.models import MediaFolder
+
+
+class Command(BaseCommand):
+    help = 'Recalcula path, profundidade e totais das pastas da biblioteca de mídia.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_tree()
+        self.stdout.write(self.style.SUCCESS(f'{MediaFolder.objects.count()} pasta(s) recalculada(s).'))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:18
+
+import apps.common.files
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_library', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('name', models.CharField(max_length=255, verbose_name='Arquivo')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Tamanho (bytes)')),
+                ('mime_type', models.CharField(max_length=100, verbose_name='Tipo MIME')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='Referências')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Media Blob',
+                'verbose_name_plural': 'Media Blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='mediafile',
+            name='file',
+            field=models.FileField(storage=apps.common.files.ContentAddressedStorage(), upload_to='media_library/files/'),
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='blob',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='files', to='media_library.mediablob'),
+        ),
+    ]
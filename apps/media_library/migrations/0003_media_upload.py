@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:21
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_library', '0002_media_blob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaUpload',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField()),
+                ('chunk_size', models.PositiveIntegerField()),
+                ('offset', models.PositiveBigIntegerField(default=0, help_text='Bytes já recebidos, sempre múltiplo de chunk_size.')),
+                ('sha256', models.CharField(blank=True, help_text='Checksum informado pelo cliente (opcional).', max_length=64)),
+                ('title', models.CharField(max_length=255)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('folder', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='media_library.mediafolder')),
+            ],
+            options={
+                'verbose_name': 'Media Upload',
+                'verbose_name_plural': 'Media Uploads',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_library', '0003_media_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediablob',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Altura (px)'),
+        ),
+        migrations.AddField(
+            model_name='mediablob',
+            name='page_count',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Páginas'),
+        ),
+        migrations.AddField(
+            model_name='mediablob',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Processado em'),
+        ),
+        migrations.AddField(
+            model_name='mediablob',
+            name='thumbnail',
+            field=models.ImageField(blank=True, upload_to='media_library/thumbs/', verbose_name='Miniatura'),
+        ),
+        migrations.AddField(
+            model_name='mediablob',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Largura (px)'),
+        ),
+    ]
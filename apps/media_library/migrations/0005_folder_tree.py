@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:26
+
+from django.db import migrations, models
+
+from apps.media_library.folders import rebuild_tree
+
+
+def build_folder_tree(apps, schema_editor):
+    """Preenche path/depth e os totais das pastas existentes."""
+    rebuild_tree(apps.get_model('media_library', 'MediaFolder'), apps.get_model('media_library', 'MediaFile'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_library', '0004_media_previews'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediafolder',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='mediafolder',
+            name='file_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Arquivos'),
+        ),
+        migrations.AddField(
+            model_name='mediafolder',
+            name='path',
+            field=models.CharField(default='', editable=False, help_text="IDs dos ancestrais, ex.: '3/8/21/'", max_length=255),
+        ),
+        migrations.AddField(
+            model_name='mediafolder',
+            name='total_size',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Tamanho total (bytes)'),
+        ),
+        migrations.AddIndex(
+            model_name='mediafolder',
+            index=models.Index(fields=['path'], name='media_folder_path_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(build_folder_tree, reverse_code=migrations.RunPython.noop),
+    ]
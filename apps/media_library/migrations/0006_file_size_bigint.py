@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_library', '0005_folder_tree'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mediafile',
+            name='file_size',
+            field=models.PositiveBigIntegerField(default=0, help_text='Size in bytes'),
+        ),
+    ]
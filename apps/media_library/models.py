@@ -1,21 +1,175 @@
-from django.db import models
+import mimetypes
+import os
+import uuid
+
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.db.models import F
+
+from apps.common.files import ContentAddressedStorage, describe_upload
 from apps.common.models import TimeStampedModel
 
+media_storage = ContentAddressedStorage()
+
+DOCUMENT_MIME_TYPES = {
+    'application/pdf',
+    'application/msword',
+    'application/zip',  # .docx/.xlsx/.pptx
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+}
+
+# Mantidos só por folders.py (UPDATE com F()); save() comum nunca os sobrescreve
+TREE_FIELDS = {'path', 'depth', 'total_size', 'file_count'}
+
 
 class MediaFolder(models.Model):
     name = models.CharField(max_length=200)
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='children')
+    # Caminho materializado e totais da subárvore, mantidos por folders.py
+    path = models.CharField(max_length=255, editable=False, default='', help_text="IDs dos ancestrais, ex.: '3/8/21/'")
+    depth = models.PositiveSmallIntegerField(editable=False, default=0)
+    total_size = models.PositiveBigIntegerField('Tamanho total (bytes)', editable=False, default=0)
+    file_count = models.PositiveIntegerField('Arquivos', editable=False, default=0)
 
     class Meta:
         ordering = ['name']
         verbose_name = 'Media Folder'
         verbose_name_plural = 'Media Folders'
+        indexes = [
+            # varchar_pattern_ops: path__startswith (LIKE 'x/%') usa o índice em qualquer collation
+            models.Index(fields=['path'], name='media_folder_path_idx', opclasses=['varchar_pattern_ops']),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def clean(self):
+        from .folders import ancestor_ids
+
+        if self.pk and self.parent_id and self.pk in ancestor_ids(self.parent.path):
+            raise ValidationError({'parent': 'A pasta não pode ficar dentro de si mesma ou de uma subpasta.'})
+
+    def save(self, *args, **kwargs):
+        """Grava path/depth; se o parent mudou, move a subárvore e seus totais (folders.move_subtree)."""
+        from .folders import move_subtree
+
+        with transaction.atomic():
+            old_path = ''
+            if not self._state.adding:
+                # Lidos do banco: a instância pode estar defasada depois de movimentos e uploads
+                old_path = MediaFolder.objects.filter(pk=self.pk).values_list('path', flat=True).first() or ''
+                if kwargs.get('update_fields') is None:
+                    kwargs['update_fields'] = [
+                        field.name for field in self._meta.concrete_fields
+                        if not field.primary_key and field.name not in TREE_FIELDS
+                    ]
+            super().save(*args, **kwargs)
+            parent_path = ''
+            if self.parent_id:
+                parent_path = MediaFolder.objects.values_list('path', flat=True).get(pk=self.parent_id)
+            path = f'{parent_path}{self.pk}/'
+            if path == old_path:
+                return
+            if old_path and path.startswith(old_path):
+                raise ValueError('A pasta não pode ficar dentro de si mesma ou de uma subpasta.')
+            if old_path:
+                move_subtree(self, old_path, path)
+            else:
+                MediaFolder.objects.filter(pk=self.pk).update(path=path, depth=path.count('/') - 1)
+            self.path, self.depth = path, path.count('/') - 1
+
+
+class MediaBlobManager(models.Manager):
+    def acquire(self, file, upload_to):
+        """Grava o conteúdo (se inédito) e soma uma referência. Deve rodar em transação.
+
+        O select_for_update também espera um collect() em andamento do mesmo
+        blob: quando ele termina, o registro e o arquivo já se foram e o
+        conteúdo é gravado de novo.
+        """
+        describe_upload(file)
+        blob = self.select_for_update().filter(sha256=file.sha256).first()
+        if blob is None:
+            name = media_storage.save(f'{upload_to}{os.path.basename(file.name)}', file)
+            mime_type = file.sniffed_type or mimetypes.guess_type(file.name)[0] or 'application/octet-stream'
+            blob, _ = self.get_or_create(sha256=file.sha256, defaults={
+                'name': name, 'size': file.size, 'mime_type': mime_type,
+            })
+        self.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+        return blob
+
+    def release(self, blob_id):
+        """Tira uma referência; sem referências, o blob é coletado (collect) após o commit."""
+        self.filter(pk=blob_id).update(ref_count=F('ref_count') - 1)
+        if self.filter(pk=blob_id, ref_count__lte=0).exists():
+            transaction.on_commit(lambda: self.collect([blob_id]))
+
+    def collect(self, blob_ids=None):
+        """Apaga blobs sem referências (todos ou os de blob_ids) e seus arquivos. Retorna quantos.
+
+        Cada blob é travado e o arquivo apagado antes do commit que remove o
+        registro: um acquire() concorrente do mesmo conteúdo espera o lock e,
+        sem registro, grava o arquivo de novo. Apagando só depois do commit, o
+        acquire poderia reaproveitar um arquivo prestes a sumir.
+        """
+        orphans = self.filter(ref_count__lte=0)
+        if blob_ids is not None:
+            orphans = orphans.filter(pk__in=blob_ids)
+        collected = 0
+        for blob_id in list(orphans.values_list('pk', flat=True)):
+            with transaction.atomic():
+                blob = self.select_for_update().filter(pk=blob_id, ref_count__lte=0).first()
+                if blob is None:  # reaproveitado por um acquire() desde a consulta
+                    continue
+                self.filter(pk=blob.pk).delete()
+                media_storage.delete(blob.name)
+                if blob.thumbnail and not self.filter(thumbnail=blob.thumbnail.name).exists():
+                    default_storage.delete(blob.thumbnail.name)  # miniatura idêntica em outro blob fica
+            collected += 1
+        return collected
+
+
+class MediaBlob(models.Model):
+    """Conteúdo físico de um ou mais MediaFile, gravado uma vez e contado por referência."""
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField('Arquivo', max_length=255)
+    size = models.PositiveBigIntegerField('Tamanho (bytes)')
+    mime_type = models.CharField('Tipo MIME', max_length=100)
+    ref_count = models.PositiveIntegerField('Referências', default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Preenchidos em segundo plano por previews.generate_preview
+    width = models.PositiveIntegerField('Largura (px)', null=True, blank=True)
+    height = models.PositiveIntegerField('Altura (px)', null=True, blank=True)
+    page_count = models.PositiveIntegerField('Páginas', null=True, blank=True)
+    thumbnail = models.ImageField('Miniatura', upload_to='media_library/thumbs/', blank=True)
+    processed_at = models.DateTimeField('Processado em', null=True, blank=True)
+
+    objects = MediaBlobManager()
+
+    class Meta:
+        verbose_name = 'Media Blob'
+        verbose_name_plural = 'Media Blobs'
 
     def __str__(self):
         return self.name
 
 
+def file_type_for(mime_type):
+    """MediaFile.FileType a partir do MIME detectado."""
+    kind = mime_type.split('/')[0]
+    if kind in ('image', 'video', 'audio'):
+        return kind
+    if kind == 'text' or mime_type in DOCUMENT_MIME_TYPES:
+        return 'document'
+    return 'other'
+
+
+
 class MediaFile(TimeStampedModel):
     class FileType(models.TextChoices):
         IMAGE = 'image', 'Image'
@@ -25,12 +179,13 @@ class MediaFile(TimeStampedModel):
         OTHER = 'other', 'Other'
 
     title = models.CharField(max_length=255)
-    file = models.FileField(upload_to='media_library/files/')
+    file = models.FileField(upload_to='media_library/files/', storage=media_storage)
     file_type = models.CharField(max_length=20, choices=FileType.choices, default=FileType.OTHER)
     alt_text = models.CharField(max_length=255, blank=True)
     folder = models.ForeignKey(MediaFolder, on_delete=models.SET_NULL, null=True, blank=True, related_name='files')
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
-    file_size = models.PositiveIntegerField(help_text="Size in bytes", default=0)
+    file_size = models.PositiveBigIntegerField(help_text="Size in bytes", default=0)
+    blob = models.ForeignKey(MediaBlob, on_delete=models.PROTECT, null=True, editable=False, related_name='files')
 
     class Meta:
         ordering = ['-created_at']
@@ -39,3 +194,72 @@ class MediaFile(TimeStampedModel):
 
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {'folder_id', 'file_size'} <= instance.__dict__.keys():
+            instance._rollup_state = (instance.folder_id, instance.file_size)
+        return instance
+
+    def _saved_rollup_state(self):
+        """(folder_id, file_size) como estão no banco; sem consulta quando veio de from_db."""
+        if self._state.adding:
+            return None, 0
+        if not hasattr(self, '_rollup_state'):
+            row = MediaFile.objects.filter(pk=self.pk).values_list('folder_id', 'file_size').first()
+            self._rollup_state = row or (None, 0)
+        return self._rollup_state
+
+    def save(self, *args, **kwargs):
+        """Upload novo: reaproveita o blob de mesmo conteúdo e preenche file_size/file_type.
+
+        Conteúdo inédito agenda a geração de miniatura e metadados (previews.py).
+        Mudança de pasta ou tamanho atualiza os totais das pastas (folders.py).
+        """
+        from .folders import update_file_rollups
+
+        with transaction.atomic():
+            old_state = self._saved_rollup_state()
+            previous_blob_id = blob = None
+            if self.file and not self.file._committed:
+                previous_blob_id = self.blob_id
+                # self.file.file: o arquivo enviado em si, onde describe_upload guarda sha256/sniffed_type
+                blob = MediaBlob.objects.acquire(self.file.file, self.file.field.upload_to)
+                self.blob = blob
+                self.file.name = blob.name
+                self.file._committed = True
+                self.file_size = blob.size
+                self.file_type = file_type_for(blob.mime_type)
+            super().save(*args, **kwargs)
+            self._rollup_state = (self.folder_id, self.file_size)
+            update_file_rollups(old_state, self._rollup_state)
+            if previous_blob_id:
+                MediaBlob.objects.release(previous_blob_id)
+            if blob is not None and blob.processed_at is None:
+                from apps.common.tasks import enqueue
+
+                from .previews import generate_preview
+
+                enqueue(generate_preview, blob.pk)
+
+
+class MediaUpload(TimeStampedModel):
+    """Upload em partes em andamento; as partes ficam em CHUNKED_UPLOAD_DIR/<id>/ (ver uploads.py)."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    offset = models.PositiveBigIntegerField(default=0, help_text='Bytes já recebidos, sempre múltiplo de chunk_size.')
+    sha256 = models.CharField(max_length=64, blank=True, help_text='Checksum informado pelo cliente (opcional).')
+    title = models.CharField(max_length=255)
+    folder = models.ForeignKey(MediaFolder, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        verbose_name = 'Media Upload'
+        verbose_name_plural = 'Media Uploads'
+
+    def __str__(self):
+        return self.filename
@@ -0,0 +1,101 @@
+"""
+Miniaturas e metadados (dimensões, páginas) da biblioteca de mídia.
+
+generate_preview() roda em segundo plano (apps.common.tasks.enqueue) uma vez
+por conteúdo: como MediaBlob é deduplicado, reenviar o mesmo arquivo não
+gera outra miniatura. O changelist só lê os campos já calculados — nunca
+abre o arquivo original.
+
+- Imagens: dimensões reais (Pillow, só o cabeçalho) e miniatura WebP; JPEG
+  é decodificado já reduzido (Image.draft).
+- PDF: número de páginas e, quando houver, a primeira imagem embutida na
+  primeira página como miniatura (renderizar a página exigiria poppler).
+- Miniaturas são gravadas pelo hash do próprio WebP (hashed_storage), então
+  podem ser cacheadas para sempre.
+- Vídeo/áudio: sem miniatura nem duração (ffmpeg não faz parte da stack).
+
+Usado por:
+- apps/media_library/models.py (MediaFile.save, conteúdo inédito)
+- apps/media_library/management/commands/generate_media_previews.py (backfill)
+"""
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from apps.common.files import hashed_storage
+
+from .models import MediaBlob, media_storage
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (320, 320)
+MAX_PDF_IMAGE_BYTES = 20 * 1024 * 1024
+
+
+def _thumbnail(image):
+    image.draft('RGB', THUMBNAIL_SIZE)
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(THUMBNAIL_SIZE)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    output = io.BytesIO()
+    image.save(output, 'WEBP', quality=80)
+    return output.getvalue()
+
+
+def _image_preview(file):
+    try:
+        image = Image.open(file)
+    except UnidentifiedImageError:
+        return {}, None
+    metadata = {'width': image.width, 'height': image.height}
+    if image.format in Image.MIME:
+        metadata['mime_type'] = Image.MIME[image.format]
+    return metadata, _thumbnail(image)
+
+
+def _pdf_preview(file):
+    from pypdf import PdfReader
+
+    reader = PdfReader(file)
+    metadata = {'page_count': len(reader.pages)}
+    if not reader.pages:
+        return metadata, None
+    for embedded in reader.pages[0].images:
+        if len(embedded.data) <= MAX_PDF_IMAGE_BYTES:
+            try:
+                return metadata, _thumbnail(Image.open(io.BytesIO(embedded.data)))
+            except (UnidentifiedImageError, OSError):
+                continue
+    return metadata, None
+
+
+def generate_preview(blob_id):
+    """Calcula metadados e miniatura de um MediaBlob. Falhas só são registradas no log."""
+    blob = MediaBlob.objects.filter(pk=blob_id).first()
+    if blob is None:
+        return
+    metadata, thumbnail = {}, None
+    try:
+        with media_storage.open(blob.name, 'rb') as file:
+            if blob.mime_type == 'application/pdf':
+                metadata, thumbnail = _pdf_preview(file)
+            elif blob.mime_type.split('/')[0] in ('image', 'application'):
+                # 'application': tipo não reconhecido pelos magic bytes; o Pillow confirma ou descarta
+                metadata, thumbnail = _image_preview(file)
+    except Exception:
+        logger.exception('Falha ao gerar a miniatura do arquivo %s', blob.name)
+
+    if thumbnail:
+        # Nome pelo hash da própria miniatura: reprocessar gera outra URL, nunca uma versão velha em cache
+        metadata['thumbnail'] = hashed_storage.save('media_library/thumbs/thumb.webp', ContentFile(thumbnail))
+        previous = blob.thumbnail.name
+        if previous and previous != metadata['thumbnail'] and not MediaBlob.objects.filter(
+            thumbnail=previous,
+        ).exclude(pk=blob.pk).exists():
+            default_storage.delete(previous)
+    MediaBlob.objects.filter(pk=blob_id).update(processed_at=timezone.now(), **metadata)
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .folders import ancestor_ids, recompute_rollups, update_file_rollups
+from .models import MediaBlob, MediaFile, MediaFolder
+
+
+@receiver(post_delete, sender=MediaFile)
+def release_blob_on_delete(sender, instance, **kwargs):
+    """Vale também para exclusão em massa no admin (queryset.delete() não chama Model.delete())."""
+    if instance.blob_id:
+        MediaBlob.objects.release(instance.blob_id)
+    update_file_rollups((instance.folder_id, instance.file_size), (None, 0))
+
+
+@receiver(post_delete, sender=MediaFolder)
+def recompute_ancestors_on_folder_delete(sender, instance, **kwargs):
+    """Os arquivos da pasta já foram para a raiz (SET_NULL); os ancestrais que sobraram são recalculados."""
+    recompute_rollups(ancestor_ids(instance.path)[:-1])
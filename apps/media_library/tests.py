@@ -0,0 +1,162 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_media_files_share_one_refcounted_blob(settings, tmp_path, django_capture_on_commit_callbacks):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    from .models import MediaBlob, MediaFile
+
+    settings.MEDIA_ROOT = tmp_path
+    png = b'\x89PNG\r\n\x1a\n' + b'\x00' * 100
+    first, second = (
+        MediaFile.objects.create(title=title, file=SimpleUploadedFile(f'{title}.png', png))
+        for title in ('logo', 'logo-copia')
+    )
+
+    assert first.file.name == second.file.name
+    assert first.file.name.startswith('media_library/files/')
+    assert (first.file_size, first.file_type) == (len(png), MediaFile.FileType.IMAGE)
+    assert len(list(tmp_path.rglob('*.png'))) == 1
+    assert MediaBlob.objects.get().ref_count == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert MediaBlob.objects.get().ref_count == 1
+    assert len(list(tmp_path.rglob('*.png'))) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        MediaFile.objects.all().delete()
+    assert not MediaBlob.objects.exists()
+    assert not list(tmp_path.rglob('*.png'))
+
+    # Reenvio do mesmo conteúdo antes da coleta: o blob sem referências é reaproveitado, não apagado
+    third = MediaFile.objects.create(title='logo', file=SimpleUploadedFile('logo.png', png))
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        third.delete()
+    MediaFile.objects.create(title='de-novo', file=SimpleUploadedFile('logo.png', png))
+    for callback in callbacks:
+        callback()
+    assert MediaBlob.objects.get().ref_count == 1
+    assert MediaBlob.objects.collect() == 0
+    assert len(list(tmp_path.rglob('*.png'))) == 1
+
+
+@pytest.mark.django_db
+def test_chunked_upload_resumes_and_verifies_checksum(admin_client, settings, tmp_path, monkeypatch):
+    import hashlib
+
+    from django.urls import reverse
+
+    from . import uploads
+    from .models import MediaFile
+
+    settings.MEDIA_ROOT = tmp_path / 'media'
+    settings.CHUNKED_UPLOAD_DIR = tmp_path / 'chunks'
+    monkeypatch.setattr(uploads, 'UPLOAD_CHUNK_SIZE', 1024)
+    content = b'\x00\x00\x00\x18ftypmp42' + bytes(range(256)) * 10  # 2572 bytes, 3 partes
+    response = admin_client.post(reverse('admin:media_library_mediafile_upload_start'), {
+        'filename': 'aula.mp4', 'size': len(content), 'sha256': hashlib.sha256(content).hexdigest(),
+    }, content_type='application/json')
+    assert response.status_code == 201
+    url = response.json()['url']
+
+    def put(offset, data):
+        return admin_client.put(url, data, content_type='application/octet-stream', headers={
+            'Upload-Offset': str(offset), 'X-Chunk-SHA256': hashlib.sha256(data).hexdigest(),
+        })
+
+    assert put(0, content[:1024]).json()['offset'] == 1024
+    # Parte repetida (cliente não viu a resposta): 409 com o offset para retomar
+    response = put(0, content[:1024])
+    assert (response.status_code, response.json()['offset']) == (409, 1024)
+    response = admin_client.put(url, content[1024:2048], content_type='application/octet-stream', headers={
+        'Upload-Offset': '1024', 'X-Chunk-SHA256': '0' * 64,
+    })
+    assert response.status_code == 400
+    assert admin_client.get(url).json()['offset'] == 1024
+    put(1024, content[1024:2048])
+    put(2048, content[2048:])
+
+    response = admin_client.post(url + 'complete/')
+    assert response.status_code == 201
+    media = MediaFile.objects.get()
+    assert (media.file_size, media.file_type) == (len(content), MediaFile.FileType.VIDEO)
+    assert media.file.read() == content
+    assert not list((tmp_path / 'chunks').iterdir())
+
+
+@pytest.mark.django_db
+def test_previews_are_generated_once_and_rendered_in_grid(admin_client, settings, tmp_path):
+    import io
+
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.urls import reverse
+    from PIL import Image
+
+    from .models import MediaFile
+    from .previews import generate_preview
+
+    settings.MEDIA_ROOT = tmp_path
+    buffer = io.BytesIO()
+    Image.new('RGB', (1200, 800), 'teal').save(buffer, 'JPEG')
+    media = MediaFile.objects.create(title='Fachada', file=SimpleUploadedFile('fachada.jpg', buffer.getvalue()))
+
+    generate_preview(media.blob_id)
+    media.blob.refresh_from_db()
+    assert (media.blob.width, media.blob.height) == (1200, 800)
+    assert media.blob.processed_at is not None
+    with Image.open(media.blob.thumbnail.path) as thumbnail:
+        assert thumbnail.size == (320, 213)
+
+    response = admin_client.get(reverse('admin:media_library_mediafile_changelist'))
+    assert response.status_code == 200
+    assert media.blob.thumbnail.url in response.content.decode()
+    assert b'1200\xc3\x97800' in response.content
+
+
+@pytest.mark.django_db
+def test_folder_rollups_follow_files_and_moves(admin_client, settings, tmp_path, django_assert_num_queries):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.urls import reverse
+
+    from .folders import browse_level
+    from .models import MediaFile, MediaFolder
+
+    settings.MEDIA_ROOT = tmp_path
+    root = MediaFolder.objects.create(name='Escola')
+    events = MediaFolder.objects.create(name='Eventos', parent=root)
+    other = MediaFolder.objects.create(name='Arquivo')
+    assert events.path == f'{root.pk}/{events.pk}/'
+
+    def totals():
+        return {
+            folder.name: (folder.total_size, folder.file_count)
+            for folder in MediaFolder.objects.all()
+        }
+
+    photo = MediaFile.objects.create(title='Foto', folder=events, file=SimpleUploadedFile('a.txt', b'x' * 300))
+    MediaFile.objects.create(title='Ata', folder=root, file=SimpleUploadedFile('b.txt', b'y' * 50))
+    assert totals() == {'Escola': (350, 2), 'Eventos': (300, 1), 'Arquivo': (0, 0)}
+
+    photo = MediaFile.objects.get(pk=photo.pk)
+    photo.folder = other
+    photo.save()
+    assert totals() == {'Escola': (50, 1), 'Eventos': (0, 0), 'Arquivo': (300, 1)}
+
+    other.parent = events
+    other.save()
+    assert MediaFolder.objects.get(pk=other.pk).path == f'{root.pk}/{events.pk}/{other.pk}/'
+    assert totals() == {'Escola': (350, 2), 'Eventos': (300, 1), 'Arquivo': (300, 1)}
+
+    with django_assert_num_queries(1):
+        current, ancestors, children = browse_level(events.pk)
+    assert (current, ancestors, children) == (events, [root], [other])
+
+    response = admin_client.get(reverse('admin:media_library_mediafolder_browse'), {'folder': events.pk})
+    assert response.status_code == 200
+    assert 'Arquivo' in response.content.decode()
+
+    photo.delete()
+    events.delete()
+    assert totals() == {'Escola': (50, 1)}
@@ -0,0 +1,138 @@
+"""
+Upload em partes (retomável) para arquivos grandes da biblioteca de mídia.
+
+Protocolo (endpoints no MediaFileAdmin, ver admin.py):
+1. POST uploads/ com {filename, size, title, folder?, sha256?} cria a sessão
+   e devolve {id, chunk_size, offset}.
+2. PUT uploads/<id>/ com o corpo cru da parte e o header Upload-Offset (e,
+   opcionalmente, X-Chunk-SHA256). Partes têm exatamente chunk_size bytes,
+   menos a última; offset fora de ordem responde 409 com o offset correto.
+3. GET uploads/<id>/ devolve o offset atual: depois de uma queda, o
+   cliente continua dali em vez de recomeçar.
+4. POST uploads/<id>/complete/ junta as partes, confere tamanho e SHA-256 e
+   cria o MediaFile (com deduplicação por conteúdo, ver models.py).
+
+Cada parte é lida do corpo da requisição em blocos de READ_SIZE e gravada
+direto em disco (nada de request.body, então DATA_UPLOAD_MAX_MEMORY_SIZE não
+limita). A montagem usa concatenate_files (copy_file_range no kernel) e o
+arquivo final é movido para o storage (rename, se estiver no mesmo disco).
+
+Usado por:
+- apps/media_library/admin.py (endpoints e página de upload)
+- apps/media_library/management/commands/clean_media_uploads.py
+"""
+import hashlib
+import math
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.utils import timezone
+
+from apps.common.files import concatenate_files, describe_upload
+
+from .models import MediaFile, MediaUpload
+
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024  # abaixo do client_max_body_size (10M) do nginx
+MAX_UPLOAD_SIZE = 4 * 1024 ** 3  # 4 GB
+READ_SIZE = 64 * 1024
+
+_SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def upload_dir(upload):
+    return Path(settings.CHUNKED_UPLOAD_DIR) / str(upload.pk)
+
+
+def chunk_path(upload, index):
+    return upload_dir(upload) / f'{index:06d}'
+
+
+def start_upload(user, filename, size, title='', folder=None, sha256=''):
+    filename = os.path.basename(str(filename or '')).strip()
+    sha256 = str(sha256 or '').lower()
+    if not filename:
+        raise UploadError('Informe o nome do arquivo.')
+    if not isinstance(size, int) or not 0 < size <= MAX_UPLOAD_SIZE:
+        raise UploadError(f'Tamanho inválido (máximo {MAX_UPLOAD_SIZE // 1024 ** 3} GB).')
+    if sha256 and not _SHA256_RE.match(sha256):
+        raise UploadError('Checksum SHA-256 inválido.')
+    return MediaUpload.objects.create(
+        filename=filename[:255], size=size, chunk_size=UPLOAD_CHUNK_SIZE, sha256=sha256,
+        title=(title or filename)[:255], folder=folder, created_by=user,
+    )
+
+
+def receive_chunk(upload, offset, stream, length, checksum=''):
+    """Grava uma parte lida de stream; só avança o offset se ela chegou inteira e íntegra."""
+    if offset != upload.offset:
+        raise UploadError('Offset fora de ordem.', status=409)
+    expected = min(upload.chunk_size, upload.size - offset)
+    if expected <= 0:
+        raise UploadError('Upload já recebido por completo.', status=409)
+    if length != expected:
+        raise UploadError(f'A parte deve ter {expected} bytes.')
+
+    directory = upload_dir(upload)
+    directory.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    received = 0
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False) as part:
+        try:
+            while received < length:
+                data = stream.read(min(READ_SIZE, length - received))
+                if not data:
+                    break
+                part.write(data)
+                digest.update(data)
+                received += len(data)
+        except OSError:  # cliente caiu no meio da parte (UnreadablePostError)
+            pass
+    if received != length or (checksum and checksum.lower() != digest.hexdigest()):
+        os.unlink(part.name)
+        raise UploadError('Parte incompleta ou corrompida; envie novamente.')
+
+    os.replace(part.name, chunk_path(upload, offset // upload.chunk_size))
+    updated = MediaUpload.objects.filter(pk=upload.pk, offset=offset).update(
+        offset=offset + length, updated_at=timezone.now(),
+    )
+    if not updated:  # mesma parte enviada em paralelo; o conteúdo gravado é idêntico
+        raise UploadError('Offset fora de ordem.', status=409)
+    upload.offset = offset + length
+
+
+def complete_upload(upload):
+    """Monta o arquivo, confere o checksum e cria o MediaFile. A sessão é descartada."""
+    if upload.offset != upload.size:
+        raise UploadError('Upload incompleto.', status=409)
+
+    chunks = [chunk_path(upload, index) for index in range(math.ceil(upload.size / upload.chunk_size))]
+    file = TemporaryUploadedFile(upload.filename, 'application/octet-stream', upload.size, None)
+    try:
+        concatenate_files(chunks, file.file)
+        file.seek(0)
+        describe_upload(file)
+        if upload.sha256 and file.sha256 != upload.sha256:
+            discard_upload(upload)
+            raise UploadError('O checksum do arquivo montado não confere; o upload foi descartado.', status=422)
+        media = MediaFile(title=upload.title, folder=upload.folder, uploaded_by=upload.created_by, file=file)
+        media.save()
+    finally:
+        file.close()
+    discard_upload(upload)
+    return media
+
+
+def discard_upload(upload):
+    shutil.rmtree(upload_dir(upload), ignore_errors=True)
+    upload.delete()
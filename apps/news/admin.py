@@ -1,10 +1,30 @@
 from django.contrib import admin, messages
-from django.urls import reverse
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.db.models import Count
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.urls import path, reverse
 from django.utils import timezone
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin
+from unfold.decorators import action
 
-from .models import Article, ArticleBookmark, ArticleLike, Category, Comment, NewsletterSubscription, Tag
+from apps.common.admin_base import BaseAdmin
+from apps.common.exports import csv_export_action
+
+from .models import (
+    Article,
+    ArticleBookmark,
+    ArticleLike,
+    Category,
+    Comment,
+    NewsletterDigest,
+    NewsletterJob,
+    NewsletterSubscription,
+    Tag,
+)
 
 
 @admin.register(Category)
@@ -28,17 +48,18 @@ class TagAdmin(ModelAdmin):
 
 
 @admin.register(Article)
-class ArticleAdmin(ModelAdmin):
+class ArticleAdmin(BaseAdmin):
     list_display = [
         'title', 'category', 'author', 'site',
         'status', 'published_at', 'is_featured', 'view_count', 'newsletter_sent_at', 'newsletter_preview_link',
     ]
     list_filter = ['status', 'site', 'is_featured', 'category', 'published_at']
     search_fields = ['title', 'excerpt', 'content']
+    search_backend = 'fulltext'
     prepopulated_fields = {'slug': ('title',)}
     autocomplete_fields = ['author', 'tags']
     date_hierarchy = 'published_at'
-    readonly_fields = ['view_count', 'newsletter_sent_at', 'created_at', 'updated_at']
+    readonly_fields = ['view_count', 'unique_readers', 'newsletter_sent_at', 'created_at', 'updated_at']
     fieldsets = [
         ('Conteúdo', {
             'fields': ('title', 'slug', 'excerpt', 'content'),
@@ -62,7 +83,7 @@ class ArticleAdmin(ModelAdmin):
             'description': 'Opcional. Melhore o posicionamento do artigo no Google.',
         }),
         ('Estatísticas', {
-            'fields': ('view_count', 'newsletter_sent_at', 'created_at', 'updated_at'),
+            'fields': ('view_count', 'unique_readers', 'newsletter_sent_at', 'created_at', 'updated_at'),
             'classes': ('collapse',),
             'description': 'newsletter_sent_at: preenchido automaticamente ao enviar a newsletter. Vazio = não enviada ainda.',
         }),
@@ -78,6 +99,15 @@ class ArticleAdmin(ModelAdmin):
             url,
         )
 
+    @admin.display(description='Leitores únicos')
+    def unique_readers(self, obj):
+        """Estimativa dos últimos 30 dias; trocar as datas recarrega o fragmento (unique_readers_view)."""
+        from .readers import reader_range_context
+
+        if obj.pk is None:
+            return 0
+        return render_to_string('admin/news/partials/unique_readers.html', reader_range_context(article=obj))
+
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         field = super().formfield_for_foreignkey(db_field, request, **kwargs)
         if field and hasattr(field, 'widget'):
@@ -109,7 +139,9 @@ class ArticleAdmin(ModelAdmin):
 
     @admin.action(description='Enviar Newsletter para inscritos')
     def send_newsletter(self, request, queryset):
-        from .newsletter import send_article_newsletter
+        from apps.common.tasks import enqueue
+
+        from .newsletter import create_newsletter_job, run_newsletter_job
 
         published = queryset.filter(status=Article.Status.PUBLISHED)
 
@@ -121,37 +153,67 @@ class ArticleAdmin(ModelAdmin):
             )
             return
 
-        total_sent = 0
-        articles_sent = 0
-
-        for article in published:
-            sent = send_article_newsletter(article)
-            if sent > 0:
-                total_sent += sent
-                articles_sent += 1
-
-        if total_sent > 0:
-            self.message_user(
-                request,
-                f'✅ Newsletter enviada! {articles_sent} artigo(s) para {total_sent} inscrito(s).',
-                messages.SUCCESS,
-            )
-        else:
-            self.message_user(
-                request,
-                'Nenhum inscrito ativo encontrado para enviar a newsletter.',
-                messages.INFO,
-            )
+        # O envio roda em segundo plano; a request só cria o job e redireciona
+        job = create_newsletter_job(published, user=request.user)
+        enqueue(run_newsletter_job, job.pk)
+        return redirect('admin:news_article_newsletter_job', job.pk)
+
+    def get_urls(self):
+        return [
+            path(
+                'unique-readers/',
+                self.admin_site.admin_view(self.unique_readers_view),
+                name='news_article_unique_readers',
+            ),
+            path(
+                'newsletter-jobs/<int:job_id>/',
+                self.admin_site.admin_view(self.newsletter_job_view),
+                name='news_article_newsletter_job',
+            ),
+            *super().get_urls(),
+        ]
+
+    def unique_readers_view(self, request):
+        """Leitores únicos entre ?start= e ?end= de um artigo (?article=) ou de todos (card do painel)."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        from .readers import reader_range_context
+
+        article = None
+        article_id = request.GET.get('article', '')
+        if article_id:
+            if not article_id.isdigit():
+                raise Http404
+            article = get_object_or_404(self.get_queryset(request), pk=article_id)
+        return render(request, 'admin/news/partials/unique_readers.html', reader_range_context(request.GET, article))
+
+    def newsletter_job_view(self, request, job_id):
+        """Progresso do envio; o fragmento é recarregado via HTMX até o job terminar (ou ser dado como interrompido)."""
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        from .newsletter import fail_stale_newsletter_job
+
+        job = get_object_or_404(NewsletterJob.objects.prefetch_related('articles'), pk=job_id)
+        fail_stale_newsletter_job(job)
+        if request.htmx:
+            return render(request, 'admin/news/partials/newsletter_job_progress.html', {'job': job})
+        return render(request, 'admin/news/newsletter_job.html', {
+            **self.admin_site.each_context(request),
+            'title': f'Envio da newsletter #{job.pk}',
+            'opts': self.model._meta,
+            'job': job,
+        })
 
 
 @admin.register(NewsletterSubscription)
-class NewsletterSubscriptionAdmin(ModelAdmin):
+class NewsletterSubscriptionAdmin(BaseAdmin):
     list_display = ['email', 'site', 'is_active', 'created_at']
     list_filter = ['is_active', 'site', 'created_at']
     search_fields = ['email']
     readonly_fields = ['email', 'site', 'created_at']
     list_per_page = 25
     actions = ['deactivate_subscriptions', 'activate_subscriptions', 'export_emails']
+    actions_list = ['import_csv']
 
     fieldsets = [
         (None, {
@@ -172,36 +234,80 @@ class NewsletterSubscriptionAdmin(ModelAdmin):
         updated = queryset.update(is_active=True)
         self.message_user(request, f'{updated} inscrição(ões) reativada(s).')
 
-    @admin.action(description='Exportar emails como CSV')
-    def export_emails(self, request, queryset):
-        if not request.user.is_superuser:
-            self.message_user(
-                request,
-                'Apenas superusuários podem exportar emails.',
-                messages.ERROR,
-            )
-            return
+    export_emails = csv_export_action(
+        'assinantes.csv',
+        [('E-mail', 'email'), ('Site', 'site__name'), ('Data de Inscrição', 'created_at'), ('Ativo', 'is_active')],
+        description='Exportar emails como CSV',
+        superuser_only=True,
+    )
+
+    @action(description='Importar CSV', url_path='import', icon='upload_file', permissions=['import_csv'])
+    def import_csv(self, request):
+        import io
+
+        from apps.common.sites import get_current_site
+
+        from .forms import SubscriberImportForm
+        from .subscribers import SubscriberImportError, describe_result, import_subscribers
+
+        form = SubscriberImportForm(request.POST or None, request.FILES or None, initial={
+            'site': get_current_site(request),
+        })
+        if request.method == 'POST' and form.is_valid():
+            file = io.TextIOWrapper(form.cleaned_data['file'].file, encoding='utf-8-sig', newline='')
+            try:
+                # Tudo ou nada: um erro no meio do arquivo não deixa lotes anteriores gravados
+                with transaction.atomic():
+                    result = import_subscribers(
+                        file, form.cleaned_data['site'], reactivate=form.cleaned_data['reactivate'],
+                    )
+            except SubscriberImportError as e:
+                form.add_error('file', f'{e} Nenhum inscrito foi importado.')
+            else:
+                self.message_user(request, describe_result(result), messages.SUCCESS)
+                return redirect('admin:news_newslettersubscription_changelist')
+
+        return render(request, 'admin/news/import_subscribers.html', {
+            **self.admin_site.each_context(request),
+            'title': 'Importar inscritos',
+            'opts': self.model._meta,
+            'form': form,
+        })
+
+    def has_import_csv_permission(self, request):
+        return request.user.has_perm('news.add_newslettersubscription') or request.user.is_superuser
+
+
+@admin.register(NewsletterDigest)
+class NewsletterDigestAdmin(ModelAdmin):
+    list_display = ['site', 'sent_at', 'article_count', 'sent_count', 'failed_count']
+    list_filter = ['site', 'sent_at']
+    readonly_fields = ['site', 'articles', 'sent_at', 'sent_count', 'failed_count']
+    list_per_page = 25
 
-        import csv
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('site').annotate(article_total=Count('articles'))
 
-        from django.http import HttpResponse
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="assinantes.csv"'
-        writer = csv.writer(response)
-        writer.writerow(['E-mail', 'Site', 'Data de Inscrição', 'Ativo'])
-        for sub in queryset:
-            writer.writerow([sub.email, sub.site.name, sub.created_at, 'Sim' if sub.is_active else 'Não'])
-        return response
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description='Artigos', ordering='article_total')
+    def article_count(self, obj):
+        return obj.article_total
 
 
 @admin.register(Comment)
-class CommentAdmin(ModelAdmin):
+class CommentAdmin(BaseAdmin):
     list_display = ['user', 'article', 'short_content', 'is_active', 'created_at']
     list_filter = ['is_active', 'created_at']
     search_fields = ['content', 'user__username', 'article__title']
+    search_backend = 'trigram'
     readonly_fields = ['user', 'article', 'content', 'created_at']
     list_per_page = 25
-    actions = ['approve_comments', 'hide_comments']
+    actions = ['approve_comments', 'hide_comments', 'export_csv']
 
     fieldsets = [
         ('Comentário', {
@@ -231,9 +337,18 @@ class CommentAdmin(ModelAdmin):
         updated = queryset.update(is_active=False)
         self.message_user(request, f'{updated} comentário(s) ocultado(s).')
 
+    export_csv = csv_export_action('comentarios.csv', [
+        ('Usuário', 'user__username'),
+        ('E-mail', 'user__email'),
+        ('Artigo', 'article__title'),
+        ('Comentário', 'content'),
+        ('Visível', 'is_active'),
+        ('Data', 'created_at'),
+    ])
+
 
 @admin.register(ArticleLike)
-class ArticleLikeAdmin(ModelAdmin):
+class ArticleLikeAdmin(BaseAdmin):
     list_display = ['article', 'user', 'ip_address', 'created_at']
     list_filter = ['created_at']
     search_fields = ['article__title', 'user__username', 'ip_address']
@@ -241,7 +356,7 @@ class ArticleLikeAdmin(ModelAdmin):
 
 
 @admin.register(ArticleBookmark)
-class ArticleBookmarkAdmin(ModelAdmin):
+class ArticleBookmarkAdmin(BaseAdmin):
     list_display = ['user', 'article', 'created_at']
     list_filter = ['created_at']
     search_fields = ['user__username', 'article__title']
@@ -2,15 +2,35 @@ from django.contrib.syndication.views import Feed
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 
+from apps.common.sites import current_site
+
 from .models import Article, Category
 
 
-class LatestArticlesFeed(Feed):
+class SiteFeed(Feed):
+    """
+    Links absolutos com o domínio do site da requisição.
+
+    O Feed do Django completa as URLs com o Site do SITE_ID; URLs que já
+    começam com '//' só ganham o protocolo.
+    """
+
+    def on_site(self, url):
+        return f'//{current_site().domain}{url}'
+
+    def item_link(self, item):
+        return self.on_site(item.get_absolute_url())
+
+
+class LatestArticlesFeed(SiteFeed):
     title = 'Portal de Notícias - Últimas Notícias'
     description = 'As últimas notícias e eventos da nossa instituição.'
 
     def link(self):
-        return reverse('news:list')
+        return self.on_site(reverse('news:list'))
+
+    def feed_url(self):
+        return self.on_site(reverse('news:feed'))
 
     def items(self):
         return (
@@ -36,7 +56,7 @@ class LatestArticlesFeed(Feed):
         return [item.category.name] if item.category else []
 
 
-class CategoryFeed(Feed):
+class CategoryFeed(SiteFeed):
 
     def get_object(self, request, slug):
         return get_object_or_404(Category, slug=slug)
@@ -45,7 +65,10 @@ class CategoryFeed(Feed):
         return f'Portal de Notícias - {obj.name}'
 
     def link(self, obj):
-        return reverse('news:category_detail', kwargs={'slug': obj.slug})
+        return self.on_site(reverse('news:category_detail', kwargs={'slug': obj.slug}))
+
+    def feed_url(self, obj):
+        return self.on_site(reverse('news:category_feed', kwargs={'slug': obj.slug}))
 
     def description(self, obj):
         return obj.description or f'Artigos da categoria {obj.name}'
@@ -1,4 +1,5 @@
 from django import forms
+from django.contrib.sites.models import Site
 
 from .models import NewsletterSubscription
 
@@ -16,3 +17,36 @@ class NewsletterSubscriptionForm(forms.ModelForm):
                 ),
             })
         }
+
+
+class SubscriberImportForm(forms.Form):
+    """Upload de CSV no admin de inscritos (ver apps/news/subscribers.py)."""
+
+    file = forms.FileField(
+        label='Arquivo CSV',
+        help_text='UTF-8, com coluna "email" ou e-mails na primeira coluna. '
+                  'Para listas muito grandes, prefira o comando import_subscribers.',
+    )
+    site = forms.ModelChoiceField(Site.objects.all(), label='Site')
+    reactivate = forms.BooleanField(
+        label='Reativar inscrições canceladas', required=False, initial=True,
+    )
+
+
+class ReaderRangeForm(forms.Form):
+    """Intervalo (datas inclusivas) dos leitores únicos no admin e no painel."""
+
+    MAX_DAYS = 366
+
+    start = forms.DateField(label='De', widget=forms.DateInput(attrs={'type': 'date'}, format='%Y-%m-%d'))
+    end = forms.DateField(label='Até', widget=forms.DateInput(attrs={'type': 'date'}, format='%Y-%m-%d'))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get('start'), cleaned_data.get('end')
+        if start and end:
+            if end < start:
+                raise forms.ValidationError('A data final deve ser igual ou posterior à inicial.')
+            if (end - start).days >= self.MAX_DAYS:
+                raise forms.ValidationError(f'Escolha um intervalo de até {self.MAX_DAYS} dias.')
+        return cleaned_data
@@ -0,0 +1,46 @@
+"""
+Importa inscritos da newsletter a partir de um CSV.
+
+    python manage.py import_subscribers lista.csv --site 2
+
+Usa a coluna "email"/"e-mail" do cabeçalho ou, sem cabeçalho, a primeira.
+"""
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.news.subscribers import IMPORT_BATCH_SIZE, SubscriberImportError, describe_result, import_subscribers
+
+
+class Command(BaseCommand):
+    help = 'Importa e-mails de um CSV para NewsletterSubscription em lotes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Caminho do arquivo CSV (UTF-8).')
+        parser.add_argument('--site', type=int, default=settings.SITE_ID, help='ID do site (padrão: SITE_ID).')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument(
+            '--no-reactivate', action='store_true',
+            help='Não reativa inscrições canceladas presentes no arquivo.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            site = Site.objects.get(pk=options['site'])
+        except Site.DoesNotExist:
+            raise CommandError(f'Site {options["site"]} não existe.')
+
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as file:
+                result = import_subscribers(
+                    file, site,
+                    reactivate=not options['no_reactivate'],
+                    batch_size=options['batch_size'],
+                )
+        except OSError as e:
+            raise CommandError(f'Não foi possível ler o arquivo: {e}')
+        except SubscriberImportError as e:
+            # Sem transação única (arquivos enormes): os lotes anteriores ao erro ficam gravados
+            raise CommandError(f'{e} Importação interrompida; já gravado: {describe_result(e.result)}')
+
+        self.stdout.write(self.style.SUCCESS(f'{site.domain}: {describe_result(result)}'))
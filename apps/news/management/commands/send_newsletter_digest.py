@@ -0,0 +1,48 @@
+"""
+Envia o resumo da newsletter para os sites configurados em modo digest.
+
+Agendar via cron (ex: de hora em hora); cada site só recebe um novo resumo
+depois de newsletter_digest_interval_hours desde o anterior:
+
+    0 * * * * python manage.py send_newsletter_digest
+"""
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand
+
+from apps.common.models import SiteExtension
+from apps.news.newsletter import digest_is_due, send_newsletter_digest
+
+
+class Command(BaseCommand):
+    help = 'Envia o resumo da newsletter (artigos publicados desde o último resumo) por site.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--site', type=int, help='ID do site (padrão: todos em modo resumo).')
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Ignora o intervalo configurado e envia os artigos pendentes agora.',
+        )
+
+    def handle(self, *args, **options):
+        sites = Site.objects.filter(
+            extension__newsletter_mode=SiteExtension.NewsletterMode.DIGEST,
+        ).select_related('extension')
+        if options['site']:
+            sites = sites.filter(pk=options['site'])
+
+        for site in sites:
+            if not options['force'] and not digest_is_due(site):
+                self.stdout.write(f'{site.domain}: intervalo ainda não atingido.')
+                continue
+            try:
+                digest = send_newsletter_digest(site)
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f'{site.domain}: resumo não enviado: {e}'))
+                continue
+            if digest is None:
+                self.stdout.write(f'{site.domain}: nenhum artigo novo.')
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f'{site.domain}: resumo com {digest.articles.count()} artigo(s) enviado para '
+                f'{digest.sent_count} inscrito(s) ({digest.failed_count} falha(s)).'
+            ))
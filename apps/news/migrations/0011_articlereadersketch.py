@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0010_newsletter_sent_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleReaderSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('registers', models.BinaryField(verbose_name='Registradores')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reader_sketches', to='news.article', verbose_name='Artigo')),
+            ],
+            options={
+                'verbose_name': 'Leitores únicos (dia)',
+                'verbose_name_plural': 'Leitores únicos (dias)',
+                'indexes': [models.Index(fields=['date'], name='news_readersketch_date_idx')],
+                'unique_together': {('article', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def remove_duplicate_user_likes(apps, schema_editor):
+    """
+    O unique_together antigo incluía ip_address/session_key (nuláveis), então
+    nunca deduplicou curtidas do mesmo usuário. Mantém a curtida mais antiga
+    de cada par (artigo, usuário) antes de criar a constraint.
+    """
+    ArticleLike = apps.get_model('news', 'ArticleLike')
+    keep_ids = (
+        ArticleLike.objects.filter(user__isnull=False)
+        .values('article', 'user')
+        .annotate(keep_id=models.Min('id'))
+        .values('keep_id')
+    )
+    ArticleLike.objects.filter(user__isnull=False).exclude(id__in=keep_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0011_articlereadersketch'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_user_likes,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AlterUniqueTogether(
+            name='articlelike',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='articlelike',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('article', 'user'), name='news_articlelike_unique_user'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0012_articlelike_unique_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['article', 'is_active', 'created_at'], name='news_comment_thread_idx'),
+        ),
+    ]
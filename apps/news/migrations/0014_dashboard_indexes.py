@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0013_comment_thread_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articlebookmark',
+            index=models.Index(fields=['user', 'created_at'], name='news_bookmark_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articlelike',
+            index=models.Index(fields=['user', 'created_at'], name='news_articlelike_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['user', 'created_at'], name='news_comment_user_idx'),
+        ),
+    ]
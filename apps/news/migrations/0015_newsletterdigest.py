@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0014_dashboard_indexes'),
+        ('sites', '0002_alter_domain_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsletterDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sent_at', models.DateTimeField(auto_now_add=True, verbose_name='Enviado em')),
+                ('sent_count', models.PositiveIntegerField(default=0, verbose_name='E-mails enviados')),
+                ('failed_count', models.PositiveIntegerField(default=0, verbose_name='Falhas')),
+                ('articles', models.ManyToManyField(related_name='newsletter_digests', to='news.article', verbose_name='Artigos')),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='newsletter_digests', to='sites.site', verbose_name='Site')),
+            ],
+            options={
+                'verbose_name': 'Resumo da Newsletter',
+                'verbose_name_plural': 'Resumos da Newsletter',
+                'ordering': ['-sent_at'],
+                'get_latest_by': 'sent_at',
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0015_newsletterdigest'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsletterJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Na fila'), ('running', 'Enviando'), ('done', 'Concluído'), ('failed', 'Falhou')], default='pending', max_length=20, verbose_name='Status')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total de e-mails')),
+                ('sent_count', models.PositiveIntegerField(default=0, verbose_name='Enviados')),
+                ('failed_count', models.PositiveIntegerField(default=0, verbose_name='Falhas')),
+                ('error', models.TextField(blank=True, verbose_name='Erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+                ('articles', models.ManyToManyField(related_name='newsletter_jobs', to='news.article', verbose_name='Artigos')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='newsletter_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Criado por')),
+            ],
+            options={
+                'verbose_name': 'Envio da Newsletter',
+                'verbose_name_plural': 'Envios da Newsletter',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+from apps.common.search import postgres_search_indexes, search_vector
+
+
+class Migration(migrations.Migration):
+    """Índices de busca do admin (somente PostgreSQL, criados com CONCURRENTLY)."""
+
+    atomic = False
+
+    dependencies = [
+        ('news', '0016_newsletterjob'),
+    ]
+
+    operations = [
+        postgres_search_indexes('news', 'article', [
+            django.contrib.postgres.indexes.GinIndex(
+                search_vector('title', 'excerpt', 'content'), name='news_article_search_idx',
+            ),
+            django.contrib.postgres.indexes.GinIndex(
+                fields=['title'], opclasses=['gin_trgm_ops'], name='news_article_title_trgm',
+            ),
+        ]),
+        postgres_search_indexes('news', 'comment', [
+            django.contrib.postgres.indexes.GinIndex(
+                fields=['content'], opclasses=['gin_trgm_ops'], name='news_comment_content_trgm',
+            ),
+        ]),
+    ]
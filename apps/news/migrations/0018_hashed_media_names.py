@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:30
+
+import apps.common.files
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0017_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='article',
+            name='featured_image',
+            field=models.ImageField(blank=True, help_text='Imagem principal que aparece no topo do artigo.', storage=apps.common.files.ContentAddressedStorage(), upload_to='news/articles/', verbose_name='Imagem de capa'),
+        ),
+    ]
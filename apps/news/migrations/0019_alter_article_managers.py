@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:41
+
+import apps.common.sites
+import django.db.models.manager
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0018_hashed_media_names'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='article',
+            managers=[
+                ('objects', django.db.models.manager.Manager()),
+                ('on_site', apps.common.sites.CurrentSiteManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+from apps.common.search import postgres_search_indexes, trigram_index
+
+
+class Migration(migrations.Migration):
+    """Trigram sobre UPPER(...) (expressão do icontains) em título de artigo e comentário."""
+
+    atomic = False
+
+    dependencies = [
+        ('news', '0019_alter_article_managers'),
+    ]
+
+    operations = [
+        postgres_search_indexes('news', 'article', [
+            trigram_index('title', name='news_article_title_upper_trgm'),
+        ], replaces=[
+            django.contrib.postgres.indexes.GinIndex(
+                fields=['title'], opclasses=['gin_trgm_ops'], name='news_article_title_trgm',
+            ),
+        ]),
+        postgres_search_indexes('news', 'comment', [
+            trigram_index('content', name='news_comment_text_upper_trgm'),
+        ], replaces=[
+            django.contrib.postgres.indexes.GinIndex(
+                fields=['content'], opclasses=['gin_trgm_ops'], name='news_comment_content_trgm',
+            ),
+        ]),
+    ]
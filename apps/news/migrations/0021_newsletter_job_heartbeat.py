@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0020_search_trgm_upper'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsletterjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='Atualizado a cada gravação de progresso do envio.', null=True, verbose_name='Último progresso'),
+        ),
+    ]
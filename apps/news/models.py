@@ -1,12 +1,13 @@
 import re
 
 from django.conf import settings
-from django.contrib.sites.managers import CurrentSiteManager
 from django.contrib.sites.models import Site
 from django.db import models
 from django.urls import reverse
 
+from apps.common.files import hashed_storage
 from apps.common.models import SEOModel, TimeStampedModel
+from apps.common.sites import CurrentSiteManager
 
 
 class Category(TimeStampedModel):
@@ -52,7 +53,7 @@ class Article(TimeStampedModel, SEOModel):
     slug = models.SlugField('URL amigável', max_length=200, unique=True, help_text='Gerado automaticamente a partir do título.')
     excerpt = models.TextField('Resumo', blank=True, help_text='Resumo curto do artigo. Aparece nas listagens e compartilhamentos.')
     content = models.TextField('Conteúdo')
-    featured_image = models.ImageField('Imagem de capa', upload_to='news/articles/', blank=True, help_text='Imagem principal que aparece no topo do artigo.')
+    featured_image = models.ImageField('Imagem de capa', upload_to='news/articles/', storage=hashed_storage, blank=True, help_text='Imagem principal que aparece no topo do artigo.')
     featured_image_caption = models.CharField('Legenda da imagem', max_length=255, blank=True, help_text='Texto descritivo exibido abaixo da imagem de capa.')
     category = models.ForeignKey(
         Category, on_delete=models.SET_NULL, null=True,
@@ -157,7 +158,18 @@ class ArticleLike(TimeStampedModel):
     class Meta:
         verbose_name = 'Curtida'
         verbose_name_plural = 'Curtidas'
-        unique_together = [['article', 'ip_address', 'session_key', 'user']]
+        constraints = [
+            # Parcial: ip_address/session_key são nulos e não participam da unicidade
+            models.UniqueConstraint(
+                fields=['article', 'user'],
+                condition=models.Q(user__isnull=False),
+                name='news_articlelike_unique_user',
+            ),
+        ]
+        indexes = [
+            # Aba "Curtidos" do dashboard, paginada por cursor
+            models.Index(fields=['user', 'created_at'], name='news_articlelike_user_idx'),
+        ]
 
     def __str__(self):
         return f'Curtida em {self.article.title}'
@@ -182,6 +194,12 @@ class Comment(TimeStampedModel):
         ordering = ['-created_at']
         verbose_name = 'Comentário'
         verbose_name_plural = 'Comentários'
+        indexes = [
+            # Thread paginada por cursor: article + is_active filtram, created_at ordena
+            models.Index(fields=['article', 'is_active', 'created_at'], name='news_comment_thread_idx'),
+            # Aba "Comentários" do dashboard, paginada por cursor
+            models.Index(fields=['user', 'created_at'], name='news_comment_user_idx'),
+        ]
 
     def __str__(self):
         return f'{self.user} em {self.article.title}'
@@ -201,6 +219,116 @@ class ArticleBookmark(TimeStampedModel):
         verbose_name = 'Favorito'
         verbose_name_plural = 'Favoritos'
         unique_together = [['article', 'user']]
+        indexes = [
+            # Aba "Salvos" do dashboard, paginada por cursor
+            models.Index(fields=['user', 'created_at'], name='news_bookmark_user_idx'),
+        ]
 
     def __str__(self):
         return f'{self.user} favoritou {self.article.title}'
+
+
+class ArticleReaderSketch(models.Model):
+    """Sketch HyperLogLog diário de leitores únicos de um artigo (tamanho fixo: 1 KB)."""
+
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE,
+        related_name='reader_sketches', verbose_name='Artigo',
+    )
+    date = models.DateField('Data')
+    registers = models.BinaryField('Registradores', editable=False)
+
+    class Meta:
+        verbose_name = 'Leitores únicos (dia)'
+        verbose_name_plural = 'Leitores únicos (dias)'
+        unique_together = [['article', 'date']]
+        indexes = [models.Index(fields=['date'], name='news_readersketch_date_idx')]
+
+    def __str__(self):
+        return f'Leitores de {self.article_id} em {self.date:%d/%m/%Y}'
+
+
+class NewsletterDigest(models.Model):
+    """Resumo da newsletter enviado para um site e os artigos que ele incluiu."""
+
+    site = models.ForeignKey(
+        Site, on_delete=models.CASCADE,
+        related_name='newsletter_digests', verbose_name='Site',
+    )
+    articles = models.ManyToManyField(
+        Article, related_name='newsletter_digests', verbose_name='Artigos',
+    )
+    sent_at = models.DateTimeField('Enviado em', auto_now_add=True)
+    sent_count = models.PositiveIntegerField('E-mails enviados', default=0)
+    failed_count = models.PositiveIntegerField('Falhas', default=0)
+
+    class Meta:
+        ordering = ['-sent_at']
+        get_latest_by = 'sent_at'
+        verbose_name = 'Resumo da Newsletter'
+        verbose_name_plural = 'Resumos da Newsletter'
+
+    def __str__(self):
+        return f'Resumo de {self.site.name} em {self.sent_at:%d/%m/%Y %H:%M}'
+
+
+class NewsletterJob(models.Model):
+    """Envio da newsletter disparado pelo admin, executado em segundo plano."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Na fila'
+        RUNNING = 'running', 'Enviando'
+        DONE = 'done', 'Concluído'
+        FAILED = 'failed', 'Falhou'
+
+    articles = models.ManyToManyField(
+        Article, related_name='newsletter_jobs', verbose_name='Artigos',
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='newsletter_jobs', verbose_name='Criado por',
+    )
+    status = models.CharField('Status', max_length=20, choices=Status.choices, default=Status.PENDING)
+    total = models.PositiveIntegerField('Total de e-mails', default=0)
+    sent_count = models.PositiveIntegerField('Enviados', default=0)
+    failed_count = models.PositiveIntegerField('Falhas', default=0)
+    error = models.TextField('Erro', blank=True)
+    created_at = models.DateTimeField('Criado em', auto_now_add=True)
+    started_at = models.DateTimeField('Iniciado em', null=True, blank=True)
+    finished_at = models.DateTimeField('Concluído em', null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        'Último progresso', null=True, blank=True,
+        help_text='Atualizado a cada gravação de progresso do envio.',
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Envio da Newsletter'
+        verbose_name_plural = 'Envios da Newsletter'
+
+    def __str__(self):
+        return f'Envio #{self.pk} ({self.get_status_display()})'
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.DONE, self.Status.FAILED)
+
+    @property
+    def remaining(self):
+        return max(self.total - self.sent_count - self.failed_count, 0)
+
+    @property
+    def percent(self):
+        if not self.total:
+            return 100 if self.is_finished else 0
+        return round(100 * (self.sent_count + self.failed_count) / self.total)
+
+    @property
+    def throughput(self):
+        """E-mails processados por segundo desde o início do envio."""
+        from django.utils import timezone
+
+        if self.started_at is None:
+            return 0
+        elapsed = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        return round((self.sent_count + self.failed_count) / elapsed, 1) if elapsed > 0 else 0
@@ -1,11 +1,18 @@
 import logging
+import time
+from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Count, F
 from django.template.loader import render_to_string
+from django.utils import timezone
 from django.utils.html import strip_tags
 
-from .models import NewsletterSubscription
+from apps.common.sites import get_site_settings
+
+from .models import Article, NewsletterDigest, NewsletterJob, NewsletterSubscription
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +28,7 @@ def get_newsletter_context(article, site=None, request=None):
                  deixar None — usa site.domain configurado no banco.
     """
     site = site or article.site
-
-    try:
-        site_settings = site.extension
-    except AttributeError:
-        # SiteExtension não existe para este site (OneToOneField não encontrado)
-        site_settings = None
+    site_settings = get_site_settings(site)
 
     if request is not None:
         # Preview no admin: usa URL real do servidor para links clicáveis
@@ -61,7 +63,7 @@ def get_from_email(site_settings):
     return getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@localhost')
 
 
-def send_article_newsletter(article, site=None):
+def send_article_newsletter(article, site=None, on_progress=None):
     """
     Envia email de newsletter para todos os inscritos ativos
     notificando sobre um novo artigo publicado.
@@ -69,13 +71,12 @@ def send_article_newsletter(article, site=None):
     Args:
         article: instancia de Article (deve estar publicado)
         site: instancia de Site (opcional, usa o site do artigo)
+        on_progress: callable(ok: bool) chamado após cada email (ex: NewsletterJob)
 
     Returns:
         int: numero de emails enviados com sucesso
     """
-    from .models import Article as ArticleModel
-
-    if article.status != ArticleModel.Status.PUBLISHED:
+    if article.status != Article.Status.PUBLISHED:
         logger.warning(
             'Newsletter: artigo pk=%s não está publicado (status=%s) — envio cancelado',
             article.pk, article.status,
@@ -114,12 +115,217 @@ def send_article_newsletter(article, site=None):
             msg.attach_alternative(html_content, 'text/html')
             msg.send(fail_silently=False)
             sent_count += 1
+            ok = True
         except Exception as e:
             failed_count += 1
+            ok = False
             logger.error('Newsletter: falha ao enviar para %s: %s', email, e)
+        if on_progress is not None:
+            on_progress(ok)
 
     logger.info(
         'Newsletter enviada: %d sucesso, %d falhas (artigo: %s)',
         sent_count, failed_count, article.title,
     )
     return sent_count
+
+
+def uses_digest(site):
+    """True se o site agrupa os artigos em resumos periódicos em vez de um e-mail por artigo."""
+    from apps.common.models import SiteExtension
+
+    site_settings = get_site_settings(site)
+    return site_settings is not None and site_settings.newsletter_mode == SiteExtension.NewsletterMode.DIGEST
+
+
+def pending_digest_articles(site):
+    """Artigos publicados do site que ainda não saíram em newsletter nem em resumo."""
+    return Article.objects.filter(
+        site=site,
+        status=Article.Status.PUBLISHED,
+        published_at__lte=timezone.now(),
+        newsletter_sent_at__isnull=True,
+    ).select_related('category', 'author').order_by('-published_at')
+
+
+def digest_is_due(site, now=None):
+    """True se já passou o intervalo configurado desde o último resumo do site."""
+    site_settings = get_site_settings(site)
+    last = NewsletterDigest.objects.filter(site=site).values_list('sent_at', flat=True).first()
+    if last is None or site_settings is None:
+        return True
+    interval = timedelta(hours=site_settings.newsletter_digest_interval_hours)
+    return (now or timezone.now()) - last >= interval
+
+
+def send_newsletter_digest(site):
+    """
+    Envia um único e-mail com todos os artigos pendentes do site.
+
+    A conexão SMTP é aberta antes de reservar os artigos (newsletter_sent_at +
+    NewsletterDigest.articles, numa transação): servidor fora do ar não marca
+    nada como enviado, e execuções concorrentes do comando não incluem o mesmo
+    artigo em dois resumos. O template é renderizado uma vez e todos os
+    e-mails saem pela mesma conexão. Se todos os envios falharem, a reserva é
+    desfeita e os artigos voltam para o próximo resumo.
+
+    Returns:
+        NewsletterDigest ou None se não havia artigos pendentes.
+
+    Raises:
+        Exceção do backend de e-mail ao abrir a conexão, ou RuntimeError se
+        nenhum e-mail foi enviado (artigos liberados).
+    """
+    with get_connection() as connection:
+        with transaction.atomic():
+            articles = list(pending_digest_articles(site).select_for_update(of=('self',)))
+            if not articles:
+                return None
+            digest = NewsletterDigest.objects.create(site=site)
+            digest.articles.set(articles)
+            Article.objects.filter(pk__in=[a.pk for a in articles]).update(newsletter_sent_at=digest.sent_at)
+
+        context = get_newsletter_context(articles[0], site)
+        context.update(articles=articles, digest=digest)
+        subject = f'Resumo {site.name}: {len(articles)} novo(s) artigo(s)'
+        html_content = render_to_string('news/email/newsletter_digest.html', context)
+        text_content = strip_tags(html_content)
+        from_email = get_from_email(context.get('site_settings'))
+
+        subscribers = NewsletterSubscription.objects.filter(
+            site=site, is_active=True,
+        ).values_list('email', flat=True)
+
+        sent_count = failed_count = 0
+        for email in subscribers.iterator():
+            msg = EmailMultiAlternatives(
+                subject=subject, body=text_content, from_email=from_email,
+                to=[email], connection=connection,
+            )
+            msg.attach_alternative(html_content, 'text/html')
+            try:
+                msg.send(fail_silently=False)
+                sent_count += 1
+            except Exception as e:
+                failed_count += 1
+                logger.error('Newsletter (resumo): falha ao enviar para %s: %s', email, e)
+
+    if failed_count and not sent_count:
+        with transaction.atomic():
+            Article.objects.filter(
+                pk__in=[a.pk for a in articles], newsletter_sent_at=digest.sent_at,
+            ).update(newsletter_sent_at=None)
+            digest.delete()
+        raise RuntimeError(
+            f'Nenhum e-mail do resumo foi enviado ({failed_count} falha(s)); '
+            f'{len(articles)} artigo(s) liberado(s) para o próximo resumo.'
+        )
+
+    NewsletterDigest.objects.filter(pk=digest.pk).update(sent_count=sent_count, failed_count=failed_count)
+    digest.sent_count, digest.failed_count = sent_count, failed_count
+    logger.info(
+        'Resumo enviado: %d sucesso, %d falhas, %d artigo(s) (site: %s)',
+        sent_count, failed_count, len(articles), site.domain,
+    )
+    return digest
+
+
+JOB_FLUSH_SECONDS = 1.0
+# Sem progresso por esse tempo, o job RUNNING morreu com o worker (restart/deploy)
+JOB_STALE_AFTER = timedelta(minutes=5)
+
+
+def create_newsletter_job(articles, user=None):
+    """Cria o NewsletterJob com o total de e-mails previsto (um COUNT agrupado por site)."""
+    articles = list(articles)
+    per_site = dict(
+        NewsletterSubscription.objects.filter(
+            is_active=True, site__in={a.site_id for a in articles},
+        ).values_list('site').annotate(total=Count('pk'))
+    )
+    job = NewsletterJob.objects.create(
+        created_by=user,
+        total=sum(per_site.get(a.site_id, 0) for a in articles),
+    )
+    job.articles.set(articles)
+    return job
+
+
+def run_newsletter_job(job_id):
+    """
+    Executa o envio de um NewsletterJob (chamado em segundo plano via apps.common.tasks).
+
+    Os contadores são acumulados em memória e gravados com F() no máximo uma
+    vez por JOB_FLUSH_SECONDS, para a página de progresso não custar um UPDATE
+    por e-mail.
+    """
+    claimed = NewsletterJob.objects.filter(pk=job_id, status=NewsletterJob.Status.PENDING).update(
+        status=NewsletterJob.Status.RUNNING, started_at=timezone.now(), heartbeat_at=timezone.now(),
+    )
+    if not claimed:
+        logger.warning('Newsletter: job %s não está mais na fila; envio ignorado.', job_id)
+        return
+
+    pending = {'sent': 0, 'failed': 0, 'flushed_at': time.monotonic()}
+
+    def flush():
+        if pending['sent'] or pending['failed']:
+            NewsletterJob.objects.filter(pk=job_id).update(
+                sent_count=F('sent_count') + pending['sent'],
+                failed_count=F('failed_count') + pending['failed'],
+                heartbeat_at=timezone.now(),
+            )
+        pending.update(sent=0, failed=0, flushed_at=time.monotonic())
+
+    def on_progress(ok):
+        pending['sent' if ok else 'failed'] += 1
+        if time.monotonic() - pending['flushed_at'] >= JOB_FLUSH_SECONDS:
+            flush()
+
+    job = NewsletterJob.objects.get(pk=job_id)
+    articles = job.articles.filter(status=Article.Status.PUBLISHED).select_related('site', 'category', 'author')
+    try:
+        for article in articles:
+            send_article_newsletter(article, on_progress=on_progress)
+    except Exception as e:
+        flush()
+        NewsletterJob.objects.filter(pk=job_id, status=NewsletterJob.Status.RUNNING).update(
+            status=NewsletterJob.Status.FAILED, error=str(e), finished_at=timezone.now(),
+        )
+        raise
+    flush()
+    # Filtrado por RUNNING: não sobrescreve o FAILED de fail_stale_newsletter_job
+    NewsletterJob.objects.filter(pk=job_id, status=NewsletterJob.Status.RUNNING).update(
+        status=NewsletterJob.Status.DONE, finished_at=timezone.now(),
+    )
+
+
+def fail_stale_newsletter_job(job, now=None):
+    """
+    Marca como FAILED o job RUNNING sem progresso (heartbeat_at) há JOB_STALE_AFTER.
+
+    O pool de apps.common.tasks morre com o processo: sem isso, um job
+    interrompido ficaria "Enviando" para sempre e a página de progresso
+    continuaria consultando o servidor. Jobs PENDING não expiram: o pool tem
+    poucas threads, divididas com extração de currículos e prévias, e um job
+    pode esperar na fila por minutos sem estar perdido. O UPDATE condicional
+    (RUNNING e mesmo heartbeat) não derruba um job que progrediu desde a leitura.
+
+    Returns:
+        True se o job foi marcado (job é recarregado do banco).
+    """
+    if job.status != NewsletterJob.Status.RUNNING or job.heartbeat_at is None:
+        return False
+    now = now or timezone.now()
+    if now - job.heartbeat_at < JOB_STALE_AFTER:
+        return False
+    marked = NewsletterJob.objects.filter(
+        pk=job.pk, status=NewsletterJob.Status.RUNNING, heartbeat_at=job.heartbeat_at,
+    ).update(
+        status=NewsletterJob.Status.FAILED, finished_at=now,
+        error='Envio interrompido (o processo foi reiniciado?). Os e-mails já enviados não são reenviados '
+              'automaticamente; confira os contadores antes de disparar de novo.',
+    )
+    if marked:
+        job.refresh_from_db()
+    return bool(marked)
@@ -0,0 +1,115 @@
+"""
+Leitores únicos por artigo e por dia via HyperLogLog.
+
+Cada visitante vira um hash de 64 bits (HMAC com SECRET_KEY — o identificador
+cru nunca é persistido) que atualiza um registrador do sketch diário do artigo.
+Consultas por intervalo fazem o merge dos sketches em memória.
+
+A maioria das visitas não aumenta nenhum registrador: record_reader lê o
+sketch sem lock e só trava a linha (select_for_update) quando vai gravar.
+
+Usado por:
+- apps/news/views.py (article_detail)
+- apps/news/admin.py (leitores únicos por intervalo no artigo)
+- apps/common/dashboard.py (card de leitores únicos)
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from apps.common.hyperloglog import REGISTER_COUNT, HyperLogLog
+from apps.common.utils import get_client_ip
+
+from .models import ArticleReaderSketch
+
+
+def visitor_hash(request):
+    """Hash estável de 64 bits do visitante: usuário autenticado ou IP + User-Agent."""
+    if request.user.is_authenticated:
+        identifier = f'user:{request.user.pk}'
+    else:
+        identifier = f"anon:{get_client_ip(request)}:{request.META.get('HTTP_USER_AGENT', '')}"
+    digest = salted_hmac('apps.news.readers', identifier).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def record_reader(article, request):
+    """Registra o visitante no sketch do dia. Só trava e grava se o registrador aumentar."""
+    index, rank = HyperLogLog.position(visitor_hash(request))
+    today = timezone.localdate()
+    current = ArticleReaderSketch.objects.filter(article=article, date=today).values_list(
+        'registers', flat=True,
+    ).first()
+    if current is not None and current[index] >= rank:
+        return
+
+    with transaction.atomic():
+        sketch, _ = ArticleReaderSketch.objects.select_for_update().get_or_create(
+            article=article,
+            date=today,
+            defaults={'registers': bytes(REGISTER_COUNT)},
+        )
+        registers = bytearray(sketch.registers)
+        if registers[index] >= rank:
+            return
+        registers[index] = rank
+        ArticleReaderSketch.objects.filter(pk=sketch.pk).update(registers=bytes(registers))
+
+
+def unique_readers(start, end, article=None, site=None):
+    """Estimativa de leitores únicos entre start e end (datas inclusivas).
+
+    Filtra por um artigo específico ou por todos os artigos de um site.
+    """
+    sketches = ArticleReaderSketch.objects.filter(date__range=(start, end))
+    if article is not None:
+        sketches = sketches.filter(article=article)
+    if site is not None:
+        sketches = sketches.filter(article__site=site)
+
+    merged = HyperLogLog()
+    for registers in sketches.values_list('registers', flat=True).iterator(chunk_size=500):
+        merged.merge(registers)
+    return merged.count()
+
+
+READER_RANGE_DEFAULT_DAYS = 30
+READER_RANGE_CACHE_TIMEOUT = 600
+
+
+def reader_range_context(params=None, article=None):
+    """
+    Contexto do fragmento admin/news/partials/unique_readers.html.
+
+    params (request.GET) pode trazer start/end; sem eles, os últimos
+    READER_RANGE_DEFAULT_DAYS dias. Sem artigo (card do painel), a soma de
+    todos os artigos é cacheada por intervalo.
+    """
+    from .forms import ReaderRangeForm
+
+    today = timezone.localdate()
+    data = {'start': today - timedelta(days=READER_RANGE_DEFAULT_DAYS - 1), 'end': today}
+    data.update({key: params[key] for key in ('start', 'end') if params and params.get(key)})
+    form = ReaderRangeForm(data)
+
+    count = None
+    if form.is_valid():
+        start, end = form.cleaned_data['start'], form.cleaned_data['end']
+        if article is not None:
+            count = unique_readers(start, end, article=article)
+        else:
+            count = cache.get_or_set(
+                f'dashboard:unique_readers:{start}:{end}',
+                lambda: unique_readers(start, end),
+                timeout=READER_RANGE_CACHE_TIMEOUT,
+            )
+    url = reverse('admin:news_article_unique_readers')
+    return {
+        'readers_form': form,
+        'readers_count': count,
+        'readers_url': f'{url}?article={article.pk}' if article is not None else url,
+    }
@@ -17,6 +17,8 @@ def auto_send_newsletter_on_publish(sender, instance, **kwargs):
     Guards:
     - Só dispara se status == PUBLISHED (ignora rascunhos/arquivados)
     - Só dispara se newsletter_sent_at is None (idempotência: evita reenvio)
+    - Sites em modo resumo não enviam aqui: o artigo fica pendente para o
+      próximo send_newsletter_digest
     - Usa .update() para marcar newsletter_sent_at sem disparar post_save novamente
     """
     if instance.status != Article.Status.PUBLISHED:
@@ -25,7 +27,10 @@ def auto_send_newsletter_on_publish(sender, instance, **kwargs):
     if instance.newsletter_sent_at is not None:
         return  # Já enviado — re-salvar artigo publicado não reenvia newsletter
 
-    from .newsletter import send_article_newsletter
+    from .newsletter import send_article_newsletter, uses_digest
+
+    if uses_digest(instance.site):
+        return
 
     try:
         sent = send_article_newsletter(instance)
@@ -1,7 +1,9 @@
-from django.contrib.sitemaps import Sitemap
+from apps.common.sitemaps import CurrentSiteSitemap
+
 from .models import Article
 
-class ArticleSitemap(Sitemap):
+
+class ArticleSitemap(CurrentSiteSitemap):
     changefreq = "weekly"
     priority = 0.8
 
@@ -0,0 +1,149 @@
+"""
+Importação em massa de inscritos da newsletter a partir de CSV.
+
+O arquivo é lido em streaming e processado em lotes: memória constante
+mesmo para milhões de linhas. Cada lote custa uma consulta dos e-mails já
+existentes, um UPDATE para reativar e um INSERT em massa. Se o unique
+(email, site) acusar corrida com outra importação ou inscrição, o lote é
+refeito um a um (get_or_create), para a contagem de inseridos ser exata.
+
+Usado por:
+- apps/news/management/commands/import_subscribers.py
+- apps/news/admin.py (upload em NewsletterSubscriptionAdmin)
+"""
+import csv
+from itertools import islice
+
+from django.contrib.auth.base_user import BaseUserManager
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from .models import NewsletterSubscription
+
+IMPORT_BATCH_SIZE = 1000
+EMAIL_HEADERS = {'email', 'e-mail', 'email address', 'endereço de e-mail'}
+
+
+def normalize_email(value):
+    """Remove espaços, 'mailto:' e <>; domínio em minúsculas. Retorna None se inválido."""
+    value = value.strip().strip('<>').strip()
+    if value.lower().startswith('mailto:'):
+        value = value[7:]
+    email = BaseUserManager.normalize_email(value)
+    try:
+        validate_email(email)
+    except ValidationError:
+        return None
+    return email
+
+
+def _email_column(rows):
+    """Descobre a coluna de e-mail pelo cabeçalho; sem cabeçalho, usa a primeira."""
+    first = next(rows, None)
+    if first is None:
+        return 0, iter(())
+    for index, cell in enumerate(first):
+        if cell.strip().lower() in EMAIL_HEADERS:
+            return index, rows
+    return 0, _prepend(first, rows)
+
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+
+class SubscriberImportError(Exception):
+    """CSV ilegível no meio da importação; result traz o que os lotes anteriores já gravaram."""
+
+    def __init__(self, message, result):
+        super().__init__(message)
+        self.result = result
+
+
+def import_subscribers(file, site, reactivate=True, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Importa os e-mails de um CSV (arquivo texto já aberto) para o site.
+
+    Cada lote é gravado ao ser processado: para tudo ou nada, chame dentro
+    de transaction.atomic() (como o admin faz).
+
+    Args:
+        reactivate: reativa inscrições canceladas que aparecem no arquivo
+
+    Returns:
+        dict com inserted, reactivated, existing, inactive, duplicates e
+        invalid, que somam o número de linhas. inactive são inscrições
+        canceladas mantidas assim (reactivate=False); duplicates conta
+        e-mails repetidos dentro do lote (repetições em lotes diferentes já
+        estão no banco e contam em existing).
+
+    Raises:
+        SubscriberImportError: arquivo fora de UTF-8 ou CSV malformado (ex.:
+            campo acima de csv.field_size_limit()).
+    """
+    result = {'inserted': 0, 'reactivated': 0, 'existing': 0, 'inactive': 0, 'duplicates': 0, 'invalid': 0}
+    reader = csv.reader(file)
+    try:
+        column, rows = _email_column(reader)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            _import_batch(batch, column, site, reactivate, result)
+    except UnicodeDecodeError as e:
+        raise SubscriberImportError('O arquivo precisa estar em UTF-8.', result) from e
+    except csv.Error as e:
+        raise SubscriberImportError(f'CSV inválido na linha {reader.line_num}: {e}', result) from e
+    return result
+
+
+def _import_batch(batch, column, site, reactivate, result):
+    emails = set()
+    for row in batch:
+        email = normalize_email(row[column]) if len(row) > column else None
+        if email is None:
+            result['invalid'] += 1
+        elif email in emails:
+            result['duplicates'] += 1
+        else:
+            emails.add(email)
+    if not emails:
+        return
+
+    current = dict(
+        NewsletterSubscription.objects.filter(site=site, email__in=emails).values_list('email', 'is_active')
+    )
+    inactive = [email for email, is_active in current.items() if not is_active]
+    result['existing'] += len(current) - len(inactive)
+    if reactivate and inactive:
+        result['reactivated'] += NewsletterSubscription.objects.filter(
+            site=site, email__in=inactive,
+        ).update(is_active=True)
+    else:
+        result['inactive'] += len(inactive)
+
+    new = emails.difference(current)
+    if not new:
+        return
+    try:
+        with transaction.atomic():
+            NewsletterSubscription.objects.bulk_create(
+                [NewsletterSubscription(email=email, site=site) for email in new],
+            )
+        result['inserted'] += len(new)
+    except IntegrityError:
+        # Outro processo inscreveu algum desses e-mails desde a consulta acima: um a um, contando certo
+        for email in new:
+            _, created = NewsletterSubscription.objects.get_or_create(email=email, site=site)
+            result['inserted' if created else 'existing'] += 1
+
+
+def describe_result(result):
+    """Resumo legível do dict de import_subscribers (admin e comando)."""
+    return (
+        f'{result["inserted"]} inserido(s), {result["reactivated"]} reativado(s), '
+        f'{result["existing"]} já ativo(s), {result["inactive"]} cancelado(s) mantido(s), '
+        f'{result["duplicates"]} repetido(s), {result["invalid"]} inválido(s).'
+    )
@@ -1,9 +1,542 @@
+import io
+
 import pytest
+from django.db import connection
 from django.urls import reverse
 
+
+def _article(slug='artigo', title='Artigo', site=None, **fields):
+    from django.contrib.sites.models import Site
+
+    from .models import Article
+
+    fields.setdefault('content', '<p>Texto</p>')
+    fields.setdefault('status', Article.Status.PUBLISHED)
+    return Article.objects.create(title=title, slug=slug, site=site or Site.objects.get_current(), **fields)
+
+
 @pytest.mark.django_db
 def test_news_article_list(client):
     url = reverse('news:list')
     response = client.get(url)
     assert response.status_code == 200
     assert 'text/html' in response['Content-Type']
+
+
+@pytest.mark.django_db
+def test_article_detail_counts_view_once_without_session(client):
+    article = _article()
+    url = reverse('news:article_detail', kwargs={'slug': article.slug})
+    client.get(url)
+    client.get(url)
+
+    article.refresh_from_db()
+    assert article.view_count == 1
+    assert not client.session.keys()
+
+
+@pytest.mark.django_db
+def test_unique_readers_merges_daily_sketches(rf, admin_client, django_assert_num_queries):
+    from django.contrib.auth.models import AnonymousUser
+    from django.utils import timezone
+
+    from .readers import record_reader, unique_readers
+
+    article = _article()
+    for i in range(200):
+        request = rf.get('/', REMOTE_ADDR=f'10.0.{i // 250}.{i % 250}')
+        request.user = AnonymousUser()
+        record_reader(article, request)
+        with django_assert_num_queries(1):  # registrador já no máximo: só a leitura, sem lock
+            record_reader(article, request)
+
+    today = timezone.localdate()
+    assert abs(unique_readers(today, today, article=article) - 200) <= 20
+    assert article.reader_sketches.count() == 1
+
+    # Intervalo escolhido no admin (fragmento HTMX do artigo e do painel)
+    url = reverse('admin:news_article_unique_readers')
+    response = admin_client.get(url, {'article': article.pk, 'start': today.isoformat(), 'end': today.isoformat()})
+    assert response.context['readers_count'] == unique_readers(today, today, article=article)
+    response = admin_client.get(url, {'start': today.isoformat(), 'end': '2000-01-01'})
+    assert response.context['readers_count'] is None and 'data final' in response.content.decode()
+    for page in (reverse('admin:index'), reverse('admin:news_article_change', args=[article.pk])):
+        assert 'id="unique-readers"' in admin_client.get(page).content.decode()
+
+
+@pytest.mark.django_db
+def test_toggle_like_is_idempotent_per_user(client, django_user_model):
+    from .models import ArticleLike
+
+    user = django_user_model.objects.create_user('leitor', 'leitor@example.com', 'senha')
+    article = _article()
+    client.force_login(user)
+    url = reverse('news:toggle_like', kwargs={'article_id': article.pk})
+
+    response = client.post(url, HTTP_HX_REQUEST='true')
+    assert response.context['is_liked'] is True
+    assert response.context['like_count'] == 1
+
+    response = client.post(url, HTTP_HX_REQUEST='true')
+    assert response.context['is_liked'] is False
+    assert response.context['like_count'] == 0
+    assert not ArticleLike.objects.exists()
+
+
+@pytest.mark.django_db
+def test_newsletter_subscribe_reactivates_existing(client):
+    from django.contrib.sites.models import Site
+
+    from .models import NewsletterSubscription
+
+    NewsletterSubscription.objects.create(email='a@example.com', site=Site.objects.get_current(), is_active=False)
+    client.post(reverse('news:newsletter_subscribe'), {'email': 'a@example.com'})
+
+    subscription = NewsletterSubscription.objects.get()
+    assert subscription.is_active
+
+
+@pytest.mark.django_db
+def test_comment_thread_is_cursor_paginated(client, django_user_model):
+    from .models import Comment
+    from .views import COMMENTS_PER_PAGE
+
+    user = django_user_model.objects.create_user('leitor', 'leitor@example.com', 'senha')
+    article = _article()
+    Comment.objects.bulk_create(
+        Comment(article=article, user=user, content=f'Comentário {i}') for i in range(COMMENTS_PER_PAGE + 3)
+    )
+
+    response = client.get(reverse('news:article_detail', kwargs={'slug': article.slug}))
+    assert len(response.context['comments']) == COMMENTS_PER_PAGE
+    cursor = response.context['comments_cursor']
+    assert cursor
+
+    url = reverse('news:comment_list_page', kwargs={'article_id': article.pk})
+    response = client.get(url, {'after': cursor}, HTTP_HX_REQUEST='true')
+    assert len(response.context['comments']) == 3
+    assert response.context['next_cursor'] is None
+
+
+@pytest.mark.django_db
+def test_add_comment_returns_only_new_comment(client, django_user_model):
+    from .models import Comment
+
+    user = django_user_model.objects.create_user('leitor', 'leitor@example.com', 'senha')
+    article = _article()
+    Comment.objects.create(article=article, user=user, content='Antigo')
+    client.force_login(user)
+
+    response = client.post(
+        reverse('news:add_comment', kwargs={'article_id': article.pk}),
+        {'content': 'Novo'}, HTTP_HX_REQUEST='true',
+    )
+    body = response.content.decode()
+    assert 'hx-swap-oob="afterbegin:#comments-list"' in body
+    assert 'Novo' in body and 'Antigo' not in body
+    assert response.context['comment_count'] == 2
+    assert Comment.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_dashboard_tabs_are_lazy_and_cursor_paginated(client, django_user_model):
+    from django.contrib.sites.models import Site
+
+    from .models import Article, ArticleBookmark
+    from .views import DASHBOARD_PER_PAGE
+
+    user = django_user_model.objects.create_user('leitor', 'leitor@example.com', 'senha')
+    site = Site.objects.get_current()
+    articles = Article.objects.bulk_create(
+        Article(title=f'Artigo {i}', slug=f'artigo-{i}', content='<p>Texto</p>', site=site)
+        for i in range(DASHBOARD_PER_PAGE + 2)
+    )
+    ArticleBookmark.objects.bulk_create(ArticleBookmark(article=a, user=user) for a in articles)
+    client.force_login(user)
+
+    response = client.get(reverse('news:user_dashboard'))
+    assert response.context['tab_counts']['saved'] == DASHBOARD_PER_PAGE + 2
+    assert 'Artigo 0' not in response.content.decode()
+
+    url = reverse('news:dashboard_tab', kwargs={'tab': 'saved'})
+    response = client.get(url, HTTP_HX_REQUEST='true')
+    assert len(response.context['items']) == DASHBOARD_PER_PAGE
+    response = client.get(url, {'after': response.context['next_cursor']}, HTTP_HX_REQUEST='true')
+    assert len(response.context['items']) == 2
+    assert response.context['next_cursor'] is None
+
+    assert client.get(reverse('news:dashboard_tab', kwargs={'tab': 'outra'}), HTTP_HX_REQUEST='true').status_code == 404
+
+
+@pytest.mark.django_db
+def test_newsletter_digest_groups_articles_and_never_resends(settings, monkeypatch):
+    from django.contrib.sites.models import Site
+    from django.core import mail
+    from django.core.management import call_command
+
+    from apps.common.models import SiteExtension
+
+    from .models import Article, NewsletterDigest, NewsletterSubscription
+
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    site = Site.objects.get_current()
+    SiteExtension.objects.update_or_create(site=site, defaults={'newsletter_mode': SiteExtension.NewsletterMode.DIGEST})
+    NewsletterSubscription.objects.create(email='a@example.com', site=site)
+    NewsletterSubscription.objects.create(email='b@example.com', site=site)
+
+    for i in range(2):
+        _article(f'artigo-{i}', f'Artigo {i}')
+    assert mail.outbox == []  # modo resumo: publicar não dispara envio
+
+    # SMTP fora do ar (ao conectar ou em todos os envios): nada fica reservado
+    from django.core.mail.backends.locmem import EmailBackend
+
+    def smtp_down(*args, **kwargs):
+        raise OSError('SMTP fora do ar')
+
+    for method in ('open', 'send_messages'):
+        with monkeypatch.context() as patched:
+            patched.setattr(EmailBackend, method, smtp_down)
+            call_command('send_newsletter_digest', stdout=io.StringIO(), stderr=io.StringIO())
+        assert not NewsletterDigest.objects.exists()
+        assert Article.objects.filter(newsletter_sent_at__isnull=True).count() == 2
+
+    call_command('send_newsletter_digest', stdout=io.StringIO())
+    assert len(mail.outbox) == 2
+    assert 'Artigo 0' in mail.outbox[0].alternatives[0][0] and 'Artigo 1' in mail.outbox[0].alternatives[0][0]
+    digest = NewsletterDigest.objects.get()
+    assert digest.articles.count() == 2 and digest.sent_count == 2
+
+    call_command('send_newsletter_digest', '--force', stdout=io.StringIO())
+    assert len(mail.outbox) == 2
+    assert NewsletterDigest.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_send_newsletter_action_enqueues_job_and_reports_progress(admin_client, settings):
+    from django.contrib.sites.models import Site
+    from django.core import mail
+
+    from .models import NewsletterJob, NewsletterSubscription
+    from .newsletter import run_newsletter_job
+
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    site = Site.objects.get_current()
+    NewsletterSubscription.objects.bulk_create(
+        NewsletterSubscription(email=f'leitor{i}@example.com', site=site) for i in range(3)
+    )
+    article = _article()
+    mail.outbox.clear()
+
+    response = admin_client.post(reverse('admin:news_article_changelist'), {
+        'action': 'send_newsletter', '_selected_action': [article.pk],
+    })
+    job = NewsletterJob.objects.get()
+    assert response.status_code == 302
+    assert response['Location'] == reverse('admin:news_article_newsletter_job', args=[job.pk])
+    assert job.total == 3 and mail.outbox == []  # nada é enviado dentro da request
+
+    run_newsletter_job(job.pk)
+    job.refresh_from_db()
+    assert job.status == NewsletterJob.Status.DONE
+    assert (job.sent_count, job.failed_count, job.remaining) == (3, 0, 0)
+    assert len(mail.outbox) == 3
+
+    assert admin_client.get(response['Location']).status_code == 200
+    response = admin_client.get(response['Location'], HTTP_HX_REQUEST='true')
+    assert response.status_code == 200
+    assert 'hx-trigger' not in response.content.decode()
+
+    # Job cujo worker morreu (sem progresso há JOB_STALE_AFTER): falha e a página para de consultar
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from .newsletter import JOB_STALE_AFTER
+
+    stale = NewsletterJob.objects.create(status=NewsletterJob.Status.RUNNING, total=3)
+    NewsletterJob.objects.filter(pk=stale.pk).update(
+        heartbeat_at=timezone.now() - JOB_STALE_AFTER - timedelta(seconds=1),
+    )
+    url = reverse('admin:news_article_newsletter_job', args=[stale.pk])
+    assert 'hx-trigger' not in admin_client.get(url, HTTP_HX_REQUEST='true').content.decode()
+    stale.refresh_from_db()
+    assert stale.status == NewsletterJob.Status.FAILED and stale.finished_at
+
+    # Na fila há mais que JOB_STALE_AFTER (threads ocupadas): continua na fila e ainda é enviado
+    queued = NewsletterJob.objects.create(total=3)
+    queued.articles.set([article])
+    NewsletterJob.objects.filter(pk=queued.pk).update(created_at=timezone.now() - 2 * JOB_STALE_AFTER)
+    url = reverse('admin:news_article_newsletter_job', args=[queued.pk])
+    assert 'hx-trigger' in admin_client.get(url, HTTP_HX_REQUEST='true').content.decode()
+    run_newsletter_job(queued.pk)
+    queued.refresh_from_db()
+    assert queued.status == NewsletterJob.Status.DONE and len(mail.outbox) == 6
+
+
+@pytest.mark.django_db
+def test_import_subscribers_batches_and_reports_counts(tmp_path):
+    from django.contrib.sites.models import Site
+    from django.core.management import call_command
+
+    from .models import NewsletterSubscription
+
+    site = Site.objects.get_current()
+    NewsletterSubscription.objects.create(email='antigo@example.com', site=site, is_active=False)
+    NewsletterSubscription.objects.create(email='ativo@example.com', site=site)
+    path = tmp_path / 'lista.csv'
+    path.write_text(
+        'nome,E-mail\n'
+        'Ana, ana@EXAMPLE.com \n'
+        'Ana de novo,ana@example.com\n'
+        'Antigo,antigo@example.com\n'
+        'Ativo,ativo@example.com\n'
+        'Inválido,sem-arroba\n'
+        'Bia,<mailto:bia@example.com>\n',
+        encoding='utf-8',
+    )
+
+    out = io.StringIO()
+    call_command('import_subscribers', str(path), '--batch-size', '2', stdout=out)
+
+    # 6 linhas: o segundo ana@ está no mesmo lote do primeiro
+    assert (
+        '2 inserido(s), 1 reativado(s), 1 já ativo(s), 0 cancelado(s) mantido(s), 1 repetido(s), 1 inválido(s)'
+    ) in out.getvalue()
+    assert set(NewsletterSubscription.objects.filter(is_active=True).values_list('email', flat=True)) == {
+        'ana@example.com', 'antigo@example.com', 'ativo@example.com', 'bia@example.com',
+    }
+
+    # Sem reativar, cancelados são contados à parte (não como "já ativo")
+    NewsletterSubscription.objects.filter(email='antigo@example.com').update(is_active=False)
+    out = io.StringIO()
+    call_command('import_subscribers', str(path), '--no-reactivate', stdout=out)
+    assert '0 inserido(s), 0 reativado(s), 3 já ativo(s), 1 cancelado(s) mantido(s)' in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_csv_admin_reports_malformed_file_without_partial_import(admin_client):
+    from django.contrib.sites.models import Site
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    from .models import NewsletterSubscription
+
+    from .subscribers import IMPORT_BATCH_SIZE
+
+    # Campo acima de csv.field_size_limit() depois do primeiro lote: _csv.Error com um lote já processado
+    emails = ''.join(f'leitor{i}@example.com\n' for i in range(IMPORT_BATCH_SIZE))
+    content = f'email\n{emails}"' + 'x' * 200_000 + '"\n'
+    response = admin_client.post(reverse('admin:news_newslettersubscription_import_csv'), {
+        'file': SimpleUploadedFile('lista.csv', content.encode()),
+        'site': Site.objects.get_current().pk,
+        'reactivate': 'on',
+    })
+    assert response.status_code == 200
+    assert 'CSV inválido na linha' in response.content.decode()
+    assert not NewsletterSubscription.objects.exists()
+
+
+@pytest.mark.django_db
+def test_admin_changelist_queries_do_not_grow_with_rows(admin_client, django_user_model):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from .admin import ArticleAdmin
+    from .models import Article, Category
+
+    url = reverse('admin:news_article_changelist')
+
+    def create_articles(start, count):
+        for i in range(start, start + count):
+            category = Category.objects.create(name=f'Categoria {i}', slug=f'categoria-{i}')
+            author = django_user_model.objects.create_user(f'autor{i}', f'autor{i}@example.com', 'senha')
+            _article(f'artigo-{i}', f'Artigo {i}', category=category, author=author)
+
+    create_articles(0, 2)
+    admin_client.get(url)  # aquece caches da primeira request (site, content types)
+    with CaptureQueriesContext(connection) as few:
+        assert admin_client.get(url).status_code == 200
+    create_articles(2, 8)
+    with CaptureQueriesContext(connection) as many:
+        assert admin_client.get(url).status_code == 200
+
+    assert len(many) == len(few)
+    assert ArticleAdmin(Article, None).get_list_select_related(None) == ['category', 'author', 'site']
+
+
+@pytest.mark.django_db
+def test_estimated_paginator_uses_exact_count_when_estimate_misses_the_end():
+    from apps.common.admin_base import EstimatedCountPaginator
+
+    from .models import Article
+
+    class FixedEstimate(EstimatedCountPaginator):
+        estimate_threshold = 1
+
+        def _estimate(self):
+            return self.estimate
+
+    for i in range(7):
+        _article(f'artigo-{i}')
+
+    # Estimativa acima do real: página vazia vira a última página real
+    paginator = FixedEstimate(Article.objects.order_by('pk'), 5)
+    paginator.estimate = 50
+    assert paginator.num_pages == 10
+    page = paginator.page(8)
+    assert (page.number, len(page.object_list), paginator.count, paginator.num_pages) == (2, 2, 7, 2)
+
+    # Abaixo do real: página além da estimativa ainda existe
+    paginator = FixedEstimate(Article.objects.order_by('pk'), 5)
+    paginator.estimate = 3
+    assert len(paginator.page(2).object_list) == 2 and paginator.count == 7
+
+
+@pytest.mark.django_db
+def test_fulltext_admin_search_falls_back_to_like_outside_postgres(rf, admin_user):
+    from django.contrib.admin.sites import site as admin_site
+
+    from .models import Article
+
+    _article('feira', 'Feira de ciências', content='<p>Alunos</p>')
+    _article('matriculas', 'Matrículas', content='<p>Prazos</p>')
+    model_admin = admin_site._registry[Article]
+    request = rf.get('/')
+    request.user = admin_user
+
+    assert model_admin.search_backend == 'fulltext'
+    queryset, may_have_duplicates = model_admin.get_search_results(request, Article.objects.all(), 'alunos')
+    assert list(queryset.values_list('slug', flat=True)) == ['feira']
+
+
+@pytest.mark.django_db
+def test_trigram_admin_search_unions_fields_across_tables(rf, admin_user, django_user_model):
+    from django.contrib.admin.sites import site as admin_site
+
+    from .models import Comment
+
+    article = _article(title='Feira de ciências')
+    ana = django_user_model.objects.create_user('ana', 'ana@example.com', 'senha')
+    bia = django_user_model.objects.create_user('bia', 'bia@example.com', 'senha')
+    Comment.objects.create(article=article, user=ana, content='Parabéns')
+    Comment.objects.create(article=article, user=bia, content='Quando será a feira de Ana?')
+    Comment.objects.create(article=_article('outro'), user=bia, content='Muito bom')
+    request = rf.get('/')
+    request.user = admin_user
+
+    def search(term):
+        queryset, may_have_duplicates = admin_site._registry[Comment].get_search_results(
+            request, Comment.objects.all(), term,
+        )
+        assert not may_have_duplicates
+        return set(queryset.values_list('content', flat=True))
+
+    assert search('ana') == {'Parabéns', 'Quando será a feira de Ana?'}
+    assert search('feira') == {'Parabéns', 'Quando será a feira de Ana?'}
+    assert search('bia bom') == {'Muito bom'}  # todos os termos, cada um em algum campo
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='índices de busca só existem no PostgreSQL')
+def test_trigram_admin_search_uses_upper_indexes_on_postgres(rf, admin_user):
+    from django.contrib.admin.sites import site as admin_site
+
+    from .models import Comment
+
+    request = rf.get('/')
+    request.user = admin_user
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')  # tabelas vazias: força o planner a mostrar os índices
+    queryset, _ = admin_site._registry[Comment].get_search_results(request, Comment.objects.all(), 'feira')
+    plan = queryset.explain()
+    for index in ['news_comment_text_upper_trgm', 'accounts_user_search_trgm', 'news_article_title_upper_trgm']:
+        assert index in plan
+
+
+@pytest.mark.django_db
+def test_site_context_is_cached_in_process_until_site_settings_change(rf, django_assert_num_queries):
+    from django.contrib.sites.models import Site
+
+    from apps.common.context_processors import site_context
+    from apps.common.models import SiteExtension
+    from apps.common.sites import invalidate_site_cache
+
+    site = Site.objects.get_current()
+    extension, _ = SiteExtension.objects.update_or_create(site=site, defaults={'tagline': 'Antes'})
+    assert site_context(rf.get('/'))['site_settings'].tagline == 'Antes'
+    with django_assert_num_queries(0):
+        context = site_context(rf.get('/'))
+    assert context['current_site'] == site
+
+    extension.tagline = 'Depois'
+    extension.save()
+    assert site_context(rf.get('/'))['site_settings'].tagline == 'Depois'
+
+    # Update em massa não dispara signals: a versão compartilhada é incrementada à mão
+    SiteExtension.objects.filter(pk=extension.pk).update(tagline='Em massa')
+    invalidate_site_cache()
+    assert site_context(rf.get('/'))['site_settings'].tagline == 'Em massa'
+
+
+@pytest.mark.django_db
+def test_on_site_follows_request_host(client):
+    from django.contrib.sites.models import Site
+
+    from .models import Article
+
+    default = Site.objects.get_current()
+    portal = Site.objects.create(domain='portal.example.com', name='Portal')
+    _article('da-escola')
+    _article('do-portal', site=portal)
+
+    response = client.get(reverse('news:list'), HTTP_HOST='portal.example.com:8000')
+    assert response.context['featured'].slug == 'do-portal'
+    assert response.wsgi_request.site == portal
+    feed = client.get(reverse('news:feed'), HTTP_HOST='portal.example.com').content.decode()
+    assert '<link>http://portal.example.com/news/do-portal/</link>' in feed
+    assert f'//{default.domain}/' not in feed
+
+    # Host sem Site cadastrado cai no SITE_ID
+    response = client.get(reverse('news:list'), HTTP_HOST='desconhecido.example.com')
+    assert response.context['featured'].slug == 'da-escola'
+    assert Article.on_site.get().slug == 'da-escola'  # fora de requisição
+
+
+@pytest.mark.django_db
+def test_site_version_is_read_once_per_request(client, monkeypatch):
+    from django.core.cache import cache
+
+    from apps.common.sites import SITES_VERSION_KEY
+
+    reads = []
+    original_get = cache.get
+
+    def counting_get(key, *args, **kwargs):
+        if key == SITES_VERSION_KEY:
+            reads.append(key)
+        return original_get(key, *args, **kwargs)
+
+    monkeypatch.setattr(cache, 'get', counting_get)
+    # Host desconhecido: resolve_site + default_site + site_context (get_site_settings)
+    assert client.get(reverse('news:list'), HTTP_HOST='desconhecido.example.com').status_code == 200
+    assert len(reads) == 1
+
+
+@pytest.mark.django_db
+def test_host_map_reloads_when_another_worker_bumps_the_version():
+    from django.contrib.sites.models import Site
+    from django.core.cache import caches
+
+    from apps.common.sites import SITES_VERSION_KEY, resolve_site
+
+    portal = Site.objects.create(domain='portal.example.com', name='Portal')
+    assert resolve_site('portal.example.com') == portal
+
+    # Outro worker: conexão própria com o mesmo cache, update() sem signals
+    Site.objects.filter(pk=portal.pk).update(domain='novo.example.com')
+    other = caches.create_connection('default')
+    if not other.add(SITES_VERSION_KEY, 2, None):
+        other.incr(SITES_VERSION_KEY)
+
+    assert resolve_site('novo.example.com').pk == portal.pk
+    assert resolve_site('portal.example.com').pk != portal.pk
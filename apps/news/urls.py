@@ -17,9 +17,11 @@ urlpatterns = [
     path('archive/<int:year>/', views.article_archive, name='archive_year'),
     path('archive/<int:year>/<int:month>/', views.article_archive, name='archive_month'),
     path('htmx/articles/', views.article_list_page, name='article_list_page'),
+    path('htmx/comments/<int:article_id>/', views.comment_list_page, name='comment_list_page'),
     
     # User Account & Actions
     path('account/', views.user_dashboard, name='user_dashboard'),
+    path('account/tab/<str:tab>/', views.dashboard_tab, name='dashboard_tab'),
     path('toggle-bookmark/<int:article_id>/', views.toggle_bookmark, name='toggle_bookmark'),
     path('toggle-like/<int:article_id>/', views.toggle_like, name='toggle_like'),
     path('comment/<int:article_id>/', views.add_comment, name='add_comment'),
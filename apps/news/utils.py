@@ -1,4 +1,7 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Count, Q
+from django.utils.http import base36_to_int, int_to_base36
 
 
 def get_sidebar_context():
@@ -38,3 +41,67 @@ def get_sidebar_context():
         'top_categories': top_categories,
         'top_tags': top_tags,
     }
+
+
+# ── Deduplicação de visualizações (cookie assinado, sem sessão) ────────────
+VIEWED_COOKIE_NAME = 'news_viewed'
+VIEWED_COOKIE_SALT = 'apps.news.viewed'
+VIEWED_COOKIE_MAX_IDS = 64
+
+
+def get_viewed_article_ids(request):
+    """Lê do cookie assinado a lista (ordem de leitura) de artigos já contados.
+
+    Cookie ausente, adulterado ou malformado equivale a lista vazia.
+    """
+    raw = request.get_signed_cookie(VIEWED_COOKIE_NAME, default='', salt=VIEWED_COOKIE_SALT)
+    try:
+        return [base36_to_int(token) for token in raw.split('.') if token]
+    except ValueError:
+        return []
+
+
+def set_viewed_article_ids(response, article_ids):
+    """Grava os últimos VIEWED_COOKIE_MAX_IDS artigos vistos em base36 (cookie de tamanho limitado)."""
+    value = '.'.join(int_to_base36(pk) for pk in article_ids[-VIEWED_COOKIE_MAX_IDS:])
+    response.set_signed_cookie(
+        VIEWED_COOKIE_NAME, value,
+        salt=VIEWED_COOKIE_SALT,
+        max_age=settings.SESSION_COOKIE_AGE,
+        secure=settings.SESSION_COOKIE_SECURE,
+        httponly=True,
+        samesite='Lax',
+    )
+
+
+
+# ── Contadores das abas do dashboard do usuário ────────────────────────────
+DASHBOARD_COUNTS_TIMEOUT = 3600
+
+
+def _dashboard_counts_key(user_id):
+    return f'news:dashboard_counts:{user_id}'
+
+
+def get_dashboard_counts(user):
+    """Totais de salvos/curtidos/comentários do usuário, cacheados por usuário.
+
+    Invalidado pelas views que alteram essas tabelas; o timeout limita a
+    defasagem em remoções feitas fora delas (admin, cascata).
+    """
+    from .models import ArticleBookmark, ArticleLike, Comment
+
+    key = _dashboard_counts_key(user.pk)
+    counts = cache.get(key)
+    if counts is None:
+        counts = {
+            'saved': ArticleBookmark.objects.filter(user=user).count(),
+            'likes': ArticleLike.objects.filter(user=user).count(),
+            'comments': Comment.objects.filter(user=user).count(),
+        }
+        cache.set(key, counts, DASHBOARD_COUNTS_TIMEOUT)
+    return counts
+
+
+def invalidate_dashboard_counts(user_id):
+    cache.delete(_dashboard_counts_key(user_id))
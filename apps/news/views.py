@@ -2,19 +2,32 @@ from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.contrib.sites.shortcuts import get_current_site
 from django.core.paginator import Paginator
 from django.db.models import F, Q
 from django.http import HttpResponse
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.views.decorators.http import require_POST
 
+from apps.common.pagination import paginate_by_cursor
+from apps.common.ratelimit import rate_limit
+from apps.common.sites import get_current_site
+from apps.common.upserts import toggle_row, upsert
+from apps.common.utils import get_client_ip
+
 from .forms import NewsletterSubscriptionForm
 from .models import Article, ArticleBookmark, ArticleLike, Category, Comment, NewsletterSubscription, Tag
-from .utils import get_sidebar_context
+from .readers import record_reader
+from .utils import (
+    get_dashboard_counts,
+    get_sidebar_context,
+    get_viewed_article_ids,
+    invalidate_dashboard_counts,
+    set_viewed_article_ids,
+)
 
 def safe_referer_redirect(request, default_url):
     referer = request.META.get('HTTP_REFERER')
@@ -25,6 +38,10 @@ def safe_referer_redirect(request, default_url):
 
 User = get_user_model()
 
+COMMENTS_PER_PAGE = 12
+DASHBOARD_PER_PAGE = 12
+DASHBOARD_TABS = ('saved', 'comments', 'likes', 'settings')
+
 
 def article_list(request):
     """Homepage do portal de noticias com artigo destaque + grid paginado."""
@@ -60,13 +77,15 @@ def article_detail(request, slug):
         status=Article.Status.PUBLISHED,
     )
 
-    # Incrementar view_count atomicamente apenas se não foi visto nesta sessão
-    session_key = f'viewed_article_{article.pk}'
-    if not request.session.get(session_key, False):
+    # Incrementar view_count atomicamente apenas na primeira leitura deste visitante.
+    # A deduplicação usa um cookie assinado e limitado — nada é gravado na sessão.
+    viewed_ids = get_viewed_article_ids(request)
+    first_view = article.pk not in viewed_ids
+    if first_view:
         Article.on_site.filter(pk=article.pk).update(view_count=F('view_count') + 1)
-        request.session[session_key] = True
-    
-    article.refresh_from_db(fields=['view_count'])
+        article.view_count += 1
+        viewed_ids.append(article.pk)
+        record_reader(article, request)
 
     # Artigos relacionados (mesma categoria, excluindo atual)
     related_articles = Article.objects.none()
@@ -85,20 +104,27 @@ def article_detail(request, slug):
         is_bookmarked = ArticleBookmark.objects.filter(user=request.user, article=article).exists()
         is_liked = ArticleLike.objects.filter(user=request.user, article=article).exists()
 
-    comments = article.comments.filter(is_active=True).select_related('user').order_by('created_at')
-    comment_count = comments.count()
+    active_comments = article.comments.filter(is_active=True)
+    comments, comments_cursor = paginate_by_cursor(
+        active_comments.select_related('user'), None, COMMENTS_PER_PAGE,
+    )
+    comment_count = active_comments.count()
     like_count = article.likes.count()
 
-    return render(request, 'news/article_detail.html', {
+    response = render(request, 'news/article_detail.html', {
         'article': article,
         'related_articles': related_articles,
         'is_bookmarked': is_bookmarked,
         'is_liked': is_liked,
         'comments': comments,
+        'comments_cursor': comments_cursor,
         'comment_count': comment_count,
         'like_count': like_count,
         **get_sidebar_context(),
     })
+    if first_view:
+        set_viewed_article_ids(response, viewed_ids)
+    return response
 
 
 def category_detail(request, slug):
@@ -244,20 +270,42 @@ def article_list_page(request):
     return render(request, 'news/partials/article_grid.html', {'page_obj': page_obj})
 
 
+def comment_list_page(request, article_id):
+    """Endpoint HTMX para load-more de comentarios (cursor created_at/id)."""
+    article = get_object_or_404(
+        Article.on_site.only('id', 'slug'),
+        id=article_id,
+        status=Article.Status.PUBLISHED,
+    )
+    if not request.htmx:
+        return redirect(article.get_absolute_url())
+
+    comments, next_cursor = paginate_by_cursor(
+        article.comments.filter(is_active=True).select_related('user'),
+        request.GET.get('after'),
+        COMMENTS_PER_PAGE,
+    )
+    return render(request, 'news/partials/comments_page.html', {
+        'article': article,
+        'comments': comments,
+        'next_cursor': next_cursor,
+    })
+
+
 @require_POST
+@rate_limit('newsletter')
 def newsletter_subscribe(request):
     """Inscricao na newsletter (POST only, suporte HTMX)."""
     form = NewsletterSubscriptionForm(request.POST)
     if form.is_valid():
-        site = get_current_site(request)
-        obj, created = NewsletterSubscription.objects.get_or_create(
+        upsert(
+            NewsletterSubscription,
+            unique_fields=['email', 'site'],
+            update_fields=['is_active'],
             email=form.cleaned_data['email'],
-            site=site,
-            defaults={'is_active': True},
+            site=get_current_site(request),
+            is_active=True,
         )
-        if not created:
-            obj.is_active = True
-            obj.save(update_fields=['is_active'])
         if request.htmx:
             email = form.cleaned_data['email']
             response = render(request, 'news/partials/newsletter_success_cta.html', {'email': email})
@@ -274,52 +322,63 @@ def newsletter_subscribe(request):
 
 @login_required
 def user_dashboard(request):
-    """Dashboard do usuario com artigos salvos, curtidos e comentarios."""
+    """Dashboard do usuario: casca com abas e contadores; o conteudo de cada aba vem de dashboard_tab."""
+    active_tab = request.GET.get('tab')
+    if active_tab not in DASHBOARD_TABS:
+        active_tab = 'saved'
 
-    user = request.user
-    site = get_current_site(request)
+    return render(request, 'news/account/dashboard.html', {
+        'active_tab': active_tab,
+        'tab_counts': get_dashboard_counts(request.user),
+    })
 
-    saved_articles = (
-        Article.objects
-        .filter(bookmarks__user=user)
-        .select_related('category', 'author')
-        .order_by('-bookmarks__created_at')
-    )
-    liked_articles = (
-        Article.objects
-        .filter(likes__user=user)
-        .select_related('category', 'author')
-        .order_by('-likes__created_at')
-    )
-    user_comments = user.comments.select_related('article').order_by('-created_at')
 
-    has_newsletter = NewsletterSubscription.objects.filter(
-        email=user.email,
-        site=site,
-        is_active=True,
-    ).exists()
+@login_required
+def dashboard_tab(request, tab):
+    """Endpoint HTMX de uma aba do dashboard, paginada por cursor (?after=)."""
+    if tab not in DASHBOARD_TABS:
+        raise Http404
+    if not request.htmx:
+        return redirect(f"{reverse('news:user_dashboard')}?tab={tab}")
 
-    return render(request, 'news/account/dashboard.html', {
-        'saved_articles': saved_articles,
-        'liked_articles': liked_articles,
-        'user_comments': user_comments,
-        'has_newsletter': has_newsletter,
-        **get_sidebar_context(),
+    user = request.user
+    if tab == 'settings':
+        has_newsletter = NewsletterSubscription.objects.filter(
+            email=user.email,
+            site=get_current_site(request),
+            is_active=True,
+        ).exists()
+        return render(request, 'news/account/partials/settings_tab.html', {'has_newsletter': has_newsletter})
+
+    if tab == 'saved':
+        rows = ArticleBookmark.objects.filter(user=user).select_related('article')
+    elif tab == 'likes':
+        rows = ArticleLike.objects.filter(user=user).select_related('article__category')
+    else:
+        rows = Comment.objects.filter(user=user).select_related('article')
+
+    after = request.GET.get('after')
+    items, next_cursor = paginate_by_cursor(rows, after, DASHBOARD_PER_PAGE)
+    # Com cursor: so a proxima pagina (load-more); sem cursor: a aba inteira
+    template = f'news/account/partials/{tab}_page.html' if after else f'news/account/partials/{tab}_tab.html'
+    return render(request, template, {
+        'items': items,
+        'next_cursor': next_cursor,
+        'tab': tab,
     })
 
 
 @require_POST
 @login_required
+@rate_limit('bookmark', key='user')
 def toggle_bookmark(request, article_id):
     """Toggle de bookmark de artigo para o usuario autenticado."""
-    article = get_object_or_404(Article, id=article_id)
-    bookmark, created = ArticleBookmark.objects.get_or_create(user=request.user, article=article)
-
-    if not created:
-        bookmark.delete()
-        is_bookmarked = False
-    else:
-        is_bookmarked = True
+    article = get_object_or_404(Article.objects.only('id', 'slug'), id=article_id)
+    is_bookmarked, _ = toggle_row(
+        ArticleBookmark, count_by='article_id',
+        article_id=article.pk, user_id=request.user.pk,
+    )
+    invalidate_dashboard_counts(request.user.pk)
 
     if request.htmx:
         # Se chamado do dashboard, remover o elemento da lista
@@ -335,21 +394,18 @@ def toggle_bookmark(request, article_id):
 
 @require_POST
 @login_required
+@rate_limit('like', key='user')
 def toggle_like(request, article_id):
     """Toggle de like em artigo (por usuario autenticado)."""
-    article = get_object_or_404(Article, id=article_id)
-    like, created = ArticleLike.objects.get_or_create(
-        article=article,
-        user=request.user,
-        defaults={'ip_address': request.META.get('REMOTE_ADDR')},
+    article = get_object_or_404(Article.objects.only('id', 'slug'), id=article_id)
+    is_liked, like_count = toggle_row(
+        ArticleLike, count_by='article_id',
+        defaults={'ip_address': get_client_ip(request) or None},
+        article_id=article.pk, user_id=request.user.pk,
     )
-    if not created:
-        like.delete()
-
-    like_count = article.likes.count()
+    invalidate_dashboard_counts(request.user.pk)
 
     if request.htmx:
-        is_liked = created
         return render(request, 'news/partials/like_button.html', {
             'article': article,
             'like_count': like_count,
@@ -360,6 +416,7 @@ def toggle_like(request, article_id):
 
 @require_POST
 @login_required
+@rate_limit('comment', key='user')
 def add_comment(request, article_id):
     """Adiciona comentario em um artigo (usuario autenticado)."""
     article = get_object_or_404(Article, id=article_id, status=Article.Status.PUBLISHED)
@@ -371,13 +428,14 @@ def add_comment(request, article_id):
         messages.error(request, 'O comentário não pode estar vazio.')
         return redirect(article.get_absolute_url())
 
-    Comment.objects.create(article=article, user=request.user, content=content)
+    comment = Comment.objects.create(article=article, user=request.user, content=content)
+    invalidate_dashboard_counts(request.user.pk)
 
     if request.htmx:
-        comments = article.comments.filter(is_active=True).select_related('user').order_by('created_at')
-        return render(request, 'news/partials/comments_list.html', {
-            'comments': comments,
-            'article': article,
+        # Só o comentário novo (out-of-band) — nunca re-renderiza a thread inteira
+        return render(request, 'news/partials/comment_created.html', {
+            'comment': comment,
+            'comment_count': article.comments.filter(is_active=True).count(),
         })
     messages.success(request, 'Comentário publicado com sucesso!')
     return safe_referer_redirect(request, article.get_absolute_url())
@@ -390,6 +448,7 @@ def delete_comment(request, comment_id):
     comment = get_object_or_404(Comment, id=comment_id, user=request.user)
     article_url = comment.article.get_absolute_url()
     comment.delete()
+    invalidate_dashboard_counts(request.user.pk)
 
     if request.htmx:
         return HttpResponse('')
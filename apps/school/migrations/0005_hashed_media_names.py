@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:30
+
+import apps.common.files
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0004_alter_page_managers'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='page',
+            name='featured_image',
+            field=models.ImageField(blank=True, storage=apps.common.files.ContentAddressedStorage(), upload_to='school/pages/'),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='photo',
+            field=models.ImageField(blank=True, storage=apps.common.files.ContentAddressedStorage(), upload_to='school/team/'),
+        ),
+        migrations.AlterField(
+            model_name='testimonial',
+            name='photo',
+            field=models.ImageField(blank=True, storage=apps.common.files.ContentAddressedStorage(), upload_to='school/testimonials/'),
+        ),
+    ]
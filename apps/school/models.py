@@ -1,8 +1,9 @@
-from django.contrib.sites.managers import CurrentSiteManager
 from django.contrib.sites.models import Site
 from django.db import models
 
+from apps.common.files import hashed_storage
 from apps.common.models import SEOModel, TimeStampedModel
+from apps.common.sites import CurrentSiteManager
 
 
 class Page(TimeStampedModel, SEOModel):
@@ -10,7 +11,7 @@ class Page(TimeStampedModel, SEOModel):
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True)
     content = models.TextField(blank=True)
-    featured_image = models.ImageField(upload_to='school/pages/', blank=True)
+    featured_image = models.ImageField(upload_to='school/pages/', storage=hashed_storage, blank=True)
     is_published = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
 
@@ -35,7 +36,7 @@ class Page(TimeStampedModel, SEOModel):
 class TeamMember(TimeStampedModel):
     name = models.CharField(max_length=200)
     title = models.CharField(max_length=200)
-    photo = models.ImageField(upload_to='school/team/', blank=True)
+    photo = models.ImageField(upload_to='school/team/', storage=hashed_storage, blank=True)
     bio = models.TextField(blank=True)
     email = models.EmailField(blank=True)
     is_active = models.BooleanField(default=True)
@@ -54,7 +55,7 @@ class Testimonial(TimeStampedModel):
     name = models.CharField(max_length=200)
     relationship = models.CharField(max_length=200, blank=True)
     quote = models.TextField()
-    photo = models.ImageField(upload_to='school/testimonials/', blank=True)
+    photo = models.ImageField(upload_to='school/testimonials/', storage=hashed_storage, blank=True)
     is_featured = models.BooleanField(default=False)
 
     class Meta:
@@ -1,9 +1,9 @@
-from django.contrib.sitemaps import Sitemap
+from apps.common.sitemaps import CurrentSiteSitemap
 
 from .models import Page
 
 
-class PageSitemap(Sitemap):
+class PageSitemap(CurrentSiteSitemap):
     changefreq = 'monthly'
     priority = 0.5
 
@@ -14,3 +14,38 @@ def test_school_team_list(client):
     response = client.get(url)
     assert response.status_code == 200
     assert 'text/html' in response['Content-Type']
+
+@pytest.mark.django_db
+def test_team_photos_get_content_hashed_names(settings, tmp_path):
+    import io
+
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.core.management import call_command
+    from PIL import Image
+
+    from apps.common.files import is_content_addressed
+
+    from .models import TeamMember
+
+    settings.MEDIA_ROOT = tmp_path
+
+    def png(color):
+        buffer = io.BytesIO()
+        Image.new('RGB', (4, 4), color).save(buffer, 'PNG')
+        return SimpleUploadedFile('foto.png', buffer.getvalue())
+
+    member = TeamMember.objects.create(name='Ana', title='Diretora', photo=png('red'))
+    first = member.photo.name
+    assert first.startswith('school/team/') and is_content_addressed(first)
+    assert member.photo.url.startswith('/media/school/team/')
+
+    member.photo = png('blue')  # mesmo nome enviado, conteúdo novo: URL nova
+    member.save()
+    assert member.photo.name != first and is_content_addressed(member.photo.name)
+
+    (tmp_path / 'school' / 'team' / 'antiga.png').write_bytes(png('green').read())
+    legacy = TeamMember.objects.create(name='Bia', title='Professora', photo='school/team/antiga.png')
+    call_command('hash_media_names')
+    legacy.refresh_from_db()
+    assert is_content_addressed(legacy.photo.name)
+    assert (tmp_path / legacy.photo.name).exists()
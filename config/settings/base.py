@@ -55,7 +55,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'django.contrib.sites.middleware.CurrentSiteMiddleware',
+    'apps.common.middleware.SiteMiddleware',
     'django_htmx.middleware.HtmxMiddleware',
     'axes.middleware.AxesMiddleware',
     'csp.middleware.CSPMiddleware',
@@ -94,8 +94,15 @@ DATABASES = {
     }
 }
 
+# Cache compartilhado entre os workers: versões de cache (sites, facetas de vagas) e contadores
+# de limite de requisições dependem dele. O padrão locmem só serve para um processo (dev/testes).
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
+# Site padrão: hosts sem Site cadastrado, comandos e tarefas. Nas requisições o site vem do Host (SiteMiddleware).
 SITE_ID = 1
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -129,6 +136,26 @@ STORAGES = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Arquivos privados do MEDIA_ROOT: prefixo -> permissão exigida pela view protected_media.
+# O nginx precisa negar esses prefixos em /media/ (ver docker/nginx/nginx.conf).
+PROTECTED_MEDIA_URL = '/protected/'
+PROTECTED_MEDIA_PERMISSIONS = {
+    'hiring/resumes/': 'hiring.view_application',
+}
+# Location interna do nginx que entrega o arquivo (X-Accel-Redirect). Vazio: o Django serve (dev/testes).
+PROTECTED_MEDIA_ACCEL_PREFIX = env('PROTECTED_MEDIA_ACCEL_PREFIX', default='')
+
+# Limites por endpoint ('N/período', período em s/m/h/d) usados por apps.common.ratelimit.rate_limit.
+# Escopo ausente ou vazio = sem limite. Contadores no cache padrão (CACHES, compartilhado pelos workers).
+RATE_LIMITS = {
+    'contact': '5/10m',
+    'newsletter': '5/10m',
+    'job_application': '5/h',
+    'comment': '10/10m',
+    'like': '60/m',
+    'bookmark': '60/m',
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # ── Django Unfold Admin Configuration ──────────────────────────────────────
@@ -295,6 +322,8 @@ UNFOLD = {
 # ── Upload Limits ──────────────────────────────────────────────────────────
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760   # 10 MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760   # 10 MB
+# Partes dos uploads grandes da biblioteca de mídia (fora de MEDIA_ROOT: não são públicas)
+CHUNKED_UPLOAD_DIR = env('CHUNKED_UPLOAD_DIR', default=str(BASE_DIR / 'tmp' / 'uploads'))
 
 # ── Email ──────────────────────────────────────────────────────────────────
 # Em produção, configurar via .env:
@@ -19,6 +19,14 @@ SECURE_HSTS_PRELOAD = True
 SECURE_SSL_REDIRECT = env.bool('SECURE_SSL_REDIRECT', default=True)  # noqa: F405
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
+# Redis do docker-compose.prod.yml: os 4 workers do Gunicorn enxergam as mesmas chaves
+CACHES = {
+    'default': env.cache('CACHE_URL', default='redis://redis:6379/1'),  # noqa: F405
+}
+
+# Downloads protegidos saem pelo nginx (sendfile); o worker só confere a permissão
+PROTECTED_MEDIA_ACCEL_PREFIX = env('PROTECTED_MEDIA_ACCEL_PREFIX', default='/_protected/')  # noqa: F405
+
 # Token de reset de senha expira em 1 hora (padrão Django: 24h)
 PASSWORD_RESET_TIMEOUT = 3600
 
@@ -6,6 +6,7 @@ from django.conf.urls.static import static
 from django.contrib.sitemaps.views import sitemap
 from apps.news.sitemaps import ArticleSitemap
 from apps.school.sitemaps import PageSitemap
+from apps.common.views import protected_media
 
 sitemaps = {
     'news': ArticleSitemap,
@@ -15,6 +16,7 @@ sitemaps = {
 urlpatterns = [
     path('i18n/', include('django.conf.urls.i18n')),
     path('admin/', admin.site.urls),
+    path('protected/<path:path>', protected_media, name='protected_media'),
     path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
     path('hiring/', include('apps.hiring.urls', namespace='hiring')),
     path('contact/', include('apps.contact.urls', namespace='contact')),
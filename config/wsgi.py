@@ -3,3 +3,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
 application = get_wsgi_application()
+
+# Mapa host -> Site em memória antes da primeira requisição do worker
+from apps.common.sites import preload_sites  # noqa: E402
+
+preload_sites()